@@ -0,0 +1,128 @@
+"""
+Allocation of unique slugs and usernames.
+
+Instead of probing `base`, `base-1`, `base-2`... with one EXISTS query each,
+the allocator fetches every taken value of the form `base` / `base<sep><n>`
+in a single query and picks the next free suffix. Concurrent inserts can
+still race for the same value, so `save_unique` retries on IntegrityError.
+"""
+import re
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+
+MAX_ATTEMPTS = 5
+SUFFIX_RESERVE = 8  # room kept for "<sep><n>" when the base is truncated
+
+
+def _fit(model, field, base):
+    max_length = model._meta.get_field(field).max_length
+    if max_length and len(base) > max_length - SUFFIX_RESERVE:
+        return base[:max_length - SUFFIX_RESERVE]
+    return base
+
+
+def allocate_unique(model, field, base, separator='-', exclude_pk=None):
+    """
+    Return `base` or the next free `base<separator><n>` for a unique field.
+
+    Args:
+        model: Model class owning the field
+        field: Name of the unique field
+        base: Preferred value (truncated to fit the field if needed)
+        separator: Placed between the base and the numeric suffix
+        exclude_pk: Ignore this row (when re-allocating for an existing object)
+    """
+    base = _fit(model, field, base)
+
+    pattern = rf'^{re.escape(base)}({re.escape(separator)}[0-9]+)?$'
+    taken = model._default_manager.filter(**{
+        f'{field}__startswith': base,  # lets the unique index narrow the scan
+        f'{field}__regex': pattern,
+    })
+    if exclude_pk is not None:
+        taken = taken.exclude(pk=exclude_pk)
+    taken = set(taken.values_list(field, flat=True))
+
+    if base not in taken:
+        return base
+
+    suffix_start = len(base) + len(separator)
+    suffixes = [int(value[suffix_start:]) for value in taken if value != base]
+    return f'{base}{separator}{max(suffixes, default=0) + 1}'
+
+
+def allocate_unique_many(model, field, bases, separator='-'):
+    """
+    Allocate unique values for a batch of new rows in one query.
+
+    Duplicates within the batch get successive suffixes, so the result can
+    be used directly with bulk_create.
+
+    Returns:
+        list: One value per base, in order
+    """
+    bases = [_fit(model, field, base) for base in bases]
+    distinct = sorted(set(bases))
+    if not distinct:
+        return []
+
+    alternatives = '|'.join(re.escape(base) for base in distinct)
+    prefix_filter = Q()
+    for base in distinct:
+        prefix_filter |= Q(**{f'{field}__startswith': base})
+    taken = set(
+        model._default_manager.filter(prefix_filter)
+        .filter(**{f'{field}__regex': rf'^({alternatives})({re.escape(separator)}[0-9]+)?$'})
+        .values_list(field, flat=True)
+    )
+
+    # Next suffix per base; the regex can't tell which base a suffixed value
+    # belongs to when one base is a prefix of another, so check each
+    next_suffix = {}
+    for base in distinct:
+        suffix_start = len(base) + len(separator)
+        suffixes = [
+            int(value[suffix_start:]) for value in taken
+            if value.startswith(base + separator) and value[suffix_start:].isdigit()
+        ]
+        next_suffix[base] = max(suffixes, default=0) + 1
+
+    values = []
+    for base in bases:
+        value = base
+        while value in taken:
+            value = f'{base}{separator}{next_suffix[base]}'
+            next_suffix[base] += 1
+        taken.add(value)
+        values.append(value)
+    return values
+
+
+def save_unique(instance, field, base, save, separator='-'):
+    """
+    Allocate a unique value for `field` and save, retrying on collisions.
+
+    Args:
+        instance: Unsaved (or saved) model instance
+        field: Name of the unique field to fill
+        base: Preferred value
+        save: Callable that performs the actual save
+        separator: Placed between the base and the numeric suffix
+
+    Returns:
+        Whatever `save` returns
+    """
+    model = type(instance)
+    for attempt in range(MAX_ATTEMPTS):
+        value = allocate_unique(model, field, base, separator, exclude_pk=instance.pk)
+        setattr(instance, field, value)
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError:
+            # Only retry if another writer took our value; anything else is a real error
+            lost_race = model._default_manager.filter(**{field: value}).exclude(pk=instance.pk).exists()
+            if not lost_race or attempt == MAX_ATTEMPTS - 1:
+                raise
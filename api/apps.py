@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+    
+    def ready(self):
+        """Keep the full-text search index in sync"""
+        from api.search.signals import connect_signals
+        connect_signals()
@@ -0,0 +1,47 @@
+"""
+Versioned cache namespaces.
+
+Cached entries embed their namespace version in the key, so bumping the
+version invalidates every entry in the namespace at once without having to
+enumerate keys.
+
+Versions live in the CacheNamespace table rather than the cache: with the
+default per-process LocMemCache a bump would otherwise only reach the
+process that made it, and other workers would keep serving stale entries
+until they expire. Reading a version is one primary-key-sized query.
+Versions start from the current time in milliseconds, so a namespace row
+that was lost never comes back with an old value that could match stale
+entries.
+"""
+import time
+
+from django.db.models import F
+
+from .models import CacheNamespace
+
+
+def _initial_version():
+    return int(time.time() * 1000)
+
+
+def get_namespace_version(namespace):
+    """Return the current version of a cache namespace"""
+    version = CacheNamespace.objects.filter(name=namespace).values_list('version', flat=True).first()
+    if version is None:
+        version = CacheNamespace.objects.get_or_create(
+            name=namespace, defaults={'version': _initial_version()}
+        )[0].version
+    return version
+
+
+def bump_namespace_version(namespace):
+    """Invalidate every cached entry in a namespace"""
+    updated = CacheNamespace.objects.filter(name=namespace).update(version=F('version') + 1)
+    if not updated:
+        CacheNamespace.objects.get_or_create(name=namespace, defaults={'version': _initial_version()})
+
+
+def namespaced_key(namespace, *parts):
+    """Build a cache key that is invalidated with the namespace"""
+    version = get_namespace_version(namespace)
+    return ':'.join([namespace, str(version)] + [str(part) for part in parts])
@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from api.retention import POLICIES, apply_policy
+
+
+class Command(BaseCommand):
+    help = 'Delete (and optionally archive) expired notifications, reminders and viewer sketches in chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--policy',
+            action='append',
+            help=f"Only apply these policies ({', '.join(POLICIES)})"
+        )
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows deleted per transaction')
+        parser.add_argument('--pause', type=float, default=0.1, help='Seconds to sleep between chunks')
+        parser.add_argument(
+            '--archive-dir',
+            default=getattr(settings, 'RETENTION_ARCHIVE_DIR', '') or None,
+            help='Write expired rows to gzipped JSONL files here before deleting'
+        )
+        parser.add_argument('--max-chunks', type=int, help='Stop after this many chunks per policy')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the expired rows')
+
+    def handle(self, *args, **options):
+        names = options['policy'] or list(POLICIES)
+        unknown = set(names) - set(POLICIES)
+        if unknown:
+            raise CommandError(f"Unknown policies: {', '.join(sorted(unknown))}")
+
+        for name in names:
+            if options['dry_run']:
+                count = POLICIES[name].expired().count()
+                self.stdout.write(f"{name}: {count} rows expired")
+                continue
+            result = apply_policy(
+                name,
+                chunk_size=options['chunk_size'],
+                pause=options['pause'],
+                archive_dir=options['archive_dir'],
+                max_chunks=options['max_chunks'],
+            )
+            rate = result['deleted'] / result['elapsed'] if result['elapsed'] else 0
+            self.stdout.write(
+                f"✅ {name}: {result['deleted']} deleted in {result['chunks']} chunks "
+                f"({len(result['archives'])} archives, {rate:.0f} rows/s)"
+            )
+
+        self.stdout.write(self.style.SUCCESS('✅ Retention applied!'))
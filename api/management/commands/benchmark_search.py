@@ -0,0 +1,101 @@
+"""
+Management command to benchmark full-text search against the LIKE scans
+that DRF's SearchFilter runs.
+
+Rows are generated inside a transaction that is rolled back at the end,
+so the command leaves the database untouched.
+"""
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+
+from api.search import get_backend, get_document
+from shows.models import Show
+
+WORDS = (
+    'bitcoin stacks defi nft wallet mining staking ordinals layer protocol '
+    'community governance roadmap launch market token swap bridge yield '
+    'developer podcast interview weekly morning builder security audit'
+).split()
+
+
+SYLLABLES = 'ba be bi bo bu ka ke ki ko ku la le li lo lu ma me mi mo mu na ne ni no nu ra re ri ro ru ta te ti to tu'.split()
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark full-text search vs. icontains scans on generated shows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='Number of shows to generate')
+        parser.add_argument('--repeat', type=int, default=5, help='Number of timed runs per query')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--query', action='append', help='Search terms (default: a few sample queries)')
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        if backend is None:
+            raise CommandError('No search backend supports this database')
+
+        queries = options['query'] or ['bitcoin', 'staking podcast', 'governance roadmap launch']
+        try:
+            with transaction.atomic():
+                self._populate(options['rows'], random.Random(options['seed']), backend)
+                for query in queries:
+                    self._compare(backend, query, options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _populate(self, rows, rng, backend):
+        """Bulk-create shows and index them in one statement"""
+        # Filler words make the sample terms selective, like real content
+        vocabulary = WORDS + [''.join(rng.choices(SYLLABLES, k=3)) for _ in range(5000)]
+        creator = get_user_model().objects.create_user(username='benchmark-search', password=None)
+        began = time.perf_counter()
+        Show.objects.bulk_create(
+            [
+                Show(
+                    title=' '.join(rng.choices(vocabulary, k=4)).title(),
+                    description=' '.join(rng.choices(vocabulary, k=40)),
+                    slug=f'benchmark-search-{i}',
+                    creator=creator,
+                    status='published',
+                )
+                for i in range(rows)
+            ],
+            batch_size=2000,
+        )
+        backend.rebuild(get_document(Show))
+        self.stdout.write(f'Generated and indexed {rows} shows in {time.perf_counter() - began:.1f} s')
+
+    def _compare(self, backend, query, repeat):
+        terms = query.split()
+        like = Q()
+        for term in terms:
+            like &= Q(title__icontains=term) | Q(description__icontains=term)
+
+        like_time, like_ids = self._time(repeat, lambda: list(Show.objects.filter(like).order_by('-created_at').values_list('pk', flat=True)[:20]))
+        fts_time, fts_ids = self._time(repeat, lambda: backend.search(get_document(Show), query, limit=20))
+
+        self.stdout.write(f'"{query}": LIKE {like_time * 1000:.1f} ms ({len(like_ids)} hits), '
+                          f'{backend.vendor} full-text {fts_time * 1000:.1f} ms ({len(fts_ids)} hits)')
+        self.stdout.write(self.style.SUCCESS(f'✓ Speedup: {like_time / fts_time:.1f}x'))
+
+    def _time(self, repeat, func):
+        """Return (best wall time, result) over several runs"""
+        best = None
+        result = None
+        for _ in range(repeat):
+            began = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - began
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from api.counters import FLUSH_BATCH_SIZE, flush_counters
+
+
+class Command(BaseCommand):
+    help = 'Apply buffered share_count/view_count increments to the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=FLUSH_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        result = flush_counters(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Flushed {result['deltas']} deltas to {result['objects']} objects "
+            f"in {result['updates']} updates"
+        ))
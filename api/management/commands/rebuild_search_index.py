@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from api.search import DOCUMENTS, get_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index (after bulk loads that bypass signals)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            action='append',
+            help='Only rebuild these models (e.g. --model shows.Show)'
+        )
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        if backend is None:
+            raise CommandError('No search backend supports this database')
+
+        documents = DOCUMENTS
+        if options['model']:
+            wanted = {label.lower() for label in options['model']}
+            documents = [document for document in DOCUMENTS if document.label.lower() in wanted]
+
+        for document in documents:
+            backend.create_table(document)
+            backend.rebuild(document)
+            self.stdout.write(f'✅ {document.label}: {document.model.objects.count()} rows indexed')
+
+        self.stdout.write(self.style.SUCCESS('✅ Search index rebuilt!'))
@@ -0,0 +1,39 @@
+# Creates the full-text search index tables for the current database vendor
+# (FTS5 virtual tables on SQLite, tsvector + GIN tables on PostgreSQL) and
+# fills them from the existing rows.
+
+from django.db import migrations
+
+from api.search.backends import get_backend
+from api.search.documents import DOCUMENTS
+
+
+def create_search_index(apps, schema_editor):
+    backend = get_backend(schema_editor.connection)
+    if backend is None:
+        return
+    for document in DOCUMENTS:
+        backend.create_table(document)
+        backend.rebuild(document)
+
+
+def drop_search_index(apps, schema_editor):
+    backend = get_backend(schema_editor.connection)
+    if backend is None:
+        return
+    for document in DOCUMENTS:
+        backend.drop_table(document)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shows', '0013_show_comment_count_show_like_count'),
+        ('news', '0003_news_comment_count_news_like_count'),
+        ('events', '0005_event_comment_count_event_like_count'),
+        ('users', '0009_user_display_name'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,3 +1,72 @@
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
 
-# Create your models here.
+
+class JobCheckpoint(models.Model):
+    """
+    High-water mark of an incremental background job (e.g. the last
+    activity timestamp folded into show hot scores).
+    """
+    name = models.CharField(max_length=100, unique=True)
+    position = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.name} @ {self.position.isoformat()}"
+    
+    @classmethod
+    def get(cls, name, default=None):
+        """Return the stored position for a job, or `default`"""
+        return cls.objects.filter(name=name).values_list('position', flat=True).first() or default
+    
+    @classmethod
+    def advance(cls, name, position):
+        """Store a job's new position"""
+        cls.objects.update_or_create(name=name, defaults={'position': position})
+
+
+class CacheNamespace(models.Model):
+    """
+    Current version of a versioned cache namespace (see api/cache.py). Kept
+    in the database so every worker process sees a bump, whatever cache
+    backend holds the entries themselves.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    version = models.BigIntegerField()
+    
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+
+class PubSubMessage(models.Model):
+    """
+    A message published through DatabaseBroker (see api/pubsub.py). Each
+    process polls for rows newer than the last one it has seen.
+    """
+    channel = models.CharField(max_length=100)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    def __str__(self):
+        return f"{self.channel} #{self.pk}"
+
+
+class CounterDelta(models.Model):
+    """
+    A pending increment of a buffered counter column (see api/counters.py).
+    Rows are appended by writers and folded into the target row by the
+    periodic flush, which deletes them in the same transaction.
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    field = models.CharField(max_length=50)
+    delta = models.IntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['content_type', 'field', 'object_id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.content_type.model}#{self.object_id}.{self.field} {self.delta:+d}"
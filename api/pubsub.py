@@ -0,0 +1,226 @@
+"""
+In-process publish/subscribe for pushing events to streaming connections.
+
+Subscribers are asyncio consumers (e.g. the SSE notification stream), each
+with a bounded queue on its own event loop. Publishers are ordinary sync
+code (request handlers, signal receivers, background threads): publish()
+hands the message to each subscriber's loop with call_soon_threadsafe, so
+publishing never blocks and costs nothing when nobody is listening.
+
+Backends (settings.PUBSUB_BACKEND, dotted path):
+
+- LocalBroker: subscribers only see messages published in the same
+  process. Enough for a single ASGI worker with no Celery.
+- DatabaseBroker: publish() inserts a PubSubMessage row, and one poller per
+  process reads new rows every PUBSUB_POLL_INTERVAL seconds and fans them
+  out locally, so several workers (or Celery) can publish to each other.
+
+Without PUBSUB_BACKEND, DatabaseBroker is used when Celery is enabled
+(CELERY_BROKER_URL set), since Celery workers publish from other processes,
+and LocalBroker otherwise.
+"""
+import asyncio
+import threading
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+
+QUEUE_SIZE = 100
+FETCH_SIZE = 1000
+
+
+class Subscription:
+    """
+    A subscriber's view of one channel. Await get() for the next message;
+    close() (or leaving an `async with` block) unsubscribes.
+    """
+
+    def __init__(self, broker, channel):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+    def deliver(self, message):
+        """Called on the subscriber's loop; a slow consumer loses the overflow"""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            pass
+
+    async def get(self):
+        return await self.queue.get()
+
+    def get_nowait(self):
+        """Next queued message, or None"""
+        try:
+            return self.queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+
+class LocalBroker:
+    """Fans messages out to the subscribers in this process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._channels = {}
+
+    def subscribe(self, channel):
+        """Subscribe the running event loop to `channel`; returns a Subscription"""
+        subscription = Subscription(self, channel)
+        with self._lock:
+            self._channels.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._channels.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._channels[subscription.channel]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._channels.values())
+
+    def publish(self, channel, message):
+        """Deliver `message` (JSON-serializable) to the channel's subscribers; thread-safe"""
+        self._fan_out(channel, message)
+
+    def _fan_out(self, channel, message):
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, message)
+            except RuntimeError:
+                self.unsubscribe(subscription)  # its loop has closed
+
+
+class DatabaseBroker(LocalBroker):
+    """
+    Cross-process broker on top of the PubSubMessage table. Old rows are
+    removed by the 'pubsub.messages' retention policy.
+    """
+
+    def __init__(self, interval=None):
+        super().__init__()
+        self.interval = interval or getattr(settings, 'PUBSUB_POLL_INTERVAL', 1.0)
+        self._pollers = {}
+
+    def publish(self, channel, message):
+        from .models import PubSubMessage
+
+        PubSubMessage.objects.create(channel=channel, payload=message)
+
+    def subscribe(self, channel):
+        subscription = super().subscribe(channel)
+        loop = subscription.loop
+        with self._lock:
+            if loop not in self._pollers:
+                self._pollers[loop] = loop.create_task(self._poll(loop))
+        return subscription
+
+    async def _poll(self, loop):
+        """One task per event loop: read new rows and fan them out locally"""
+        try:
+            cursor = await sync_to_async(MessageCursor)()
+            while True:
+                await asyncio.sleep(self.interval)
+                with self._lock:
+                    # Checked and deregistered under the lock, so a new
+                    # subscriber either sees this poller running or starts one
+                    if not any(sub.loop is loop for subs in self._channels.values() for sub in subs):
+                        del self._pollers[loop]
+                        return
+                for channel, payload in await sync_to_async(cursor.read)():
+                    self._fan_out(channel, payload)
+        except BaseException:
+            with self._lock:
+                self._pollers.pop(loop, None)
+            raise
+
+
+class MessageCursor:
+    """
+    Position of one poller in the PubSubMessage table.
+
+    A row's ID is assigned at insert but the row only becomes visible when
+    its transaction commits, so it can show up after rows with higher IDs.
+    Each read therefore rescans the last PUBSUB_LOOKBACK_SECONDS of rows as
+    well as everything past the highest ID seen, and skips the IDs it has
+    already returned.
+    """
+
+    def __init__(self, lookback=None, now=None):
+        from .models import PubSubMessage
+
+        seconds = lookback if lookback is not None else getattr(settings, 'PUBSUB_LOOKBACK_SECONDS', 5)
+        self.lookback = timedelta(seconds=seconds)
+        since = (now or timezone.now()) - self.lookback
+        # Rows already visible when the poller starts are not replayed
+        self.seen = dict(PubSubMessage.objects.filter(created_at__gte=since).values_list('id', 'created_at'))
+        self.last_id = PubSubMessage.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+    def read(self, now=None):
+        """Return [(channel, payload)] for rows not returned before, in ID order"""
+        from .models import PubSubMessage
+
+        since = (now or timezone.now()) - self.lookback
+        rows = PubSubMessage.objects.filter(
+            Q(id__gt=self.last_id) | Q(created_at__gte=since)
+        ).order_by('id').values_list('id', 'channel', 'payload', 'created_at')[:FETCH_SIZE]
+
+        messages = []
+        for message_id, channel, payload, created_at in rows:
+            if message_id in self.seen:
+                continue
+            self.seen[message_id] = created_at
+            self.last_id = max(self.last_id, message_id)
+            messages.append((channel, payload))
+        self.seen = {message_id: created_at for message_id, created_at in self.seen.items() if created_at >= since}
+        return messages
+
+
+def default_backend():
+    """DatabaseBroker when Celery workers may publish, LocalBroker otherwise"""
+    if getattr(settings, 'CELERY_BROKER_URL', None):
+        return DatabaseBroker
+    return LocalBroker
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """The process-wide broker (settings.PUBSUB_BACKEND, else default_backend())"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                backend_path = getattr(settings, 'PUBSUB_BACKEND', None)
+                _broker = import_string(backend_path)() if backend_path else default_backend()()
+    return _broker
+
+
+def publish_on_commit(channel, message):
+    """Publish once the current transaction commits (immediately outside one)"""
+    transaction.on_commit(lambda: get_broker().publish(channel, message))
@@ -0,0 +1,179 @@
+"""
+Chunked retention for ever-growing tables.
+
+Each policy names a model, a filter and an age: rows matching the filter
+whose `age_field` is older than `days` expire. apply_policy() walks the
+expired rows in primary key order, `chunk_size` at a time, and deletes each
+chunk in its own short transaction with a pause in between, so no single
+statement holds locks on a large share of the table.
+
+With an archive directory, each chunk is first written to
+`<archive_dir>/<policy>/<first pk>-<last pk>.jsonl.gz` (one JSON object per
+row). Files are written under a temporary name and renamed when complete.
+
+Runs are resumable: every committed chunk is final, and a rerun after an
+interruption simply finds the expired rows that are left. A chunk that was
+archived but not deleted is archived again under the same name, so the
+archive holds each row at least once.
+
+A policy's `on_delete` hook stands in for the model's delete signals: it
+is called with each chunk just before delete_rows() removes the chunk with
+one DELETE statement, instead of Django loading every row to send
+post_delete. Policies without a hook go through QuerySet.delete().
+"""
+import base64
+import gzip
+import json
+import os
+import time
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, models, router, transaction
+from django.utils import timezone
+
+
+class RetentionPolicy:
+    """Rows of `model` matching `filters` expire `days` after `age_field`"""
+
+    def __init__(self, model, age_field, days, filters=None, on_delete=None):
+        self.model_label = model
+        self.age_field = age_field
+        self.days = days
+        self.filters = filters or {}
+        self.on_delete = on_delete
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def expired(self, now=None):
+        """Queryset of the rows this policy would remove"""
+        model = self.model
+        cutoff = (now or timezone.now()) - timedelta(days=self.days)
+        if not isinstance(model._meta.get_field(self.age_field), models.DateTimeField):
+            cutoff = timezone.localtime(cutoff).date()
+        return model.objects.filter(**self.filters, **{f'{self.age_field}__lt': cutoff})
+
+
+def delete_rows(model, pks):
+    """
+    Delete rows of `model` by primary key in one DELETE statement.
+
+    Bypasses Django's deletion collector: no signals are sent and no
+    cascades run, so only use it where the caller does the receivers' work
+    itself and nothing references the rows.
+
+    Returns:
+        int: Number of rows deleted
+    """
+    pks = list(pks)
+    if not pks:
+        return 0
+    connection = connections[router.db_for_write(model)]
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(model._meta.pk.column)
+    placeholders = ', '.join(['%s'] * len(pks))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE {column} IN ({placeholders})', pks)
+        return cursor.rowcount
+
+
+def uncount_unread_notifications(chunk):
+    """Batched users.signals.decrement_unread_count for a chunk of notifications"""
+    from users.counters import bump_unread_counts
+
+    bump_unread_counts(chunk.filter(is_read=False).values_list('recipient_id', flat=True), sign=-1)
+
+
+POLICIES = {
+    'notifications.read': RetentionPolicy(
+        'users.Notification', 'created_at',
+        getattr(settings, 'RETENTION_READ_NOTIFICATION_DAYS', 30), {'is_read': True}
+    ),
+    'notifications.unread': RetentionPolicy(
+        'users.Notification', 'created_at',
+        getattr(settings, 'RETENTION_UNREAD_NOTIFICATION_DAYS', 180), {'is_read': False},
+        on_delete=uncount_unread_notifications
+    ),
+    'reminders': RetentionPolicy(
+        'shows.ShowReminder', 'scheduled_for',
+        getattr(settings, 'RETENTION_REMINDER_DAYS', 60)
+    ),
+    # viewer_stats looks back at most 90 days
+    'news.daily_viewers': RetentionPolicy('news.NewsDailyViewers', 'day', 90),
+    # Pollers only read rows published since they started
+    'pubsub.messages': RetentionPolicy('api.PubSubMessage', 'created_at', 1),
+}
+
+
+class ArchiveEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder that also writes binary columns (base64)"""
+
+    def default(self, o):
+        if isinstance(o, (bytes, memoryview)):
+            return base64.b64encode(bytes(o)).decode('ascii')
+        return super().default(o)
+
+
+def archive_rows(rows, archive_dir, name, first_pk, last_pk):
+    """Write rows to a gzipped JSONL file; returns its path"""
+    directory = os.path.join(archive_dir, name)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'{first_pk:012d}-{last_pk:012d}.jsonl.gz')
+    partial = f'{path}.tmp'
+    with gzip.open(partial, 'wt', encoding='utf-8') as archive:
+        for row in rows:
+            archive.write(json.dumps(row, cls=ArchiveEncoder))
+            archive.write('\n')
+    os.replace(partial, path)
+    return path
+
+
+def apply_policy(name, chunk_size=1000, pause=0.1, archive_dir=None, max_chunks=None, now=None):
+    """
+    Delete (and optionally archive) the rows expired under policy `name`.
+
+    Returns:
+        dict: rows deleted, chunks processed, archive files written, elapsed seconds
+    """
+    policy = POLICIES[name]
+    expired = policy.expired(now=now).order_by('pk')
+    started = time.monotonic()
+
+    deleted = 0
+    chunks = 0
+    archives = []
+    while max_chunks is None or chunks < max_chunks:
+        if chunks:
+            time.sleep(pause)
+        with transaction.atomic():
+            # Rows locked by another run are skipped rather than waited for
+            pks = list(expired.select_for_update(skip_locked=True).values_list('pk', flat=True)[:chunk_size])
+            if not pks:
+                break
+            chunk = expired.filter(pk__in=pks)
+            if archive_dir:
+                rows = list(chunk.values())
+                archives.append(archive_rows(rows, archive_dir, name, pks[0], pks[-1]))
+            if policy.on_delete:
+                policy.on_delete(chunk)
+                deleted += delete_rows(policy.model, pks)
+            else:
+                _, per_model = chunk.delete()
+                deleted += per_model.get(policy.model._meta.label, 0)
+        chunks += 1
+
+    return {
+        'deleted': deleted,
+        'chunks': chunks,
+        'archives': archives,
+        'elapsed': time.monotonic() - started,
+    }
+
+
+def apply_policies(names=None, **options):
+    """Apply several policies (default: all); returns {name: result}"""
+    return {name: apply_policy(name, **options) for name in (names or POLICIES)}
@@ -0,0 +1,25 @@
+"""
+Full-text search for shows, news, events and users.
+
+- documents: which models are indexed, on which fields
+- backends: SQLite FTS5 and PostgreSQL tsvector/GIN implementations
+- filters: FullTextSearchFilter, the `?search=` filter for viewsets
+- signals: keep the index current on save/delete
+
+Index tables are created by api/migrations/0001_search_index.py; run
+`manage.py rebuild_search_index` after bulk loads that bypass signals.
+"""
+from .backends import get_backend
+from .documents import DOCUMENTS, get_document
+
+
+def search(model, query, limit=None):
+    """Return primary keys of `model` matching `query`, best match first"""
+    document = get_document(model)
+    backend = get_backend()
+    if document is None or backend is None:
+        return None
+    return backend.search(document, query, limit)
+
+
+__all__ = ['DOCUMENTS', 'get_backend', 'get_document', 'search']
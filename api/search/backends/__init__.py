@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.db import connection as default_connection
+from django.utils.module_loading import import_string
+
+from .base import SearchBackend
+from .postgres import PostgresBackend
+from .sqlite import SQLiteFTS5Backend
+
+
+BACKENDS_BY_VENDOR = {
+    backend.vendor: backend for backend in (SQLiteFTS5Backend, PostgresBackend)
+}
+
+
+def get_backend(connection=None):
+    """
+    Return the search backend for a database connection.
+
+    settings.SEARCH_BACKEND (dotted path) overrides the choice; otherwise the
+    backend is picked by database vendor. Returns None when no backend
+    supports the database, in which case callers fall back to LIKE scans.
+    """
+    connection = connection or default_connection
+    backend_path = getattr(settings, 'SEARCH_BACKEND', None)
+    backend_class = import_string(backend_path) if backend_path else BACKENDS_BY_VENDOR.get(connection.vendor)
+    return backend_class(connection) if backend_class else None
+
+
+__all__ = ['SearchBackend', 'SQLiteFTS5Backend', 'PostgresBackend', 'get_backend']
@@ -0,0 +1,83 @@
+import re
+
+from django.conf import settings
+from django.db.models.expressions import RawSQL
+
+
+MAX_QUERY_TERMS = 10
+
+
+class SearchBackend:
+    """
+    Interface for full-text search backends.
+
+    A backend owns one index table per SearchDocument and answers ranked
+    queries against it. All methods work on a single database connection.
+    """
+    vendor = None
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def quote(self, name):
+        return self.connection.ops.quote_name(name)
+
+    def terms(self, query):
+        """Split user input into safe word tokens (no operators, no quotes)"""
+        return re.findall(r'\w+', query.lower())[:MAX_QUERY_TERMS]
+
+    def create_table(self, document):
+        """Create the index table for a document"""
+        raise NotImplementedError
+
+    def drop_table(self, document):
+        """Drop the index table for a document"""
+        raise NotImplementedError
+
+    def rebuild(self, document):
+        """Re-index every row of a document's model in one statement"""
+        raise NotImplementedError
+
+    def index(self, document, instances):
+        """Add or replace the index entries for model instances"""
+        raise NotImplementedError
+
+    def remove(self, document, pks):
+        """Drop the index entries for the given primary keys"""
+        raise NotImplementedError
+
+    def search(self, document, query, limit=None):
+        """
+        Run a ranked query.
+
+        Every word in `query` must match, as a prefix, in the title or body.
+
+        Returns:
+            list: Primary keys, best match first
+        """
+        raise NotImplementedError
+
+    def match(self, document, query):
+        """
+        Match `query` inside another query rather than with a capped search().
+
+        Returns:
+            tuple: (RawSQL selecting the matching primary keys, RawSQL rank of
+            the outer query's row, lower is better), or None without terms
+        """
+        terms = self.terms(query)
+        if not terms:
+            return None
+        match_sql, rank_sql, params = self.match_sql(document, terms, self.outer_pk(document))
+        return RawSQL(match_sql, params), RawSQL(rank_sql, params)
+
+    def match_sql(self, document, terms, outer_pk):
+        """SQL and params behind match(); `outer_pk` is the outer row's key column"""
+        raise NotImplementedError
+
+    def outer_pk(self, document):
+        opts = document.model._meta
+        return f'{self.quote(opts.db_table)}.{self.quote(opts.pk.column)}'
+
+    def default_limit(self):
+        return getattr(settings, 'SEARCH_MAX_RESULTS', 500)
@@ -0,0 +1,104 @@
+from django.conf import settings
+
+from .base import SearchBackend
+
+
+class PostgresBackend(SearchBackend):
+    """
+    PostgreSQL tsvector backend.
+
+    Each document gets a table of (object_id, document tsvector) with a GIN
+    index. Titles are weighted A and bodies B, and results are ranked with
+    ts_rank_cd.
+    """
+    vendor = 'postgresql'
+
+    @property
+    def config(self):
+        return getattr(settings, 'SEARCH_CONFIG', 'english')
+
+    def _vector(self, title_sql, body_sql):
+        return (
+            f"setweight(to_tsvector('{self.config}', {title_sql}), 'A') || "
+            f"setweight(to_tsvector('{self.config}', {body_sql}), 'B')"
+        )
+
+    def create_table(self, document):
+        table = self.quote(document.table)
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS {table} ('
+                f'object_id bigint PRIMARY KEY, document tsvector NOT NULL)'
+            )
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {self.quote(document.table + "_gin")} '
+                f'ON {table} USING GIN (document)'
+            )
+
+    def drop_table(self, document):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {self.quote(document.table)}')
+
+    def _concat(self, columns):
+        parts = [f"coalesce({self.quote(column)}::text, '')" for column in columns]
+        return "concat_ws(' ', " + ', '.join(parts) + ')' if parts else "''"
+
+    def rebuild(self, document):
+        table = self.quote(document.table)
+        source = self.quote(document.model._meta.db_table)
+        pk = self.quote(document.model._meta.pk.column)
+        vector = self._vector(
+            self._concat(document.columns(document.title_fields)),
+            self._concat(document.columns(document.body_fields)),
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'TRUNCATE {table}')
+            cursor.execute(f'INSERT INTO {table} (object_id, document) SELECT {pk}, {vector} FROM {source}')
+
+    def index(self, document, instances):
+        rows = [(instance.pk, *document.values(instance)) for instance in instances]
+        if not rows:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {self.quote(document.table)} (object_id, document) '
+                f"VALUES (%s, {self._vector('%s', '%s')}) "
+                f'ON CONFLICT (object_id) DO UPDATE SET document = EXCLUDED.document',
+                rows
+            )
+
+    def remove(self, document, pks):
+        pks = list(pks)
+        if not pks:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {self.quote(document.table)} WHERE object_id = ANY(%s)',
+                [pks]
+            )
+
+    def _tsquery(self, terms):
+        return ' & '.join(f'{term}:*' for term in terms)
+
+    def search(self, document, query, limit=None):
+        terms = self.terms(query)
+        if not terms:
+            return []
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT object_id FROM {self.quote(document.table)}, '
+                f"to_tsquery('{self.config}', %s) query "
+                f'WHERE document @@ query ORDER BY ts_rank_cd(document, query) DESC LIMIT %s',
+                [self._tsquery(terms), limit or self.default_limit()]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def match_sql(self, document, terms, outer_pk):
+        table = self.quote(document.table)
+        tsquery = f"to_tsquery('{self.config}', %s)"
+        return (
+            f'SELECT object_id FROM {table} WHERE document @@ {tsquery}',
+            # Negated so that, as with bm25(), the best match sorts first
+            f'SELECT -ts_rank_cd(document, {tsquery}) FROM {table} WHERE object_id = {outer_pk}',
+            [self._tsquery(terms)],
+        )
@@ -0,0 +1,92 @@
+from .base import SearchBackend
+
+
+# bm25() column weights: title matches count ten times as much as body matches
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+
+class SQLiteFTS5Backend(SearchBackend):
+    """
+    SQLite FTS5 backend.
+
+    Each document gets an FTS5 virtual table whose rowid is the model's
+    primary key, so updates and deletes are rowid lookups. Prefix indexes
+    keep `word*` queries from scanning the whole vocabulary.
+    """
+    vendor = 'sqlite'
+
+    def create_table(self, document):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {self.quote(document.table)} '
+                f"USING fts5(title, body, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+            )
+
+    def drop_table(self, document):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {self.quote(document.table)}')
+
+    def _concat(self, columns):
+        parts = [f"coalesce({self.quote(column)}, '')" for column in columns]
+        return " || ' ' || ".join(parts) if parts else "''"
+
+    def rebuild(self, document):
+        table = self.quote(document.table)
+        source = self.quote(document.model._meta.db_table)
+        pk = self.quote(document.model._meta.pk.column)
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {table}')
+            cursor.execute(
+                f'INSERT INTO {table} (rowid, title, body) '
+                f'SELECT {pk}, {self._concat(document.columns(document.title_fields))}, '
+                f'{self._concat(document.columns(document.body_fields))} FROM {source}'
+            )
+
+    def index(self, document, instances):
+        rows = [(instance.pk, *document.values(instance)) for instance in instances]
+        if not rows:
+            return
+        table = self.quote(document.table)
+        with self.connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {table} WHERE rowid = %s', [(row[0],) for row in rows])
+            cursor.executemany(f'INSERT INTO {table} (rowid, title, body) VALUES (%s, %s, %s)', rows)
+
+    def remove(self, document, pks):
+        pks = list(pks)
+        if not pks:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {self.quote(document.table)} WHERE rowid = %s',
+                [(pk,) for pk in pks]
+            )
+
+    def _match(self, terms):
+        # Quoted prefix terms are implicitly ANDed by FTS5
+        return ' '.join(f'"{term}"*' for term in terms)
+
+    def _bm25(self, table):
+        return f'bm25({table}, {TITLE_WEIGHT}, {BODY_WEIGHT})'
+
+    def search(self, document, query, limit=None):
+        terms = self.terms(query)
+        if not terms:
+            return []
+        table = self.quote(document.table)
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {table} WHERE {table} MATCH %s '
+                f'ORDER BY {self._bm25(table)} LIMIT %s',
+                [self._match(terms), limit or self.default_limit()]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def match_sql(self, document, terms, outer_pk):
+        table = self.quote(document.table)
+        return (
+            f'SELECT rowid FROM {table} WHERE {table} MATCH %s',
+            # bm25() is negative, best match lowest
+            f'SELECT {self._bm25(table)} FROM {table} WHERE {table} MATCH %s AND rowid = {outer_pk}',
+            [self._match(terms)],
+        )
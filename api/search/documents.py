@@ -0,0 +1,62 @@
+"""
+Searchable models and the fields they are indexed on.
+
+Each document has two weighted columns: `title` (ranked highest) and
+`body`. The backends keep one index table per document, keyed by the
+model's primary key.
+"""
+from django.apps import apps
+
+
+class SearchDocument:
+    """Describes how one model is indexed"""
+
+    def __init__(self, label, title_fields, body_fields):
+        self.label = label
+        self.title_fields = list(title_fields)
+        self.body_fields = list(body_fields)
+
+    def __repr__(self):
+        return f'<SearchDocument {self.label}>'
+
+    @property
+    def model(self):
+        return apps.get_model(self.label)
+
+    @property
+    def fields(self):
+        return self.title_fields + self.body_fields
+
+    @property
+    def table(self):
+        """Name of the index table for this document"""
+        opts = self.model._meta
+        return f'search_{opts.app_label}_{opts.model_name}'
+
+    def columns(self, field_names):
+        """Database columns backing the given model fields"""
+        return [self.model._meta.get_field(name).column for name in field_names]
+
+    def values(self, instance):
+        """Return (title, body) text for an instance"""
+        return (
+            ' '.join(str(getattr(instance, name) or '') for name in self.title_fields),
+            ' '.join(str(getattr(instance, name) or '') for name in self.body_fields),
+        )
+
+
+DOCUMENTS = [
+    SearchDocument('shows.Show', ['title'], ['description']),
+    SearchDocument('news.News', ['title'], ['content', 'tags']),
+    SearchDocument('events.Event', ['title'], ['description', 'venue_name']),
+    SearchDocument('users.User', ['username'], ['first_name', 'last_name']),
+]
+
+
+def get_document(model):
+    """Return the SearchDocument for a model (or None if it isn't indexed)"""
+    label = model._meta.label
+    for document in DOCUMENTS:
+        if document.label == label:
+            return document
+    return None
@@ -0,0 +1,40 @@
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+from .backends import get_backend
+from .documents import get_document
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    Drop-in replacement for SearchFilter backed by the full-text index.
+
+    `?search=` is answered by the search backend for indexed models and
+    results come back best match first unless the request passes an explicit
+    `?ordering=`. Place it after OrderingFilter in `filter_backends` so the
+    rank ordering isn't overridden by the view's default ordering.
+
+    The match runs as a subquery of the view's queryset, so every matching
+    row the view's own filters allow is returned and counted: unlike
+    search(), there is no SEARCH_MAX_RESULTS cap.
+
+    Models without a SearchDocument (or databases without a backend) fall
+    back to the regular `search_fields` LIKE scan.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        document = get_document(queryset.model)
+        backend = get_backend()
+        if not terms or document is None or backend is None:
+            return super().filter_queryset(request, queryset, view)
+
+        match = backend.match(document, ' '.join(terms))
+        if match is None:
+            return queryset.none()
+        pks, rank = match
+        queryset = queryset.filter(pk__in=pks)
+
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            queryset = queryset.order_by(rank, 'pk')
+        return queryset
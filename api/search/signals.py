@@ -0,0 +1,35 @@
+"""
+Keep the full-text index in sync with model saves and deletes.
+"""
+from django.db.models.signals import post_save, post_delete
+
+from .backends import get_backend
+from .documents import DOCUMENTS, get_document
+
+
+def update_search_index(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Re-index an instance when one of its indexed fields may have changed"""
+    document = get_document(sender)
+    if raw or document is None:
+        return
+    if update_fields is not None and not set(update_fields).intersection(document.fields):
+        return
+
+    backend = get_backend()
+    if backend is not None:
+        backend.index(document, [instance])
+
+
+def remove_from_search_index(sender, instance, **kwargs):
+    """Drop a deleted instance from the index"""
+    document = get_document(sender)
+    backend = get_backend()
+    if document is not None and backend is not None:
+        backend.remove(document, [instance.pk])
+
+
+def connect_signals():
+    """Connect the index receivers for every searchable model"""
+    for document in DOCUMENTS:
+        post_save.connect(update_search_index, sender=document.model, dispatch_uid=f'search_index_{document.label}')
+        post_delete.connect(remove_from_search_index, sender=document.model, dispatch_uid=f'search_remove_{document.label}')
@@ -0,0 +1,46 @@
+"""
+Shared serializer building blocks.
+"""
+from django.db import models
+from rest_framework import serializers
+
+from .counters import with_pending
+
+
+class BatchLoadMixin:
+    """
+    Base for serializer mixins that preload per-page data. Each mixin's
+    load_batch() calls super() so several can be combined on one serializer.
+    """
+
+    def load_batch(self, instances):
+        pass
+
+
+class BatchedListSerializer(serializers.ListSerializer):
+    """
+    List serializer that lets the child load per-row extras for the whole
+    page at once: before serializing, it calls `child.load_batch(instances)`,
+    so a field that would cost one query per row costs one query per page.
+
+    Use with `Meta.list_serializer_class = BatchedListSerializer`.
+    """
+
+    def to_representation(self, data):
+        instances = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        self.child.load_batch(instances)
+        return super().to_representation(instances)
+
+
+class PendingCountersMixin(BatchLoadMixin):
+    """
+    Adds unflushed increments (api/counters.py) to the buffered counters
+    named in `Meta.pending_counters`: one query per counter for the page.
+    Single objects are topped up by the view with with_pending().
+    """
+
+    def load_batch(self, instances):
+        super().load_batch(instances)
+        for field in getattr(self.Meta, 'pending_counters', ()):
+            if field in self.fields:
+                with_pending(instances, field)
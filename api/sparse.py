@@ -0,0 +1,192 @@
+"""
+Sparse fieldsets for list endpoints.
+
+    GET /api/shows/?fields=id,slug,title,thumbnail
+    GET /api/shows/?fields=id,title&expand=creator,tags
+
+`?fields=` keeps only the named fields; nested relations listed in
+`Meta.expandable_fields` can be added with `?expand=` (or named in
+`?fields=` directly). Without either parameter every field is returned;
+naming a field the serializer doesn't have is a 400 listing the valid ones.
+
+Pruning happens twice: SparseFieldsSerializerMixin drops the fields before
+serialization, and SparseFieldsViewMixin narrows the list queryset to the
+columns, joins and prefetches those fields need. Fields that are not model
+columns (properties, method fields) declare the columns they read in
+`Meta.field_dependencies`; a field the queryset can't be narrowed for leaves
+the queryset untouched rather than risking a query per row.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def _parse_list(value):
+    return {name.strip() for name in (value or '').split(',') if name.strip()}
+
+
+def selected_fields(request, serializer_class):
+    """
+    Return the set of field names requested for `serializer_class`, or None
+    when the request asks for everything.
+
+    Raises:
+        ValidationError: `?fields=` names a field the serializer doesn't have
+    """
+    if request is None:
+        return None
+    fields = _parse_list(request.query_params.get(FIELDS_PARAM))
+    if not fields:
+        return None
+    meta = serializer_class.Meta
+    unknown = fields - set(meta.fields)
+    if unknown:
+        raise ValidationError({FIELDS_PARAM: [
+            f"Unknown fields: {', '.join(sorted(unknown))}. Valid fields: {', '.join(meta.fields)}"
+        ]})
+    expand = _parse_list(request.query_params.get(EXPAND_PARAM))
+    expand &= set(getattr(meta, 'expandable_fields', ()))
+    return (fields | expand) & set(meta.fields)
+
+
+def expand_requested(request, name):
+    """True if `name` is listed in the request's `?expand=`"""
+    if request is None:
+        return False
+    return name in _parse_list(request.query_params.get(EXPAND_PARAM))
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Drop the fields a `?fields=`/`?expand=` request didn't ask for.
+    Only applies to the top-level serializer of a response.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return fields
+
+        selected = selected_fields(self.context.get('request'), type(self))
+        if selected is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in selected}
+
+
+def _concrete_columns(serializer):
+    """Model columns a nested ModelSerializer reads, or None if it reads anything else"""
+    meta = getattr(serializer, 'Meta', None)
+    if meta is None or getattr(meta, 'field_dependencies', None):
+        return None
+    columns = []
+    for name in meta.fields:
+        try:
+            field = meta.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if field.many_to_many or field.one_to_many:
+            return None
+        columns.append(name)
+    return columns
+
+
+def sparse_queryset(queryset, serializer_class, selected):
+    """
+    Narrow `queryset` to what `selected` fields of `serializer_class` read:
+    only() the needed columns, and drop select_related joins and prefetches
+    for relations that aren't serialized.
+    """
+    opts = queryset.model._meta
+    dependencies = getattr(serializer_class.Meta, 'field_dependencies', {})
+    declared = serializer_class._declared_fields
+
+    columns = {opts.pk.name}
+    joins = set()
+    prefetches = set()
+    for name in selected:
+        declared_field = declared.get(name)
+        if name in dependencies:
+            paths = dependencies[name]
+        else:
+            source = getattr(declared_field, 'source', None) or name
+            paths = [source.replace('.', '__')]
+
+        for path in paths:
+            head, _, rest = path.partition('__')
+            try:
+                field = opts.get_field(head)
+            except FieldDoesNotExist:
+                return queryset
+            if field.many_to_many or field.one_to_many:
+                prefetches.add(head)
+            elif field.is_relation:
+                joins.add(head)
+                columns.add(head)
+                if rest:
+                    columns.add(path)
+                    continue
+                if isinstance(declared_field, serializers.BaseSerializer):
+                    # None: the nested serializer reads more than plain columns,
+                    # so the joined row is loaded whole
+                    nested = _concrete_columns(declared_field)
+                    columns.update(f'{head}__{column}' for column in nested or ())
+            else:
+                columns.add(path)
+
+    select_related = queryset.query.select_related
+    if isinstance(select_related, dict):
+        kept = [relation for relation in select_related if relation in joins]
+        queryset = queryset.select_related(None)
+        if kept:
+            queryset = queryset.select_related(*kept)
+    elif select_related:
+        # select_related() with no arguments: can't tell which joins to keep
+        return queryset
+    else:
+        joins.clear()
+
+    # Relations that aren't joined are loaded lazily by their FK column
+    columns = {
+        column for column in columns
+        if '__' not in column or column.split('__', 1)[0] in joins
+    }
+
+    lookups = queryset._prefetch_related_lookups
+    if lookups:
+        kept = [
+            lookup for lookup in lookups
+            if (lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup).split('__')[0] in prefetches
+        ]
+        queryset = queryset.prefetch_related(None)
+        if kept:
+            queryset = queryset.prefetch_related(*kept)
+
+    return queryset.only(*columns)
+
+
+class SparseFieldsViewMixin:
+    """
+    Viewset mixin that trims the list queryset to the fields requested with
+    `?fields=`/`?expand=` (the serializer must use SparseFieldsSerializerMixin).
+    """
+    sparse_actions = ('list',)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action not in self.sparse_actions:
+            return queryset
+        serializer_class = self.get_serializer_class()
+        if not issubclass(serializer_class, SparseFieldsSerializerMixin):
+            return queryset
+        selected = selected_fields(self.request, serializer_class)
+        if selected is None:
+            return queryset
+        return sparse_queryset(queryset, serializer_class, selected)
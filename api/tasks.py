@@ -0,0 +1,33 @@
+from celery import shared_task
+from django.conf import settings
+from .counters import flush_counters
+from .retention import apply_policies
+
+
+@shared_task
+def flush_buffered_counters():
+    """
+    Applies buffered share_count/view_count increments in batched UPDATEs.
+    Runs every minute.
+    """
+    result = flush_counters()
+    print(
+        f"Flushed {result['deltas']} counter deltas to {result['objects']} objects "
+        f"in {result['updates']} updates"
+    )
+    return result
+
+
+@shared_task
+def apply_retention_policies():
+    """
+    Deletes expired notifications, reminders and viewer sketches in chunks,
+    archiving them first when RETENTION_ARCHIVE_DIR is set.
+    This is the only retention task (shows.tasks.cleanup_old_notifications
+    is a deprecated alias).
+    Runs daily via Celery Beat.
+    """
+    results = apply_policies(archive_dir=getattr(settings, 'RETENTION_ARCHIVE_DIR', '') or None)
+    for name, result in results.items():
+        print(f"{name}: deleted {result['deleted']} rows in {result['chunks']} chunks")
+    return {name: result['deleted'] for name, result in results.items()}
@@ -1,3 +1,378 @@
+"""
+Test suite for the api app.
+
+Run with: python manage.py test api
+"""
+
+import gzip
+import json
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.db.models import F
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from events.models import Event
+from news.models import News
+from news.uniques import record_view, unique_viewers
+from shows.models import Show, Tag
+from users.models import Notification
+from .allocator import allocate_unique
+from .cache import bump_namespace_version, namespaced_key
+from .counters import flush_counters
+from .hyperloglog import HyperLogLog
+from .models import CacheNamespace, CounterDelta
+from .retention import apply_policy, delete_rows
+from .search import search
+
+User = get_user_model()
+
+
+class FullTextSearchTests(TestCase):
+    """Test the full-text index and the ?search= filter"""
+
+    def setUp(self):
+        self.creator = User.objects.create_user(username='satoshi', password='pass12345', role='creator')
+        self.title_match = Show.objects.create(
+            title='Bitcoin Morning', description='Daily market recap', creator=self.creator, status='published'
+        )
+        self.body_match = Show.objects.create(
+            title='Builders Hour', description='We talk bitcoin and stacks', creator=self.creator, status='published'
+        )
+        Show.objects.create(title='Art Talk', description='NFT galleries', creator=self.creator, status='published')
+
+    def test_ranked_prefix_search(self):
+        """Title matches rank above body matches; words match as prefixes"""
+        self.assertEqual(search(Show, 'bitcoin'), [self.title_match.pk, self.body_match.pk])
+        self.assertEqual(search(Show, 'bitc stack'), [self.body_match.pk])
+        self.assertEqual(search(Show, '"; DROP TABLE x --'), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        """Edits are re-indexed and deleted rows leave the index"""
+        self.body_match.description = 'Ordinals only'
+        self.body_match.save()
+        self.title_match.delete()
+
+        self.assertEqual(search(Show, 'bitcoin'), [])
+        self.assertEqual(search(Show, 'ordinals'), [self.body_match.pk])
+
+    def test_viewsets_use_index(self):
+        """?search= returns ranked results unless ?ordering= is given"""
+        client = APIClient()
+
+        response = client.get('/api/shows/', {'search': 'bitcoin'})
+        self.assertEqual([show['title'] for show in response.data['results']], ['Bitcoin Morning', 'Builders Hour'])
+
+        response = client.get('/api/shows/', {'search': 'bitcoin', 'ordering': 'title'})
+        self.assertEqual([show['title'] for show in response.data['results']], ['Bitcoin Morning', 'Builders Hour'])
+
+        News.objects.create(title='Stacks upgrade', content='Nakamoto release', author=self.creator, is_published=True)
+        response = client.get('/api/news/', {'search': 'nakamoto'})
+        self.assertEqual([item['title'] for item in response.data['results']], ['Stacks upgrade'])
+
+        response = client.get('/api/users/', {'search': 'sato'})
+        self.assertEqual([user['username'] for user in response.data['results']], ['satoshi'])
+
+    def test_view_filters_apply_before_result_cap(self):
+        """?search= is not capped at SEARCH_MAX_RESULTS before the view's filters run"""
+        other = User.objects.create_user(username='hal', password='pass12345', role='creator')
+        for number in range(3):
+            Show.objects.create(title=f'Bitcoin Daily {number}', creator=other, status='published')
+        client = APIClient()
+
+        with self.settings(SEARCH_MAX_RESULTS=2):
+            self.assertNotIn(self.body_match.pk, search(Show, 'bitcoin'))
+
+            response = client.get('/api/shows/', {'search': 'bitcoin', 'creator': self.creator.pk})
+            self.assertEqual(
+                [show['title'] for show in response.data['results']], ['Bitcoin Morning', 'Builders Hour']
+            )
+            response = client.get('/api/shows/', {'search': 'bitcoin'})
+            self.assertEqual(response.data['count'], 5)
+
+
+class CacheNamespaceTests(TestCase):
+    """Test versioned cache namespaces"""
+
+    def test_versions_are_shared_between_processes(self):
+        """Versions live in the database, not in the per-process cache"""
+        key = namespaced_key('test', 'entry')
+        cache.clear()
+        self.assertEqual(namespaced_key('test', 'entry'), key)
+
+        # A bump made by another worker is one UPDATE of the shared row
+        CacheNamespace.objects.filter(name='test').update(version=F('version') + 1)
+        bumped = namespaced_key('test', 'entry')
+        self.assertNotEqual(bumped, key)
+        bump_namespace_version('test')
+        self.assertNotIn(namespaced_key('test', 'entry'), (key, bumped))
+
+
+class UniqueAllocatorTests(TestCase):
+    """Test slug and username allocation"""
+
+    def setUp(self):
+        self.creator = User.objects.create_user(username='creator', password='pass12345', role='creator')
+
+    def test_suffixes_in_one_query(self):
+        """Colliding titles get increasing suffixes, one lookup each"""
+        slugs = []
+        for _ in range(4):
+            with self.assertNumQueries(1):
+                slug = allocate_unique(Show, 'slug', 'daily-show')
+            Show.objects.create(title='Daily Show', slug=slug, creator=self.creator)
+            slugs.append(slug)
+
+        self.assertEqual(slugs, ['daily-show', 'daily-show-1', 'daily-show-2', 'daily-show-3'])
+        # Similar slugs that aren't numeric suffixes don't count
+        Show.objects.create(title='Daily Show Extra', creator=self.creator)
+        self.assertEqual(Show.objects.create(title='Daily Show', creator=self.creator).slug, 'daily-show-4')
+
+    def test_models_allocate_on_save(self):
+        """News, Tag and usernames use the allocator"""
+        first = News.objects.create(title='Launch', content='a', author=self.creator)
+        second = News.objects.create(title='Launch', content='b', author=self.creator)
+        self.assertEqual((first.slug, second.slug), ('launch', 'launch-1'))
+
+        Tag.objects.create(name='Crypto News')
+        self.assertEqual(Tag.objects.create(name='crypto news').slug, 'crypto-news-1')
+
+        long_tag = Tag.objects.create(name='x' * 50)
+        self.assertLessEqual(len(long_tag.slug), 50)
+
+        User.objects.create_user(username='user_SP2J6ZY4', password='pass12345')
+        self.assertEqual(allocate_unique(User, 'username', 'user_SP2J6ZY4', separator='_'), 'user_SP2J6ZY4_1')
+
+    def test_other_integrity_errors_are_raised(self):
+        """Only collisions on the allocated field are retried"""
+        Tag.objects.create(name='Crypto')
+
+        with self.assertRaises(IntegrityError):
+            Tag.objects.create(name='Crypto')
+        self.assertEqual(Tag.objects.count(), 1)
+
+
+class SparseFieldsTests(TestCase):
+    """Test ?fields= / ?expand= on list endpoints"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.creator = User.objects.create_user(username='creator', password='pass12345', role='creator')
+        show = Show.objects.create(title='Show', description='x', creator=self.creator, status='published')
+        show.tags.add(Tag.objects.create(name='Bitcoin'))
+
+    def test_fields_prune_output_and_queries(self):
+        """Unrequested relations are neither serialized nor joined/prefetched"""
+        with self.assertNumQueries(2) as queries:  # count + page
+            response = self.client.get('/api/shows/', {'fields': 'id,slug,title,thumbnail'})
+
+        self.assertEqual(set(response.data['results'][0]), {'id', 'slug', 'title', 'thumbnail'})
+        page_sql = queries.captured_queries[-1]['sql']
+        self.assertNotIn('users_user', page_sql)
+        self.assertNotIn('"description"', page_sql)
+
+    def test_expand_adds_relations(self):
+        """Expanded relations come back with their own joins/prefetches"""
+        with self.assertNumQueries(3):  # count + page with creator + tags
+            response = self.client.get('/api/shows/', {'fields': 'id,schedule_display', 'expand': 'creator,tags'})
+
+        show = response.data['results'][0]
+        self.assertEqual(set(show), {'id', 'schedule_display', 'creator', 'tags'})
+        self.assertEqual(show['creator']['username'], 'creator')
+        self.assertEqual([tag['name'] for tag in show['tags']], ['Bitcoin'])
+
+        # Without ?fields= everything is returned as before
+        response = self.client.get('/api/shows/')
+        self.assertIn('guests', response.data['results'][0])
+
+    def test_unknown_fields_are_rejected(self):
+        """A misspelt ?fields= name is a 400 listing the valid names, not rows of {}"""
+        response = self.client.get('/api/shows/', {'fields': 'id,titel'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('titel', response.data['fields'][0])
+        self.assertIn('title', response.data['fields'][0])
+
+    def test_other_list_endpoints(self):
+        """News, events and users support the same parameters"""
+        now = timezone.now()
+        Event.objects.create(
+            title='Meetup', description='x', organizer=self.creator,
+            start_datetime=now + timedelta(days=1), end_datetime=now + timedelta(days=1, hours=2)
+        )
+        News.objects.create(title='Launch', content='x', author=self.creator, is_published=True)
+
+        response = self.client.get('/api/events/', {'fields': 'id,status'})
+        self.assertEqual(response.data['results'][0], {'id': response.data['results'][0]['id'], 'status': 'upcoming'})
+
+        response = self.client.get('/api/news/', {'fields': 'title', 'expand': 'author'})
+        self.assertEqual(set(response.data['results'][0]), {'title', 'author'})
+
+        response = self.client.get('/api/users/', {'fields': 'username,is_creator'})
+        self.assertEqual(response.data['results'][0], {'username': 'creator', 'is_creator': True})
+
+
+class BufferedCounterTests(TestCase):
+    """Test write-behind share/view counters"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create_user(username='author', password='pass12345', role='creator')
+        self.show = Show.objects.create(title='Show', description='x', creator=self.author, status='published')
+        self.article = News.objects.create(title='Article', content='x', author=self.author, is_published=True)
+        self.client.force_authenticate(self.author)
+
+    def test_increments_are_buffered_and_visible(self):
+        """Writes append deltas; reads include them before any flush"""
+        for _ in range(3):
+            response = self.client.post(f'/api/news/{self.article.pk}/increment_view/')
+        self.assertEqual(response.data['view_count'], 3)
+        self.client.post(f'/api/shows/{self.show.slug}/track_share/')
+
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.view_count, 0)
+        self.assertEqual(self.client.get(f'/api/news/{self.article.pk}/').data['view_count'], 3)
+        self.assertEqual(self.client.get(f'/api/shows/{self.show.slug}/').data['share_count'], 1)
+
+    def test_list_pages_include_pending(self):
+        """List and search responses add pending deltas, one query per counter"""
+        self.client.post(f'/api/news/{self.article.pk}/increment_view/')
+        self.client.post(f'/api/shows/{self.show.slug}/track_share/')
+        self.client.post(f'/api/shows/{self.show.slug}/track_share/')
+
+        self.assertEqual(self.client.get('/api/news/').data['results'][0]['view_count'], 1)
+        self.assertEqual(self.client.get('/api/shows/').data['results'][0]['share_count'], 2)
+        results = self.client.get('/api/shows/', {'search': 'show'}).data['results']
+        self.assertEqual(results[0]['share_count'], 2)
+
+    def test_flush_applies_deltas_once(self):
+        """Flushing moves deltas into the columns in grouped updates, exactly once"""
+        other = News.objects.create(title='Other', content='x', author=self.author, is_published=True)
+        for article in (self.article, self.article, other, other):
+            self.client.post(f'/api/news/{article.pk}/increment_view/')
+        self.client.post(f'/api/shows/{self.show.slug}/track_share/')
+
+        result = flush_counters(batch_size=2)
+
+        self.assertEqual(result, {'deltas': 5, 'objects': 3, 'updates': 3})
+        self.assertFalse(CounterDelta.objects.exists())
+        self.assertEqual(
+            dict(News.objects.values_list('title', 'view_count')), {'Article': 2, 'Other': 2}
+        )
+        self.show.refresh_from_db()
+        self.assertEqual(self.show.share_count, 1)
+
+        self.assertEqual(flush_counters()['deltas'], 0)
+        self.assertEqual(self.client.get(f'/api/news/{self.article.pk}/').data['view_count'], 2)
+
+
+class UniqueViewerTests(TestCase):
+    """Test HyperLogLog unique-viewer counting for news"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create_user(username='author', password='pass12345', role='creator')
+        self.article = News.objects.create(title='Article', content='x', author=self.author, is_published=True)
+
+    def test_sketch_estimate_and_merge(self):
+        """Estimates stay within a few percent; merging doesn't double count"""
+        first, second = HyperLogLog(), HyperLogLog()
+        for i in range(20000):
+            first.add(f'viewer-{i}')
+        for i in range(10000, 30000):
+            second.add(f'viewer-{i}')
+        self.assertEqual(len(bytes(first)), 4096)
+        self.assertAlmostEqual(first.count(), 20000, delta=20000 * 0.05)
+        self.assertAlmostEqual(first.merge(bytes(second)).count(), 30000, delta=30000 * 0.05)
+
+    def test_repeat_viewers_across_days(self):
+        """Daily sketches merge into a trailing-window count"""
+        today = timezone.localdate()
+        for offset in range(3):
+            for i in range(50):
+                record_view(self.article.pk, f'user:{i}', day=today - timedelta(days=offset))
+        self.assertFalse(record_view(self.article.pk, 'user:0', day=today))
+        self.assertEqual(unique_viewers([self.article.pk], today=today), {self.article.pk: 50})
+
+    def test_increment_view_and_stats_endpoint(self):
+        """Views are recorded per viewer, bots are skipped, stats are exposed"""
+        self.client.force_authenticate(self.author)
+        self.client.post(f'/api/news/{self.article.pk}/increment_view/')
+        self.client.post(f'/api/news/{self.article.pk}/increment_view/')
+        self.client.post(f'/api/news/{self.article.pk}/increment_view/', HTTP_USER_AGENT='Googlebot/2.1')
+
+        stats = self.client.get(f'/api/news/{self.article.pk}/viewer_stats/?days=7').data
+        self.assertEqual((stats['today'], stats['week'], stats['month']), (1, 1, 1))
+        self.assertEqual(len(stats['daily']), 7)
+        self.assertEqual(self.client.get(f'/api/news/{self.article.pk}/').data['unique_viewers'], 1)
+        listing = self.client.get('/api/news/').data
+        results = listing['results'] if isinstance(listing, dict) else listing
+        self.assertEqual(results[0]['unique_viewers'], 1)
+
+
+class RetentionTests(TestCase):
+    """Test chunked retention with archives"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', password='pass12345')
+        self.actor = User.objects.create_user(username='actor', password='pass12345')
+        for is_read in (True, True, True, False):
+            Notification.objects.create(
+                recipient=self.user, actor=self.actor, notification_type='follow', is_read=is_read
+            )
+        Notification.objects.update(created_at=timezone.now() - timedelta(days=40))
+        self.fresh = Notification.objects.create(
+            recipient=self.user, actor=self.actor, notification_type='follow', is_read=True
+        )
+
+    def test_chunks_only_expired_rows(self):
+        """Old read notifications go in bounded chunks; unread and fresh rows stay"""
+        result = apply_policy('notifications.read', chunk_size=2, pause=0)
+        self.assertEqual((result['deleted'], result['chunks']), (3, 2))
+        self.assertEqual(Notification.objects.filter(is_read=True).get(), self.fresh)
+        self.assertEqual(Notification.objects.filter(is_read=False).count(), 1)
+
+    def test_archive_and_resume(self):
+        """Chunks are archived before deletion; a later run picks up the rest"""
+        with tempfile.TemporaryDirectory() as archive_dir:
+            first = apply_policy('notifications.read', chunk_size=2, pause=0, archive_dir=archive_dir, max_chunks=1)
+            rest = apply_policy('notifications.read', chunk_size=2, pause=0, archive_dir=archive_dir)
+            self.assertEqual((first['deleted'], rest['deleted']), (2, 1))
+
+            rows = []
+            for path in first['archives'] + rest['archives']:
+                with gzip.open(path, 'rt') as archive:
+                    rows.extend(json.loads(line) for line in archive)
+        self.assertEqual(len(rows), 3)
+        self.assertTrue(all(row['is_read'] and row['recipient_id'] == self.user.pk for row in rows))
+
+    def test_delete_rows_skips_signals(self):
+        """delete_rows removes exactly the given rows and leaves counters to the caller"""
+        unread = Notification.objects.get(is_read=False)
+        read = Notification.objects.filter(is_read=True).values_list('pk', flat=True)[:2]
+
+        self.assertEqual(delete_rows(Notification, [unread.pk, *read, 0]), 3)
+        self.assertEqual(Notification.objects.count(), 2)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.unread_notification_count, 1)  # no post_delete
+        self.assertEqual(delete_rows(Notification, []), 0)
+
+    def test_unread_chunk_is_one_delete(self):
+        """An unread chunk costs a fixed number of queries however many rows it holds"""
+        Notification.objects.bulk_create([
+            Notification(recipient=self.user, actor=self.actor, notification_type='like', is_read=False)
+            for _ in range(49)
+        ])
+        User.objects.filter(pk=self.user.pk).update(unread_notification_count=50)
+        Notification.objects.update(created_at=timezone.now() - timedelta(days=200))
 
-# Create your tests here.
+        with self.assertNumQueries(6):  # savepoint, pks, recipients, UPDATE, DELETE, release
+            result = apply_policy('notifications.unread', chunk_size=100, pause=0, max_chunks=1)
+        self.assertEqual(result['deleted'], 50)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.unread_notification_count, 0)
+        self.assertFalse(Notification.objects.filter(is_read=False).exists())
@@ -2,6 +2,8 @@
 ASGI config for deorganized project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Production serves it with gunicorn + uvicorn workers (see Procfile) so the
+async notification stream (users/stream.py) can hold many idle connections.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -87,9 +87,12 @@ DATABASES = {
 # Override with PostgreSQL if DATABASE_URL is set (for production)
 if os.environ.get('DATABASE_URL'):
     import dj_database_url
+    # No persistent connections: the app is served over ASGI (uvicorn
+    # workers), where each sync request runs in a new thread and would leave
+    # its connection open
     DATABASES['default'] = dj_database_url.config(
         default=os.environ.get('DATABASE_URL'),
-        conn_max_age=600,
+        conn_max_age=0,
         ssl_require=True
     )
 
@@ -174,6 +177,50 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Show scheduling
+# Days of recurring show airings materialized in the ShowOccurrence table
+SHOW_OCCURRENCE_HORIZON_DAYS = int(os.environ.get('SHOW_OCCURRENCE_HORIZON_DAYS', 60))
+# TV guide (/api/shows/schedule/): seconds each hour bucket stays cached, max window length
+SHOW_SCHEDULE_CACHE_TIMEOUT = int(os.environ.get('SHOW_SCHEDULE_CACHE_TIMEOUT', 600))
+SHOW_SCHEDULE_MAX_DAYS = int(os.environ.get('SHOW_SCHEDULE_MAX_DAYS', 14))
+# Seconds /api/shows/tag_facets/ results stay cached
+SHOW_TAG_FACETS_CACHE_TIMEOUT = int(os.environ.get('SHOW_TAG_FACETS_CACHE_TIMEOUT', 300))
+# Episodes embedded in show detail responses; the rest are paged via /api/episodes/?show=
+SHOW_EMBEDDED_EPISODES = int(os.environ.get('SHOW_EMBEDDED_EPISODES', 5))
+# Trending (shows/trending.py): engagement loses half its weight every N hours
+SHOW_HOT_HALF_LIFE_HOURS = float(os.environ.get('SHOW_HOT_HALF_LIFE_HOURS', 24))
+
+# Trailing window (days) for the unique_viewers field on news articles
+NEWS_UNIQUE_VIEWERS_DAYS = int(os.environ.get('NEWS_UNIQUE_VIEWERS_DAYS', 7))
+
+# Notifications (users/notifications.py): 'auto' uses Celery when
+# CELERY_BROKER_URL is set and a background thread otherwise; 'sync' delivers inline
+NOTIFICATION_BACKEND = os.environ.get('NOTIFICATION_BACKEND', 'auto')
+# Likes/comments/follows on the same target within N minutes share one notification
+NOTIFICATION_COALESCE_MINUTES = int(os.environ.get('NOTIFICATION_COALESCE_MINUTES', 60))
+
+# Retention (api/retention.py): age in days after which rows are deleted;
+# set RETENTION_ARCHIVE_DIR to write them to gzipped JSONL files first
+RETENTION_READ_NOTIFICATION_DAYS = int(os.environ.get('RETENTION_READ_NOTIFICATION_DAYS', 30))
+RETENTION_UNREAD_NOTIFICATION_DAYS = int(os.environ.get('RETENTION_UNREAD_NOTIFICATION_DAYS', 180))
+RETENTION_REMINDER_DAYS = int(os.environ.get('RETENTION_REMINDER_DAYS', 60))
+RETENTION_ARCHIVE_DIR = os.environ.get('RETENTION_ARCHIVE_DIR', '')
+
+# Real-time push (api/pubsub.py, users/stream.py). Unset, this is
+# api.pubsub.DatabaseBroker when CELERY_BROKER_URL is set and LocalBroker
+# (publishing process only) otherwise; use DatabaseBroker with several workers
+PUBSUB_BACKEND = os.environ.get('PUBSUB_BACKEND', '')
+PUBSUB_POLL_INTERVAL = float(os.environ.get('PUBSUB_POLL_INTERVAL', 1.0))
+# DatabaseBroker pollers rescan this many seconds for rows committed out of order
+PUBSUB_LOOKBACK_SECONDS = float(os.environ.get('PUBSUB_LOOKBACK_SECONDS', 5))
+SSE_KEEPALIVE_SECONDS = int(os.environ.get('SSE_KEEPALIVE_SECONDS', 20))
+
+# Full-text search (api/search)
+# Backend is picked by database vendor (SQLite FTS5 / PostgreSQL tsvector);
+# set SEARCH_BACKEND to a dotted class path to override
+SEARCH_MAX_RESULTS = int(os.environ.get('SEARCH_MAX_RESULTS', 500))
+SEARCH_CONFIG = os.environ.get('SEARCH_CONFIG', 'english')
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
@@ -18,6 +18,7 @@ from django.contrib import admin
 from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
+from users.stream import notification_stream
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -27,6 +28,9 @@ from rest_framework_simplejwt.views import (
 urlpatterns = [
     path('admin/', admin.site.urls),
     
+    # Notification push (SSE); before the router so it isn't taken for a notification ID
+    path('api/notifications/stream/', notification_stream, name='notification-stream'),
+    
     # API Routes
     path('api/', include('api.routers')),
     
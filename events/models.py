@@ -44,6 +44,10 @@ class Event(models.Model):
     # Privacy
     is_public = models.BooleanField(default=True)
     
+    # Engagement counters, maintained by users.signals; `manage.py update_counts` fixes drift
+    like_count = models.PositiveIntegerField(default=0, editable=False)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -61,14 +65,6 @@ class Event(models.Model):
     def __str__(self):
         return f"{self.title} - {self.start_datetime.strftime('%Y-%m-%d')}"
     
-    @property
-    def like_count(self):
-        return self.likes.count()
-    
-    @property
-    def comment_count(self):
-        return self.comments.count()
-    
     @property
     def is_upcoming(self):
         """Check if event is in the future"""
@@ -1,4 +1,7 @@
 from rest_framework import serializers
+from api.serializers import BatchedListSerializer
+from api.sparse import SparseFieldsSerializerMixin
+from users.viewer_state import ViewerStateMixin
 from .models import Event
 from django.contrib.auth import get_user_model
 
@@ -16,8 +19,6 @@ class EventOrganizerSerializer(serializers.ModelSerializer):
 class EventSerializer(serializers.ModelSerializer):
     """Full event serializer"""
     organizer = EventOrganizerSerializer(read_only=True)
-    like_count = serializers.SerializerMethodField()
-    comment_count = serializers.SerializerMethodField()
     status = serializers.CharField(source='status', read_only=True)
     is_upcoming = serializers.BooleanField(source='is_upcoming', read_only=True)
     is_ongoing = serializers.BooleanField(source='is_ongoing', read_only=True)
@@ -36,16 +37,6 @@ class EventSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['organizer', 'created_at', 'updated_at']
     
-    def get_like_count(self, obj):
-        """Get like count from annotation or property"""
-        # Use the renamed annotation to avoid conflict with model property
-        return getattr(obj, '_like_count', obj.like_count)
-    
-    def get_comment_count(self, obj):
-        """Get comment count from annotation or property"""
-        # Use the renamed annotation to avoid conflict with model property
-        return getattr(obj, '_comment_count', obj.comment_count)
-    
     def validate(self, data):
         """Validate event dates"""
         start_datetime = data.get('start_datetime')
@@ -66,16 +57,12 @@ class EventSerializer(serializers.ModelSerializer):
         return data
 
 
-class EventListSerializer(serializers.ModelSerializer):
-    """Lightweight serializer for list views"""
+class EventListSerializer(SparseFieldsSerializerMixin, ViewerStateMixin, serializers.ModelSerializer):
+    """Lightweight serializer for list views (supports ?fields= / ?expand=)"""
     organizer = EventOrganizerSerializer(read_only=True)
-    like_count = serializers.SerializerMethodField()
     status = serializers.CharField(read_only=True)
-    
-    def get_like_count(self, obj):
-        """Get like count from annotation or property"""
-        # Use the renamed annotation to avoid conflict with model property
-        return getattr(obj, '_like_count', obj.like_count)
+    is_liked_by_me = serializers.SerializerMethodField()
+    is_following_creator = serializers.SerializerMethodField()
     
     class Meta:
         model = Event
@@ -83,9 +70,18 @@ class EventListSerializer(serializers.ModelSerializer):
             'id', 'title', 'banner_image', 'organizer',
             'start_datetime', 'end_datetime', 'venue_name',
             'is_virtual', 'is_public', 'status',
-            'like_count'
+            'like_count', 'is_liked_by_me', 'is_following_creator'
         ]
         read_only_fields = fields
+        expandable_fields = ['organizer']
+        field_dependencies = {
+            'status': ['start_datetime', 'end_datetime'],
+            'is_liked_by_me': [],
+            'is_following_creator': ['organizer'],
+        }
+        list_serializer_class = BatchedListSerializer
+        viewer_like = True
+        viewer_follow = ('is_following_creator', 'organizer_id')
 
 
 class EventCreateUpdateSerializer(serializers.ModelSerializer):
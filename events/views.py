@@ -2,16 +2,17 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
-from django.db.models import Count, Q
 from django.utils import timezone
 from .models import Event
 from .serializers import (
     EventSerializer, EventListSerializer, EventCreateUpdateSerializer
 )
 from api.permissions import IsOwnerOrReadOnly
+from api.search.filters import FullTextSearchFilter
+from api.sparse import SparseFieldsViewMixin
 
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for Event model.
     
@@ -25,13 +26,12 @@ class EventViewSet(viewsets.ModelViewSet):
     - upcoming: GET /api/events/upcoming/
     - past: GET /api/events/past/
     - my_events: GET /api/events/my_events/
+    
+    List responses support sparse fieldsets: ?fields=id,title&expand=...
     """
-    queryset = Event.objects.select_related('organizer').annotate(
-        _like_count=Count('likes', distinct=True),
-        _comment_count=Count('comments', distinct=True)
-    )
+    queryset = Event.objects.select_related('organizer')
     permission_classes = [IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [filters.OrderingFilter, FullTextSearchFilter]
     search_fields = ['title', 'description', 'venue_name']
     ordering_fields = ['start_datetime', 'created_at', 'like_count']
     ordering = ['start_datetime']
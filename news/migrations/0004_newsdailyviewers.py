@@ -0,0 +1,28 @@
+# Generated by Django 5.2.10 on 2026-10-16 20:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_news_comment_count_news_like_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsDailyViewers',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('registers', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_viewers', to='news.news')),
+            ],
+            options={
+                'ordering': ['-day'],
+                'unique_together': {('news', 'day')},
+            },
+        ),
+    ]
@@ -1,8 +1,12 @@
+from functools import partial
+
 from django.db import models
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
 from django.utils.text import slugify
 
+from api.allocator import save_unique
+
 
 class News(models.Model):
     """
@@ -54,6 +58,9 @@ class News(models.Model):
     
     # Engagement metrics
     view_count = models.PositiveIntegerField(default=0)
+    # Maintained by users.signals; `manage.py update_counts` fixes drift
+    like_count = models.PositiveIntegerField(default=0, editable=False)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -76,17 +83,28 @@ class News(models.Model):
     
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = slugify(self.title)
+            return save_unique(self, 'slug', slugify(self.title) or 'news', partial(super().save, *args, **kwargs))
         super().save(*args, **kwargs)
     
-    @property
-    def like_count(self):
-        return self.likes.count()
-    
-    @property
-    def comment_count(self):
-        return self.comments.count()
-    
     def get_tags_list(self):
         """Return tags as a list"""
         return [tag.strip() for tag in self.tags.split(',') if tag.strip()]
+
+
+class NewsDailyViewers(models.Model):
+    """
+    HyperLogLog sketch of the distinct viewers of an article on one day.
+    Fixed size (4 KB) regardless of traffic; days merge into weekly and
+    monthly uniques. See news/uniques.py.
+    """
+    news = models.ForeignKey(News, on_delete=models.CASCADE, related_name='daily_viewers')
+    day = models.DateField()
+    registers = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['news', 'day']
+        ordering = ['-day']
+    
+    def __str__(self):
+        return f"{self.news.title} - viewers {self.day.isoformat()}"
@@ -1,5 +1,9 @@
 from rest_framework import serializers
+from api.serializers import BatchLoadMixin, BatchedListSerializer, PendingCountersMixin
+from api.sparse import SparseFieldsSerializerMixin
 from .models import News
+from .uniques import unique_viewers
+from users.viewer_state import ViewerStateMixin
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
@@ -14,33 +18,42 @@ class NewsAuthorSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
-class NewsSerializer(serializers.ModelSerializer):
+class UniqueViewersMixin(BatchLoadMixin):
+    """
+    `unique_viewers`: distinct viewers over the last NEWS_UNIQUE_VIEWERS_DAYS
+    days. List pages load every article's sketches in one query.
+    """
+    
+    def load_batch(self, instances):
+        super().load_batch(instances)
+        if 'unique_viewers' in self.fields:
+            self._unique_viewers = unique_viewers([instance.pk for instance in instances])
+    
+    def get_unique_viewers(self, obj):
+        batch = getattr(self, '_unique_viewers', None)
+        if batch is None:
+            batch = unique_viewers([obj.pk])
+        return batch.get(obj.pk, 0)
+
+
+class NewsSerializer(UniqueViewersMixin, PendingCountersMixin, serializers.ModelSerializer):
     """Full news article serializer"""
     author = NewsAuthorSerializer(read_only=True)
-    like_count = serializers.SerializerMethodField()
-    comment_count = serializers.SerializerMethodField()
     tags_list = serializers.ListField(source='get_tags_list', read_only=True)
+    unique_viewers = serializers.SerializerMethodField()
     
     class Meta:
         model = News
         fields = [
             'id', 'title', 'slug', 'content', 'excerpt', 'featured_image',
             'author', 'category', 'tags', 'tags_list',
-            'is_published', 'published_at', 'view_count',
+            'is_published', 'published_at', 'view_count', 'unique_viewers',
             'created_at', 'updated_at',
             'like_count', 'comment_count'
         ]
         read_only_fields = ['slug', 'author', 'created_at', 'updated_at', 'view_count']
-    
-    def get_like_count(self, obj):
-        """Get like count from annotation or property"""
-        # Use the renamed annotation to avoid conflict with model property
-        return getattr(obj, '_like_count', obj.like_count)
-    
-    def get_comment_count(self, obj):
-        """Get comment count from annotation or property"""
-        # Use the renamed annotation to avoid conflict with model property
-        return getattr(obj, '_comment_count', obj.comment_count)
+        list_serializer_class = BatchedListSerializer
+        pending_counters = ['view_count']
     
     def create(self, validated_data):
         """Auto-set published_at if is_published is True"""
@@ -56,30 +69,32 @@ class NewsSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
-class NewsListSerializer(serializers.ModelSerializer):
-    """Lightweight serializer for list views"""
+class NewsListSerializer(SparseFieldsSerializerMixin, UniqueViewersMixin, PendingCountersMixin, ViewerStateMixin, serializers.ModelSerializer):
+    """Lightweight serializer for list views (supports ?fields= / ?expand=)"""
     author = NewsAuthorSerializer(read_only=True)
-    like_count = serializers.SerializerMethodField()
-    comment_count = serializers.SerializerMethodField()
-    
-    def get_like_count(self, obj):
-        """Get like count from annotation or property"""
-        # Use the renamed annotation to avoid conflict with model property
-        return getattr(obj, '_like_count', obj.like_count)
-    
-    def get_comment_count(self, obj):
-        """Get comment count from annotation or property"""
-        # Use the renamed annotation to avoid conflict with model property
-        return getattr(obj, '_comment_count', obj.comment_count)
+    unique_viewers = serializers.SerializerMethodField()
+    is_liked_by_me = serializers.SerializerMethodField()
+    is_following_creator = serializers.SerializerMethodField()
     
     class Meta:
         model = News
         fields = [
             'id', 'title', 'slug', 'excerpt', 'featured_image',
             'author', 'category', 'is_published', 'published_at',
-            'view_count', 'like_count', 'comment_count'
+            'view_count', 'unique_viewers', 'like_count', 'comment_count',
+            'is_liked_by_me', 'is_following_creator'
         ]
         read_only_fields = fields
+        expandable_fields = ['author']
+        field_dependencies = {
+            'unique_viewers': [],
+            'is_liked_by_me': [],
+            'is_following_creator': ['author'],
+        }
+        list_serializer_class = BatchedListSerializer
+        pending_counters = ['view_count']
+        viewer_like = True
+        viewer_follow = ('is_following_creator', 'author_id')
 
 
 class NewsCreateUpdateSerializer(serializers.ModelSerializer):
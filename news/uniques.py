@@ -0,0 +1,126 @@
+"""
+Unique viewers per article, counted with one HyperLogLog sketch per day.
+
+increment_view feeds record_view(). Once a day's sketch has warmed up, most
+views don't raise any register, so the common case is a single read of the
+4 KB sketch with no write. Only views that change a register lock the row
+and store it.
+
+Weekly and monthly uniques merge the daily sketches (register-wise max), so
+a viewer who comes back every day still counts once.
+"""
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from api.hyperloglog import HyperLogLog
+from .models import NewsDailyViewers
+
+
+# Trailing window of the `unique_viewers` serializer field
+UNIQUE_VIEWERS_DAYS = getattr(settings, 'NEWS_UNIQUE_VIEWERS_DAYS', 7)
+MAX_STATS_DAYS = 90
+BOT_USER_AGENT = re.compile(r'bot|crawl|spider|slurp|preview|headless', re.IGNORECASE)
+
+
+def viewer_key(request):
+    """
+    Identify the viewer of a request: the user ID when logged in, otherwise
+    client address and user agent. Returns None for obvious bots.
+    """
+    user_agent = request.META.get('HTTP_USER_AGENT', '')
+    if BOT_USER_AGENT.search(user_agent):
+        return None
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+    address = forwarded.split(',')[0].strip() or request.META.get('REMOTE_ADDR', '')
+    return f'anon:{address}:{user_agent}'
+
+
+def record_view(news_id, viewer, day=None):
+    """
+    Add a viewer to the article's sketch for `day` (default: today).
+
+    Returns:
+        bool: True if the sketch changed
+    """
+    day = day or timezone.localdate()
+    index, rank = HyperLogLog().position(viewer)
+
+    registers = NewsDailyViewers.objects.filter(news_id=news_id, day=day).values_list('registers', flat=True).first()
+    if registers is not None and registers[index] >= rank:
+        return False
+
+    with transaction.atomic():
+        sketch, _ = NewsDailyViewers.objects.select_for_update().get_or_create(
+            news_id=news_id, day=day, defaults={'registers': bytes(HyperLogLog())}
+        )
+        hll = HyperLogLog(sketch.registers)
+        if not hll.add(viewer):
+            return False
+        sketch.registers = bytes(hll)
+        sketch.save(update_fields=['registers', 'updated_at'])
+    return True
+
+
+def merged_sketches(news_ids, start, end):
+    """Return {news_id: HyperLogLog} merging the days in [start, end] (one query)"""
+    sketches = {}
+    rows = NewsDailyViewers.objects.filter(
+        news_id__in=list(news_ids), day__gte=start, day__lte=end
+    ).values_list('news_id', 'registers')
+    for news_id, registers in rows.iterator():
+        if news_id in sketches:
+            sketches[news_id].merge(bytes(registers))
+        else:
+            sketches[news_id] = HyperLogLog(registers)
+    return sketches
+
+
+def unique_viewers(news_ids, days=UNIQUE_VIEWERS_DAYS, today=None):
+    """Estimated distinct viewers over the trailing `days` days, per article"""
+    today = today or timezone.localdate()
+    sketches = merged_sketches(news_ids, today - timedelta(days=days - 1), today)
+    return {news_id: sketch.count() for news_id, sketch in sketches.items()}
+
+
+def viewer_stats(news_id, days=30, today=None):
+    """
+    Daily, weekly and monthly uniques for one article from a single query.
+
+    Returns:
+        dict: {'today', 'week', 'month', 'daily': [{'date', 'unique_viewers'}]}
+    """
+    today = today or timezone.localdate()
+    days = max(1, min(days, MAX_STATS_DAYS))
+    window_start = today - timedelta(days=max(days, 30) - 1)
+    daily = dict(
+        (day, HyperLogLog(registers)) for day, registers in NewsDailyViewers.objects.filter(
+            news_id=news_id, day__gte=window_start, day__lte=today
+        ).values_list('day', 'registers')
+    )
+
+    def merged(span):
+        total = HyperLogLog()
+        for day, sketch in daily.items():
+            if day > today - timedelta(days=span):
+                total.merge(sketch)
+        return total.count()
+
+    return {
+        'today': daily[today].count() if today in daily else 0,
+        'week': merged(7),
+        'month': merged(30),
+        'daily': [
+            {
+                'date': (today - timedelta(days=offset)).isoformat(),
+                'unique_viewers': daily[today - timedelta(days=offset)].count()
+                if today - timedelta(days=offset) in daily else 0,
+            }
+            for offset in range(days)
+        ],
+    }
@@ -2,15 +2,18 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
-from django.db.models import Count, F
 from .models import News
+from .uniques import record_view, viewer_key, viewer_stats
 from .serializers import (
     NewsSerializer, NewsListSerializer, NewsCreateUpdateSerializer
 )
+from api.counters import increment, with_pending
 from api.permissions import IsOwnerOrReadOnly
+from api.search.filters import FullTextSearchFilter
+from api.sparse import SparseFieldsViewMixin
 
 
-class NewsViewSet(viewsets.ModelViewSet):
+class NewsViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for News model.
     
@@ -23,13 +26,13 @@ class NewsViewSet(viewsets.ModelViewSet):
     Custom actions:
     - increment_view: POST /api/news/{id}/increment_view/
     - my_articles: GET /api/news/my_articles/
+    - viewer_stats: GET /api/news/{id}/viewer_stats/?days=30
+    
+    List responses support sparse fieldsets: ?fields=id,title&expand=...
     """
-    queryset = News.objects.select_related('author').annotate(
-        _like_count=Count('likes', distinct=True),
-        _comment_count=Count('comments', distinct=True)
-    )
+    queryset = News.objects.select_related('author')
     permission_classes = [IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [filters.OrderingFilter, FullTextSearchFilter]
     search_fields = ['title', 'content', 'tags']
     ordering_fields = ['published_at', 'created_at', 'view_count', 'like_count']
     ordering = ['-published_at']
@@ -69,19 +72,42 @@ class NewsViewSet(viewsets.ModelViewSet):
         
         return queryset
     
+    def retrieve(self, request, *args, **kwargs):
+        """Article detail, including views not yet flushed to view_count"""
+        article = self.get_object()
+        with_pending([article], 'view_count')
+        return Response(self.get_serializer(article).data)
+    
     def perform_create(self, serializer):
         """Set the author to the current user"""
         serializer.save(author=self.request.user)
     
     @action(detail=True, methods=['post'])
     def increment_view(self, request, pk=None):
-        """Increment view count for an article"""
+        """Increment view count for an article (buffered, see api/counters.py)"""
         article = self.get_object()
-        article.view_count = F('view_count') + 1
-        article.save(update_fields=['view_count'])
-        article.refresh_from_db()
+        increment(article, 'view_count')
+        viewer = viewer_key(request)
+        if viewer is not None:
+            record_view(article.pk, viewer)
+        with_pending([article], 'view_count')
         return Response({'view_count': article.view_count})
     
+    @action(detail=True, methods=['get'])
+    def viewer_stats(self, request, pk=None):
+        """
+        Unique viewers of an article: today, last 7 and 30 days, and per day.
+        
+        Query params:
+        - days: number of daily entries (default 30, max 90)
+        """
+        article = self.get_object()
+        try:
+            days = int(request.query_params.get('days', 30))
+        except ValueError:
+            return Response({'error': 'days must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(viewer_stats(article.pk, days=days))
+    
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def my_articles(self, request):
         """Get current user's articles"""
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Show, ShowEpisode, Tag, ShowReminder
+from .models import Show, ShowEpisode, Tag, ShowReminder, ShowCancellation
 
 
 @admin.register(Tag)
@@ -10,6 +10,13 @@ class TagAdmin(admin.ModelAdmin):
     prepopulated_fields = {'slug': ('name',)}
 
 
+class ShowCancellationInline(admin.TabularInline):
+    """Inline for cancelled instances of a recurring show"""
+    model = ShowCancellation
+    extra = 0
+    readonly_fields = ['created_at']
+
+
 @admin.register(Show)
 class ShowAdmin(admin.ModelAdmin):
     """Admin for Show model"""
@@ -18,6 +25,7 @@ class ShowAdmin(admin.ModelAdmin):
     search_fields = ['title', 'description', 'creator__username']
     date_hierarchy = 'created_at'
     filter_horizontal = ['tags']
+    inlines = [ShowCancellationInline]
     
     fieldsets = (
         ('Basic Information', {
@@ -27,7 +35,7 @@ class ShowAdmin(admin.ModelAdmin):
             'fields': ('external_link', 'link_platform')
         }),
         ('Schedule', {
-            'fields': ('is_recurring', 'recurrence_type', 'day_of_week', 'scheduled_time', 'cancelled_instances')
+            'fields': ('is_recurring', 'recurrence_type', 'day_of_week', 'scheduled_time')
         }),
     )
 
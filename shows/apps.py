@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ShowsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'shows'
+    
+    def ready(self):
+        """Import signals when app is ready"""
+        import shows.signals  # noqa
@@ -0,0 +1,234 @@
+"""
+Bulk import/export of show catalogs (manage.py import_shows / export_shows).
+
+Files are streamed record by record and processed in chunks, so memory
+stays constant regardless of file size (only the first MAX_REPORTED_ERRORS
+errors are kept; pass `on_error` to see every one as it happens). Each import chunk runs in one
+transaction:
+
+- creators are resolved with one query, tag names through the tag registry
+  (missing tags are bulk-created) and slugs are allocated with one query
+- shows, tag links and episodes are inserted with bulk_create
+- occurrences and the search index are updated for the chunk in bulk,
+  since bulk_create bypasses the model signals
+
+Record format (one JSON object per line, or one CSV row):
+    slug, title, description, creator (username), tags (list of names),
+    external_link, link_platform, is_recurring, recurrence_type,
+    day_of_week, scheduled_time, status, episodes (list of objects)
+
+In CSV files `tags` is pipe-separated and `episodes` is a JSON array.
+"""
+import csv
+import json
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils.text import slugify
+
+from api.allocator import allocate_unique_many
+from api.search import get_backend, get_document
+from .models import Show, ShowEpisode
+from .occurrences import regenerate_occurrences
+from .serializers import ShowCatalogSerializer
+from .tags import invalidate_tag_facets, tag_registry
+
+
+FORMATS = ('jsonl', 'csv')
+CSV_FIELDS = ShowCatalogSerializer.Meta.fields
+LIST_SEPARATOR = '|'
+# CSV has no null; empty cells in these columns mean "not set"
+NULLABLE_CSV_FIELDS = ('external_link', 'recurrence_type', 'day_of_week', 'scheduled_time')
+MAX_REPORTED_ERRORS = 100
+
+
+def detect_format(path):
+    """Guess the file format from its extension (defaults to JSONL)"""
+    return 'csv' if str(path).lower().endswith('.csv') else 'jsonl'
+
+
+def chunked(iterable, size):
+    """Yield lists of up to `size` items without materializing the input"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def read_records(stream, fmt):
+    """
+    Parse records lazily from a text stream.
+
+    Yields:
+        (line number, record dict) - the record is None if the line is not
+        valid JSON, so the caller can report it
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            record = dict(row)
+            for field in NULLABLE_CSV_FIELDS:
+                if record.get(field) == '':
+                    record[field] = None
+            tags = record.get('tags') or ''
+            record['tags'] = [name for name in tags.split(LIST_SEPARATOR) if name.strip()]
+            try:
+                record['episodes'] = json.loads(record.get('episodes') or '[]')
+            except ValueError:
+                record = None
+            yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, None
+
+
+def write_records(stream, records, fmt):
+    """Write records to a text stream one at a time"""
+    if fmt == 'csv':
+        writer = csv.DictWriter(stream, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for record in records:
+            row = dict(record)
+            row['tags'] = LIST_SEPARATOR.join(record.get('tags', []))
+            row['episodes'] = json.dumps(record.get('episodes', []))
+            writer.writerow(row)
+        return
+
+    for record in records:
+        stream.write(json.dumps(record) + '\n')
+
+
+def export_catalog(queryset, chunk_size=500):
+    """
+    Yield catalog records for a Show queryset, walking it by primary key.
+
+    Each chunk costs three queries (shows with creators, tags, episodes).
+    """
+    queryset = queryset.select_related('creator').prefetch_related('tags', 'episodes').order_by('pk')
+    last_pk = 0
+    while True:
+        chunk = list(queryset.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return
+        yield from ShowCatalogSerializer(chunk, many=True).data
+        last_pk = chunk[-1].pk
+
+
+def import_catalog(records, chunk_size=500, default_creator=None, dry_run=False, on_chunk=None,
+                   on_error=None, max_errors=MAX_REPORTED_ERRORS):
+    """
+    Validate and bulk-insert catalog records.
+
+    Args:
+        records: Iterable of (line number, record) as yielded by read_records
+        chunk_size: Records per transaction
+        default_creator: Username used for records without a creator
+        dry_run: Validate only, write nothing
+        on_chunk: Optional callback receiving the running stats after each chunk
+        on_error: Optional callback receiving (line, message) for every error
+        max_errors: How many errors to keep in the returned stats
+
+    Returns:
+        dict: rows read, shows/episodes/tags created, error_count and the
+        first `max_errors` errors [(line, message)]
+    """
+    stats = {'rows': 0, 'shows': 0, 'episodes': 0, 'tags_created': 0, 'error_count': 0, 'errors': []}
+
+    def error(line, message):
+        stats['error_count'] += 1
+        if len(stats['errors']) < max_errors:
+            stats['errors'].append((line, message))
+        if on_error:
+            on_error(line, message)
+
+    for chunk in chunked(records, chunk_size):
+        valid = []
+        for line, record in chunk:
+            if record is None:
+                error(line, 'Invalid record')
+                continue
+            if default_creator and not record.get('creator'):
+                record['creator'] = default_creator
+            serializer = ShowCatalogSerializer(data=record)
+            if serializer.is_valid():
+                valid.append((line, serializer.validated_data))
+            else:
+                error(line, serializer.errors)
+
+        stats['rows'] += len(chunk)
+        if valid and not dry_run:
+            _import_chunk(valid, stats, error)
+        if on_chunk:
+            on_chunk(stats)
+
+    if stats['shows']:
+        invalidate_tag_facets()
+    return stats
+
+
+def _resolve_creators(rows, error):
+    """Map usernames to user IDs in one query, dropping rows with unknown creators"""
+    usernames = {data['creator']['username'] for _, data in rows}
+    creator_ids = dict(
+        get_user_model().objects.filter(username__in=usernames).values_list('username', 'pk')
+    )
+    resolved = []
+    for line, data in rows:
+        creator_id = creator_ids.get(data['creator']['username'])
+        if creator_id is None:
+            error(line, f"Unknown creator '{data['creator']['username']}'")
+        else:
+            resolved.append((creator_id, data))
+    return resolved
+
+
+def _import_chunk(rows, stats, error):
+    rows = _resolve_creators(rows, error)
+    if not rows:
+        return
+
+    with transaction.atomic():
+        tag_ids, created = tag_registry.resolve(name for _, data in rows for name in data.get('tags', []))
+        slugs = allocate_unique_many(
+            Show, 'slug', [slugify(data.get('slug') or data['title']) or 'show' for _, data in rows]
+        )
+
+        shows = []
+        for (creator_id, data), slug in zip(rows, slugs):
+            fields = {
+                key: value for key, value in data.items()
+                if key not in ('slug', 'creator', 'tags', 'episodes')
+            }
+            shows.append(Show(creator_id=creator_id, slug=slug, **fields))
+        Show.objects.bulk_create(shows)
+
+        links = []
+        episodes = []
+        for show, (_, data) in zip(shows, rows):
+            for tag_id in {tag_ids[name] for name in data.get('tags', [])}:
+                links.append(Show.tags.through(show_id=show.pk, tag_id=tag_id))
+            for episode in data.get('episodes', []):
+                episodes.append(ShowEpisode(show=show, **episode))
+        Show.tags.through.objects.bulk_create(links)
+        ShowEpisode.objects.bulk_create(episodes)
+
+        recurring = [show for show in shows if show.is_recurring]
+        if recurring:
+            regenerate_occurrences(recurring)
+
+        backend = get_backend()
+        if backend is not None:
+            backend.index(get_document(Show), shows)
+
+    stats['shows'] += len(shows)
+    stats['episodes'] += len(episodes)
+    stats['tags_created'] += created
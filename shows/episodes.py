@@ -0,0 +1,134 @@
+"""
+Bounded episode embedding and keyset pagination for a show's episodes.
+
+Show detail responses embed only the most recent episodes plus a cursor URL
+for the rest, served by `/api/episodes/?show=<id>&cursor=...`. Pages are
+keyset ranges on (air_date, episode_number) - unique within a show - so
+every page is a range scan on the (show, -air_date) index regardless of how
+deep the client has paged.
+"""
+import base64
+from datetime import date
+
+from django.conf import settings
+from django.db.models import Prefetch, Q
+from django.urls import reverse
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .models import ShowEpisode
+
+
+EMBEDDED_EPISODES = getattr(settings, 'SHOW_EMBEDDED_EPISODES', 5)
+EPISODE_ORDERING = ('-air_date', '-episode_number')
+
+
+def encode_cursor(episode):
+    """Opaque cursor pointing just past `episode`"""
+    raw = f'{episode.air_date.isoformat()}|{episode.episode_number}'
+    return base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii')
+
+
+def decode_cursor(value):
+    """
+    Decode a cursor into (air_date, episode_number).
+    Raises ValueError for anything malformed.
+    """
+    raw = base64.urlsafe_b64decode(value.encode('ascii')).decode('ascii')
+    air_date, episode_number = raw.split('|')
+    return date.fromisoformat(air_date), int(episode_number)
+
+
+def episodes_before(queryset, cursor):
+    """Episodes older than the cursor, in EPISODE_ORDERING"""
+    air_date, episode_number = decode_cursor(cursor)
+    return queryset.filter(
+        Q(air_date__lt=air_date) | Q(air_date=air_date, episode_number__lt=episode_number)
+    ).order_by(*EPISODE_ORDERING)
+
+
+def recent_episodes_prefetch(limit=EMBEDDED_EPISODES):
+    """
+    Prefetch the `limit` most recent episodes of each show into
+    `show.recent_episodes` (one extra row tells whether there are more).
+    """
+    return Prefetch(
+        'episodes',
+        queryset=ShowEpisode.objects.order_by(*EPISODE_ORDERING)[:limit + 1],
+        to_attr='recent_episodes'
+    )
+
+
+def recent_episodes(show, limit=EMBEDDED_EPISODES):
+    """
+    Return (the `limit` most recent episodes, cursor for the rest or None).
+    Uses the recent_episodes_prefetch() result when present.
+    """
+    episodes = getattr(show, 'recent_episodes', None)
+    if episodes is None:
+        episodes = list(show.episodes.order_by(*EPISODE_ORDERING)[:limit + 1])
+    if len(episodes) > limit:
+        return episodes[:limit], encode_cursor(episodes[limit - 1])
+    return episodes, None
+
+
+def episodes_url(request, show_id, cursor):
+    """URL of the episode page following `cursor`"""
+    url = f"{reverse('episode-list')}?show={show_id}&cursor={cursor}"
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+class EpisodeKeysetPagination(BasePagination):
+    """
+    Keyset pagination for a single show's episodes, newest first.
+
+    Response: {'next': url or null, 'results': [...]}
+    """
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            try:
+                queryset = episodes_before(queryset, cursor)
+            except ValueError:
+                raise NotFound('Invalid cursor')
+        else:
+            queryset = queryset.order_by(*EPISODE_ORDERING)
+
+        page = list(queryset[:page_size + 1])
+        self.next_cursor = encode_cursor(page[page_size - 1]) if len(page) > page_size else None
+        return page[:page_size]
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,114 @@
+"""
+TV guide assembly with hour-bucket caching.
+
+A guide window is split into fixed one-hour buckets and each bucket (per tag
+filter) is cached on its own. Overlapping windows from different clients
+share entries, and a request only queries the occurrence table for the hours
+that are missing. All buckets are invalidated together by bumping the
+SCHEDULE_NAMESPACE version whenever occurrences or listed show data change.
+"""
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+
+from api.cache import get_namespace_version, bump_namespace_version
+from .models import ShowOccurrence
+
+
+SCHEDULE_NAMESPACE = 'shows:schedule'
+BUCKET = timedelta(hours=1)
+MAX_WINDOW = timedelta(days=getattr(settings, 'SHOW_SCHEDULE_MAX_DAYS', 14))
+CACHE_TIMEOUT = getattr(settings, 'SHOW_SCHEDULE_CACHE_TIMEOUT', 600)
+
+# Show fields rendered in (or filtering) guide entries; saves limited to
+# other fields (share_count, occurrences_until...) keep the cache
+GUIDE_FIELDS = frozenset({
+    'title', 'slug', 'thumbnail', 'creator', 'creator_id',
+    'external_link', 'link_platform', 'status',
+})
+
+
+def invalidate_schedule():
+    """Drop every cached guide bucket"""
+    bump_namespace_version(SCHEDULE_NAMESPACE)
+
+
+def bucket_bounds(start, end):
+    """
+    Widen a window to whole UTC hours: floor the start, ceil the end.
+
+    Converting first keeps buckets aligned with the UTC hours airings are
+    grouped by, whatever offset (+05:30, +09:45...) the client sent.
+    """
+    start = start.astimezone(dt_timezone.utc)
+    end = end.astimezone(dt_timezone.utc)
+    first = start.replace(minute=0, second=0, microsecond=0)
+    last = end.replace(minute=0, second=0, microsecond=0)
+    if last < end:
+        last += BUCKET
+    return first, max(last, first + BUCKET)
+
+
+def get_schedule(start, end, tag_ids=(), serializer_context=None):
+    """
+    Return every airing of every published show in the window.
+
+    Args:
+        start, end: Aware datetimes; widened to whole hours
+        tag_ids: Only include shows carrying all of these tags
+        serializer_context: Context for ShowAiringSerializer (request)
+
+    Returns:
+        tuple: (window start, window end, list of serialized airings)
+    """
+    first, last = bucket_bounds(start, end)
+    hours = []
+    hour = first
+    while hour < last:
+        hours.append(hour)
+        hour += BUCKET
+
+    version = get_namespace_version(SCHEDULE_NAMESPACE)
+    tag_part = ','.join(str(tag_id) for tag_id in sorted(set(tag_ids))) or 'all'
+    keys = {
+        hour: f'{SCHEDULE_NAMESPACE}:{version}:{tag_part}:{int(hour.timestamp())}'
+        for hour in hours
+    }
+
+    cached = cache.get_many(list(keys.values()))
+    missing = [hour for hour in hours if keys[hour] not in cached]
+    if missing:
+        loaded = _load_buckets(missing[0], missing[-1] + BUCKET, tag_ids, serializer_context)
+        fresh = {keys[hour]: loaded.get(hour, []) for hour in missing}
+        cache.set_many(fresh, timeout=CACHE_TIMEOUT)
+        cached.update(fresh)
+
+    airings = []
+    for hour in hours:
+        airings.extend(cached[keys[hour]])
+    return first, last, airings
+
+
+def _load_buckets(start, end, tag_ids, serializer_context):
+    """Query and serialize airings in [start, end), grouped by hour bucket"""
+    from .serializers import ShowAiringSerializer
+    from .tags import shows_with_all_tags
+
+    occurrences = ShowOccurrence.objects.filter(
+        scheduled_for__gte=start,
+        scheduled_for__lt=end,
+        show__status='published'
+    ).select_related('show', 'show__creator').prefetch_related('show__tags').order_by('scheduled_for', 'show_id')
+
+    if tag_ids:
+        occurrences = occurrences.filter(show_id__in=shows_with_all_tags(tag_ids))
+
+    occurrences = list(occurrences)
+    data = ShowAiringSerializer(occurrences, many=True, context=serializer_context or {}).data
+
+    buckets = {}
+    for occurrence, item in zip(occurrences, data):
+        hour = occurrence.scheduled_for.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+        buckets.setdefault(hour, []).append(item)
+    return buckets
@@ -0,0 +1,92 @@
+"""
+Management command to benchmark the batch recurrence engine against
+the per-show, per-date loop it replaced.
+"""
+import random
+import time
+from datetime import datetime, time as time_of_day, timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from shows.models import Show
+from shows.schedule import airs_on, expand_airings
+
+
+class Command(BaseCommand):
+    help = 'Benchmark batch schedule expansion vs. per-show should_air_on_date calls'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--shows', type=int, default=5000, help='Number of recurring shows to simulate')
+        parser.add_argument('--days', type=int, default=1, help='Length of the window in days')
+        parser.add_argument('--repeat', type=int, default=5, help='Number of timed runs per strategy')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        shows = [self._fake_show(rng, pk) for pk in range(1, options['shows'] + 1)]
+        cancelled = self._fake_cancellations(rng, shows)
+
+        start = timezone.now()
+        end = start + timedelta(days=options['days'])
+
+        naive_time, naive_count = self._time(options['repeat'], lambda: self._naive(shows, start, end, cancelled))
+        batch_time, batch_count = self._time(options['repeat'], lambda: len(expand_airings(shows, start, end, cancelled)))
+
+        if naive_count != batch_count:
+            self.stdout.write(self.style.ERROR(
+                f'Mismatch: per-row loop found {naive_count} airings, batch engine found {batch_count}'
+            ))
+            return
+
+        self.stdout.write(f"Shows: {len(shows)}, window: {options['days']} day(s), airings: {batch_count}")
+        self.stdout.write(f'Per-row loop: {naive_time * 1000:.1f} ms')
+        self.stdout.write(f'Batch engine: {batch_time * 1000:.1f} ms')
+        self.stdout.write(self.style.SUCCESS(f'✓ Speedup: {naive_time / batch_time:.1f}x'))
+
+    def _fake_show(self, rng, pk):
+        """Build an unsaved recurring show with a random schedule"""
+        recurrence_type = rng.choice(['SPECIFIC_DAY', 'DAILY', 'WEEKDAYS', 'WEEKENDS'])
+        return Show(
+            pk=pk,
+            title=f'Show {pk}',
+            is_recurring=True,
+            recurrence_type=recurrence_type,
+            day_of_week=rng.randrange(7) if recurrence_type == 'SPECIFIC_DAY' else None,
+            scheduled_time=time_of_day(rng.randrange(24), rng.choice([0, 15, 30, 45])),
+            status='published',
+        )
+
+    def _fake_cancellations(self, rng, shows):
+        """Cancel a few random upcoming dates per show"""
+        today = timezone.now().date()
+        return {
+            show.pk: {today + timedelta(days=rng.randrange(14)) for _ in range(rng.randrange(4))}
+            for show in shows
+        }
+
+    def _naive(self, shows, start, end, cancelled):
+        """The original strategy: test every show against every date"""
+        count = 0
+        first_day = timezone.localtime(start).date()
+        last_day = timezone.localtime(end).date()
+        for show in shows:
+            day = first_day
+            while day <= last_day:
+                if airs_on(show, day, cancelled[show.pk]):
+                    scheduled = timezone.make_aware(datetime.combine(day, show.scheduled_time))
+                    if start <= scheduled <= end:
+                        count += 1
+                day += timedelta(days=1)
+        return count
+
+    def _time(self, repeat, func):
+        """Return (best wall time, result) over several runs"""
+        best = None
+        result = None
+        for _ in range(repeat):
+            began = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - began
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
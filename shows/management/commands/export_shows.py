@@ -0,0 +1,53 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from shows.catalog import FORMATS, detect_format, export_catalog, write_records
+from shows.models import Show
+
+
+class Command(BaseCommand):
+    help = 'Stream shows, tags and episodes to a JSONL or CSV file ("-" writes stdout)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Output file, or "-" for stdout')
+        parser.add_argument('--format', choices=FORMATS, help='Defaults to the file extension (JSONL otherwise)')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Shows fetched per query')
+        parser.add_argument('--status', choices=[choice for choice, _ in Show.STATUS_CHOICES])
+        parser.add_argument('--creator', help='Only export shows by this username')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or detect_format(path)
+
+        shows = Show.objects.all()
+        if options['status']:
+            shows = shows.filter(status=options['status'])
+        if options['creator']:
+            shows = shows.filter(creator__username=options['creator'])
+
+        started = time.monotonic()
+        count = 0
+
+        def counted(records):
+            nonlocal count
+            for record in records:
+                count += 1
+                yield record
+
+        try:
+            stream = sys.stdout if path == '-' else open(path, 'w', newline='', encoding='utf-8')
+        except OSError as exc:
+            raise CommandError(f'Cannot open {path}: {exc}')
+
+        try:
+            write_records(stream, counted(export_catalog(shows, options['chunk_size'])), fmt)
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+
+        # Report on stderr so the export can be piped
+        elapsed = time.monotonic() - started
+        self.stderr.write(self.style.SUCCESS(
+            f'✅ Exported {count} shows in {elapsed:.1f}s ({count / elapsed if elapsed else 0:.0f} rows/s)'
+        ))
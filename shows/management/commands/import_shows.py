@@ -0,0 +1,57 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from shows.catalog import FORMATS, detect_format, import_catalog, read_records
+
+
+class Command(BaseCommand):
+    help = 'Bulk import shows, tags and episodes from a JSONL or CSV file ("-" reads stdin)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import, or "-" for stdin')
+        parser.add_argument('--format', choices=FORMATS, help='Defaults to the file extension (JSONL otherwise)')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Records per transaction')
+        parser.add_argument('--creator', help='Username for records without a creator')
+        parser.add_argument('--dry-run', action='store_true', help='Validate records without writing')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or detect_format(path)
+        started = time.monotonic()
+
+        def report_error(line, error):
+            self.stderr.write(self.style.ERROR(f'Line {line}: {error}'))
+
+        def report(stats):
+            elapsed = time.monotonic() - started
+            self.stderr.write(
+                f"{stats['rows']} rows, {stats['shows']} shows "
+                f"({stats['rows'] / elapsed if elapsed else 0:.0f} rows/s)"
+            )
+
+        try:
+            stream = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+        except OSError as exc:
+            raise CommandError(f'Cannot open {path}: {exc}')
+
+        try:
+            stats = import_catalog(
+                read_records(stream, fmt),
+                chunk_size=options['chunk_size'],
+                default_creator=options['creator'],
+                dry_run=options['dry_run'],
+                on_chunk=report if options['verbosity'] > 1 else None,
+                on_error=report_error,
+            )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        elapsed = time.monotonic() - started
+        verb = 'Validated' if options['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {verb} {stats['rows'] - stats['error_count']} of {stats['rows']} rows: "
+            f"{stats['shows']} shows, {stats['episodes']} episodes, {stats['tags_created']} new tags "
+            f"in {elapsed:.1f}s ({stats['rows'] / elapsed if elapsed else 0:.0f} rows/s)"
+        ))
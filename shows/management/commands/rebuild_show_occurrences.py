@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from shows.models import Show
+from shows.occurrences import regenerate_occurrences, HORIZON_DAYS
+
+
+class Command(BaseCommand):
+    help = 'Rebuild materialized ShowOccurrence rows for all recurring shows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        shows = Show.objects.filter(is_recurring=True).order_by('pk')
+        
+        total_shows = 0
+        total_occurrences = 0
+        last_pk = 0
+        while True:
+            chunk = list(shows.filter(pk__gt=last_pk)[:chunk_size])
+            if not chunk:
+                break
+            total_occurrences += regenerate_occurrences(chunk)
+            total_shows += len(chunk)
+            last_pk = chunk[-1].pk
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Rebuilt {total_occurrences} occurrences for {total_shows} shows '
+            f'({HORIZON_DAYS}-day horizon)'
+        ))
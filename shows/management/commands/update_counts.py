@@ -1,25 +1,28 @@
 from django.core.management.base import BaseCommand
-from django.contrib.contenttypes.models import ContentType
-from shows.models import Show
-from users.models import Like, Comment
+from users.counters import counted_models, reconcile_counts
 
 
 class Command(BaseCommand):
-    help = 'Update like_count and comment_count for all shows'
+    help = 'Reconcile like_count and comment_count on shows, news and events'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows checked per query')
+        parser.add_argument(
+            '--model',
+            action='append',
+            help='Only reconcile these models (e.g. --model Show --model News)'
+        )
 
     def handle(self, *args, **options):
-        show_ct = ContentType.objects.get(app_label='shows', model='show')
-        
-        for show in Show.objects.all():
-            show.like_count = Like.objects.filter(
-                content_type=show_ct, 
-                object_id=show.id
-            ).count()
-            show.comment_count = Comment.objects.filter(
-                content_type=show_ct,
-                object_id=show.id
-            ).count()
-            show.save(update_fields=['like_count', 'comment_count'])
-            self.stdout.write(f"✅ {show.title}: {show.like_count} likes, {show.comment_count} comments")
-        
-        self.stdout.write(self.style.SUCCESS('✅ All counts updated!'))
\ No newline at end of file
+        models = counted_models()
+        if options['model']:
+            wanted = {name.lower() for name in options['model']}
+            models = [model for model in models if model.__name__.lower() in wanted]
+
+        for model in models:
+            result = reconcile_counts(model, chunk_size=options['chunk_size'])
+            self.stdout.write(
+                f"✅ {model._meta.verbose_name_plural}: {result['checked']} checked, {result['fixed']} fixed"
+            )
+
+        self.stdout.write(self.style.SUCCESS('✅ All counts reconciled!'))
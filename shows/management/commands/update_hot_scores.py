@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from shows.trending import update_hot_scores
+
+
+class Command(BaseCommand):
+    help = 'Fold likes, comments, shares and follows since the last run into show hot scores'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        result = update_hot_scores(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Updated hot scores for {result['shows']} shows "
+            f"(activity {result['since']:%Y-%m-%d %H:%M} → {result['until']:%Y-%m-%d %H:%M})"
+        ))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.10 on 2026-10-16 20:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shows', '0010_guestrequest_alter_showepisode_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='show',
+            name='occurrences_until',
+            field=models.DateTimeField(blank=True, editable=False, help_text='ShowOccurrence rows exist up to this datetime', null=True),
+        ),
+        migrations.CreateModel(
+            name='ShowOccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scheduled_for', models.DateTimeField(help_text='Datetime this show instance airs')),
+                ('show', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='shows.show')),
+            ],
+            options={
+                'ordering': ['scheduled_for'],
+                'indexes': [models.Index(fields=['scheduled_for'], name='shows_showo_schedul_db334f_idx')],
+                'unique_together': {('show', 'scheduled_for')},
+            },
+        ),
+    ]
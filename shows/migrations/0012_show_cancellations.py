@@ -0,0 +1,67 @@
+# Generated by Django 5.2.10 on 2026-10-16 20:14
+# Data step added manually: copies Show.cancelled_instances into ShowCancellation
+
+import datetime
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_cancelled_instances(apps, schema_editor):
+    """Move the JSON list of ISO dates into one ShowCancellation row per date"""
+    Show = apps.get_model('shows', 'Show')
+    ShowCancellation = apps.get_model('shows', 'ShowCancellation')
+
+    rows = []
+    shows = Show.objects.exclude(cancelled_instances=[]).values_list('id', 'cancelled_instances')
+    for show_id, cancelled in shows.iterator():
+        for value in set(cancelled or []):
+            try:
+                date = datetime.date.fromisoformat(str(value)[:10])
+            except ValueError:
+                continue
+            rows.append(ShowCancellation(show_id=show_id, date=date))
+
+    ShowCancellation.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+def restore_cancelled_instances(apps, schema_editor):
+    """Rebuild the JSON lists from ShowCancellation rows"""
+    Show = apps.get_model('shows', 'Show')
+    ShowCancellation = apps.get_model('shows', 'ShowCancellation')
+
+    by_show = {}
+    for show_id, date in ShowCancellation.objects.values_list('show_id', 'date').order_by('date'):
+        by_show.setdefault(show_id, []).append(date.isoformat())
+
+    for show_id, dates in by_show.items():
+        Show.objects.filter(pk=show_id).update(cancelled_instances=dates)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shows', '0011_show_occurrences'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShowCancellation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(help_text='Date of the cancelled instance')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('show', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cancellations', to='shows.show')),
+            ],
+            options={
+                'ordering': ['date'],
+                'indexes': [models.Index(fields=['date'], name='shows_showc_date_123a07_idx')],
+                'unique_together': {('show', 'date')},
+            },
+        ),
+        migrations.RunPython(copy_cancelled_instances, restore_cancelled_instances),
+        migrations.RemoveField(
+            model_name='show',
+            name='cancelled_instances',
+        ),
+    ]
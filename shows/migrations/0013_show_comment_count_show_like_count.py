@@ -0,0 +1,45 @@
+# Generated by Django 5.2.10 on 2026-10-16 20:20
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counts(apps, schema_editor):
+    """Initialize the counters from the existing likes and comments"""
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    Show = apps.get_model('shows', 'Show')
+    content_type = ContentType.objects.filter(app_label='shows', model='show').first()
+    if content_type is None:
+        return
+
+    def total(model_name):
+        rows = apps.get_model('users', model_name).objects.filter(
+            content_type=content_type, object_id=OuterRef('pk')
+        ).order_by().values('object_id').annotate(total=Count('pk')).values('total')
+        return Coalesce(Subquery(rows), 0)
+
+    Show.objects.update(like_count=total('Like'), comment_count=total('Comment'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('users', '0009_user_display_name'),
+        ('shows', '0012_show_cancellations'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='show',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='show',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
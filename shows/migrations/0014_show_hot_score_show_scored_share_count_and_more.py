@@ -0,0 +1,37 @@
+# Generated by Django 5.2.10 on 2026-10-16 20:41
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def seed_scored_share_count(apps, schema_editor):
+    # Shares made before hot scores existed are not a fresh burst
+    Show = apps.get_model('shows', 'Show')
+    Show.objects.update(scored_share_count=F('share_count'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shows', '0013_show_comment_count_show_like_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='show',
+            name='hot_score',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='show',
+            name='scored_share_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(seed_scored_share_count, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='show',
+            index=models.Index(fields=['status', '-hot_score', '-id'], name='shows_show_status_cc7a7f_idx'),
+        ),
+    ]
@@ -1,8 +1,13 @@
+from functools import partial
+
 from django.db import models
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
 from django.utils.text import slugify
 
+from api.allocator import save_unique
+from .schedule import airs_on
+
 
 class Tag(models.Model):
     """
@@ -20,7 +25,7 @@ class Tag(models.Model):
     
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = slugify(self.name)
+            return save_unique(self, 'slug', slugify(self.name) or 'tag', partial(super().save, *args, **kwargs))
         super().save(*args, **kwargs)
 
 
@@ -118,15 +123,23 @@ class Show(models.Model):
         help_text="Time of day for the show (e.g., 17:00 for 5pm)"
     )
     
-    # Track cancelled instances for recurring shows
-    cancelled_instances = models.JSONField(
-        default=list,
+    # End of the materialized ShowOccurrence horizon for this show
+    occurrences_until = models.DateTimeField(
         blank=True,
-        help_text="List of ISO date strings for cancelled recurring show instances"
+        null=True,
+        editable=False,
+        help_text="ShowOccurrence rows exist up to this datetime"
     )
     
     # Analytics
     share_count = models.IntegerField(default=0, help_text="Number of times this show has been shared")
+    # Maintained by users.signals; `manage.py update_counts` fixes drift
+    like_count = models.PositiveIntegerField(default=0, editable=False)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    # Log-space time-decayed engagement score, see shows/trending.py
+    hot_score = models.FloatField(default=0, editable=False)
+    # share_count already folded into hot_score
+    scored_share_count = models.PositiveIntegerField(default=0, editable=False)
     
     # Metadata
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft')
@@ -143,14 +156,39 @@ class Show(models.Model):
             models.Index(fields=['slug']),
             models.Index(fields=['status', '-created_at']),
             models.Index(fields=['creator', 'status']),
+            models.Index(fields=['status', '-hot_score', '-id']),
         ]
     
+    # Fields that drive the recurrence expansion; changing any of them
+    # regenerates the show's ShowOccurrence rows (see shows/signals.py)
+    SCHEDULE_FIELDS = ('is_recurring', 'recurrence_type', 'day_of_week', 'scheduled_time')
+    
     def __str__(self):
         return self.title
     
-    # REMOVED: like_count and comment_count properties
-    # These were conflicting with queryset annotations in views
-    # Counts are now calculated exclusively via annotations in ShowViewSet
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded schedule so saves can tell if it changed"""
+        instance = super().from_db(db, field_names, values)
+        instance.snapshot_schedule()
+        return instance
+    
+    def _schedule_state(self):
+        return tuple(getattr(self, field) for field in self.SCHEDULE_FIELDS)
+    
+    def snapshot_schedule(self):
+        """Record the current schedule as the persisted one"""
+        if self.get_deferred_fields().intersection(self.SCHEDULE_FIELDS):
+            self._schedule_snapshot = None
+        else:
+            self._schedule_snapshot = self._schedule_state()
+    
+    def schedule_changed(self, update_fields=None):
+        """Check if the schedule differs from the last loaded/saved state"""
+        if update_fields is not None and not set(update_fields).intersection(self.SCHEDULE_FIELDS):
+            return False
+        snapshot = getattr(self, '_schedule_snapshot', None)
+        return snapshot is None or snapshot != self._schedule_state()
     
     def get_schedule_display(self):
         """Return human-readable schedule"""
@@ -171,19 +209,16 @@ class Show(models.Model):
         else:
             return "Custom schedule"
     
+    def should_air_on_date(self, date):
+        """Check if this recurring show airs on the given date (skips cancelled instances)"""
+        if not airs_on(self, date):
+            return False
+        return self.pk is None or not self.cancellations.filter(date=date).exists()
+    
     def save(self, *args, **kwargs):
-        """Auto-generate slug from title if not set"""
+        """Auto-generate a unique slug from title if not set"""
         if not self.slug:
-            base_slug = slugify(self.title)
-            slug = base_slug
-            counter = 1
-            
-            # Ensure unique slug
-            while Show.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            
-            self.slug = slug
+            return save_unique(self, 'slug', slugify(self.title) or 'show', partial(super().save, *args, **kwargs))
         
         super().save(*args, **kwargs)
 
@@ -215,6 +250,46 @@ class ShowEpisode(models.Model):
 
 
 
+class ShowCancellation(models.Model):
+    """
+    A cancelled instance of a recurring show.
+    One row per (show, date), indexed for per-show lookups and date range queries.
+    """
+    show = models.ForeignKey(Show, on_delete=models.CASCADE, related_name='cancellations')
+    date = models.DateField(help_text="Date of the cancelled instance")
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['date']
+        unique_together = ['show', 'date']
+        indexes = [
+            models.Index(fields=['date']),
+        ]
+    
+    def __str__(self):
+        return f"{self.show.title} - cancelled {self.date.isoformat()}"
+
+
+class ShowOccurrence(models.Model):
+    """
+    Materialized airing of a recurring show within the rolling horizon.
+    Rows are regenerated when a show's schedule changes and extended nightly,
+    so "what airs between T1 and T2" is an index range scan.
+    """
+    show = models.ForeignKey(Show, on_delete=models.CASCADE, related_name='occurrences')
+    scheduled_for = models.DateTimeField(help_text="Datetime this show instance airs")
+    
+    class Meta:
+        ordering = ['scheduled_for']
+        unique_together = ['show', 'scheduled_for']
+        indexes = [
+            models.Index(fields=['scheduled_for']),
+        ]
+    
+    def __str__(self):
+        return f"{self.show.title} - {self.scheduled_for.strftime('%Y-%m-%d %H:%M')}"
+
+
 class ShowReminder(models.Model):
     """
     Tracks show reminders and creator responses
@@ -0,0 +1,136 @@
+"""
+Maintenance of the materialized ShowOccurrence table.
+
+Occurrences cover a rolling horizon (SHOW_OCCURRENCE_HORIZON_DAYS). A show's
+rows are rebuilt when its schedule changes, and a nightly pass extends every
+recurring show from its own `occurrences_until` watermark to the new horizon.
+"""
+from datetime import datetime, time, timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .guide import invalidate_schedule
+from .models import Show, ShowOccurrence
+from .schedule import expand_airings
+
+
+HORIZON_DAYS = getattr(settings, 'SHOW_OCCURRENCE_HORIZON_DAYS', 60)
+BATCH_SIZE = 1000
+
+
+def horizon_end(now=None):
+    """Return the datetime the occurrence table should reach"""
+    return (now or timezone.now()) + timedelta(days=HORIZON_DAYS)
+
+
+def _insert(airings):
+    ShowOccurrence.objects.bulk_create(
+        [ShowOccurrence(show=show, scheduled_for=scheduled_for) for show, scheduled_for in airings],
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def regenerate_occurrences(shows, now=None):
+    """
+    Replace the future occurrences of the given shows.
+
+    Args:
+        shows: Iterable of saved Show instances
+        now: Start of the regenerated window (defaults to now)
+
+    Returns:
+        int: Number of occurrences written
+    """
+    now = now or timezone.now()
+    end = horizon_end(now)
+    shows = list(shows)
+    show_ids = [show.pk for show in shows]
+
+    airings = expand_airings(shows, now, end)
+    with transaction.atomic():
+        ShowOccurrence.objects.filter(show_id__in=show_ids, scheduled_for__gte=now).delete()
+        _insert(airings)
+        Show.objects.filter(pk__in=show_ids).update(occurrences_until=end)
+    invalidate_schedule()
+
+    for show in shows:
+        show.occurrences_until = end
+    return len(airings)
+
+
+def _day_bounds(date):
+    tz = timezone.get_current_timezone()
+    return (
+        timezone.make_aware(datetime.combine(date, time.min), tz),
+        timezone.make_aware(datetime.combine(date, time.max), tz),
+    )
+
+
+def remove_date(show_id, date):
+    """Drop a show's occurrences on a cancelled date"""
+    ShowOccurrence.objects.filter(show_id=show_id, scheduled_for__range=_day_bounds(date)).delete()
+    invalidate_schedule()
+
+
+def restore_date(show, date, now=None):
+    """Re-materialize a show's airing on a date whose cancellation was lifted"""
+    now = now or timezone.now()
+    if not show.occurrences_until:
+        return
+    start, end = _day_bounds(date)
+    start, end = max(start, now), min(end, show.occurrences_until)
+    _insert(expand_airings([show], start, end, cancelled={}))
+    invalidate_schedule()
+
+
+def extend_horizon(now=None, chunk_size=2000):
+    """
+    Extend every recurring show's occurrences up to the current horizon
+    and prune occurrences that aired before today.
+
+    Shows are expanded from their own watermark, so each run only writes
+    the days that entered the horizon since the previous run.
+
+    Returns:
+        dict: Counts of shows extended, occurrences created and pruned
+    """
+    now = now or timezone.now()
+    end = horizon_end(now)
+
+    pending = Show.objects.filter(is_recurring=True).filter(
+        Q(occurrences_until__isnull=True) | Q(occurrences_until__lt=end)
+    ).order_by('occurrences_until', 'pk')
+
+    # Extended shows drop out of `pending`, so re-querying walks the backlog
+    extended = 0
+    created = 0
+    while True:
+        chunk = list(pending[:chunk_size])
+        if not chunk:
+            break
+        created += _extend_chunk(chunk, now, end)
+        extended += len(chunk)
+
+    today_start = timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0)
+    pruned = ShowOccurrence.objects.filter(scheduled_for__lt=today_start).delete()[0]
+    invalidate_schedule()
+
+    return {'shows': extended, 'created': created, 'pruned': pruned}
+
+
+def _extend_chunk(shows, now, end):
+    """Expand a chunk of shows grouped by their shared watermark"""
+    created = 0
+    with transaction.atomic():
+        for watermark, group in groupby(shows, key=lambda show: show.occurrences_until):
+            start = max(watermark, now) if watermark else now
+            airings = expand_airings(group, start, end)
+            _insert(airings)
+            created += len(airings)
+        Show.objects.filter(pk__in=[show.pk for show in shows]).update(occurrences_until=end)
+    return created
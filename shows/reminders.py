@@ -0,0 +1,169 @@
+"""
+Set-based reminder processing for recurring shows.
+
+The Celery beat tasks in shows/tasks.py are thin wrappers around these
+functions, so the cost of a run is proportional to the number of due
+shows rather than the number of recurring shows.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from users.counters import bump_unread_counts
+from users.models import Notification
+from .models import ShowCancellation, ShowOccurrence, ShowReminder
+
+logger = logging.getLogger(__name__)
+
+
+REMINDER_WINDOW_START = timedelta(minutes=25)
+REMINDER_WINDOW_END = timedelta(minutes=35)
+BATCH_SIZE = 1000
+
+
+def create_due_reminders(now=None):
+    """
+    Create reminders and creator notifications for shows airing in 25-35 minutes.
+
+    Due shows are selected from the ShowOccurrence index, reminders are
+    inserted with one bulk INSERT that skips existing (show, scheduled_for)
+    rows, and notifications are created only for rows this run inserted.
+
+    Returns:
+        list: (show_id, scheduled_for) pairs that got a new reminder
+    """
+    now = now or timezone.now()
+    window = (now + REMINDER_WINDOW_START, now + REMINDER_WINDOW_END)
+
+    due = list(
+        ShowOccurrence.objects.filter(
+            scheduled_for__range=window,
+            show__is_recurring=True,
+            show__status='published'
+        ).values_list('show_id', 'scheduled_for')
+    )
+    if not due:
+        return []
+
+    with transaction.atomic():
+        ShowReminder.objects.bulk_create(
+            [
+                ShowReminder(show_id=show_id, scheduled_for=scheduled_for, reminder_sent_at=now)
+                for show_id, scheduled_for in due
+            ],
+            batch_size=BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+        # Rows stamped with this run's timestamp are the ones we inserted;
+        # reminders created by an earlier run keep their original stamp
+        created = list(
+            ShowReminder.objects.filter(
+                scheduled_for__range=window,
+                reminder_sent_at=now
+            ).values_list('show_id', 'scheduled_for', 'show__creator_id')
+        )
+
+        Notification.objects.bulk_create(
+            [
+                Notification(
+                    recipient_id=creator_id,
+                    actor_id=creator_id,  # Self-notification
+                    notification_type='show_reminder',
+                    content_type=None,
+                    object_id=None
+                )
+                for _, _, creator_id in created
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        bump_unread_counts(creator_id for _, _, creator_id in created)
+
+    return [(show_id, scheduled_for) for show_id, scheduled_for, _ in created]
+
+
+def cancel_unconfirmed_reminders(now=None, chunk_size=1000):
+    """
+    Auto-cancel every PENDING reminder whose show time has passed.
+
+    The backlog is drained in primary-key chunks. Each chunk runs in one
+    transaction: one UPDATE for the reminders, one bulk INSERT of the
+    cancelled (show, date) rows that skips ones already recorded, and one
+    bulk INSERT of notifications.
+
+    Returns:
+        dict: cancelled count, chunks processed, elapsed seconds and rows/second
+    """
+    now = now or timezone.now()
+    started = time.monotonic()
+    pending = ShowReminder.objects.filter(
+        creator_response='PENDING',
+        scheduled_for__lte=now
+    ).order_by('pk')
+
+    cancelled = 0
+    chunks = 0
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                pending.filter(pk__gt=last_pk)
+                .select_for_update(skip_locked=True, of=('self',))
+                .values_list('pk', 'show_id', 'scheduled_for', 'show__creator_id')[:chunk_size]
+            )
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+
+            ShowReminder.objects.filter(pk__in=[row[0] for row in rows]).update(
+                creator_response='CANCELLED',
+                responded_at=now
+            )
+
+            # Record the cancelled dates; bulk_create skips the occurrence
+            # cleanup signal, which is fine: these airings are already past.
+            ShowCancellation.objects.bulk_create(
+                [
+                    ShowCancellation(show_id=show_id, date=date)
+                    for show_id, date in {
+                        (show_id, timezone.localtime(scheduled_for).date())
+                        for _, show_id, scheduled_for, _ in rows
+                    }
+                ],
+                batch_size=BATCH_SIZE,
+                ignore_conflicts=True,
+            )
+
+            Notification.objects.bulk_create(
+                [
+                    Notification(
+                        recipient_id=creator_id,
+                        actor_id=creator_id,  # Self-notification
+                        notification_type='show_cancelled',
+                        content_type=None,
+                        object_id=None
+                    )
+                    for _, _, _, creator_id in rows
+                ],
+                batch_size=BATCH_SIZE,
+            )
+            bump_unread_counts(creator_id for _, _, _, creator_id in rows)
+
+        cancelled += len(rows)
+        chunks += 1
+        elapsed = time.monotonic() - started
+        logger.info(
+            "Auto-cancel chunk %d: %d reminders (%d total, %.0f rows/s)",
+            chunks, len(rows), cancelled, cancelled / elapsed if elapsed else 0
+        )
+
+    elapsed = time.monotonic() - started
+    return {
+        'cancelled': cancelled,
+        'chunks': chunks,
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(cancelled / elapsed, 1) if elapsed and cancelled else 0.0,
+    }
@@ -0,0 +1,146 @@
+"""
+Recurrence expansion engine for Show schedules.
+
+Every recurrence pattern is reduced to a 7-bit weekday mask (bit 0 = Monday,
+bit 6 = Sunday). To expand a window, shows are bucketed by weekday once and
+each date in the window is resolved with a single bucket lookup, so the cost
+is O(shows + days + airings) instead of O(shows x days) method calls.
+
+Cancelled instances live in the ShowCancellation table; the engine takes
+them as a {show_id: set of dates} mapping, loaded with one range query for
+the whole batch when the caller doesn't supply it.
+
+Used by the reminder beat task, the occurrence table and the schedule views.
+"""
+from collections import defaultdict, namedtuple
+from datetime import date as date_cls, datetime, time, timedelta
+
+from django.utils import timezone
+
+
+ALL_DAYS_MASK = 0b1111111
+WEEKDAYS_MASK = 0b0011111   # Monday - Friday
+WEEKENDS_MASK = 0b1100000   # Saturday - Sunday
+
+RECURRENCE_MASKS = {
+    'DAILY': ALL_DAYS_MASK,
+    'WEEKDAYS': WEEKDAYS_MASK,
+    'WEEKENDS': WEEKENDS_MASK,
+}
+
+Airing = namedtuple('Airing', ['show', 'scheduled_for'])
+
+
+def weekday_mask(show):
+    """
+    Return the weekday bitmask for a show's recurrence pattern.
+
+    Non-recurring shows and shows with an incomplete schedule get 0.
+    """
+    if not show.is_recurring or not show.scheduled_time:
+        return 0
+
+    if show.recurrence_type == 'SPECIFIC_DAY':
+        if show.day_of_week is None:
+            return 0
+        return 1 << show.day_of_week
+
+    return RECURRENCE_MASKS.get(show.recurrence_type, 0)
+
+
+def airs_on(show, date, cancelled=frozenset()):
+    """Check whether a single show airs on a single date"""
+    if not weekday_mask(show) & (1 << date.weekday()):
+        return False
+    return date not in cancelled
+
+
+def load_cancelled_dates(show_ids, first_day, last_day):
+    """
+    Fetch cancellations for many shows over a date range in one query.
+
+    Returns:
+        dict: show_id -> set of cancelled dates
+    """
+    from .models import ShowCancellation
+
+    cancelled = defaultdict(set)
+    rows = ShowCancellation.objects.filter(
+        show_id__in=show_ids,
+        date__range=(first_day, last_day)
+    ).values_list('show_id', 'date')
+    for show_id, day in rows:
+        cancelled[show_id].add(day)
+    return cancelled
+
+
+def _window_bounds(start, end, tz):
+    """
+    Normalize a window to aware datetimes.
+
+    Dates are accepted for convenience: a start date means the beginning of
+    that day and an end date means the end of that day, so (today, today)
+    covers all of today.
+    """
+    if not isinstance(start, datetime) and isinstance(start, date_cls):
+        start = timezone.make_aware(datetime.combine(start, time.min), tz)
+    if not isinstance(end, datetime) and isinstance(end, date_cls):
+        end = timezone.make_aware(datetime.combine(end, time.max), tz)
+    return start, end
+
+
+def expand_airings(shows, start, end, cancelled=None):
+    """
+    Expand many shows into every airing between start and end (inclusive).
+
+    Args:
+        shows: Iterable of Show instances
+        start: Aware datetime or date where the window begins
+        end: Aware datetime or date where the window ends
+        cancelled: Optional {show_id: set of dates} mapping; loaded from
+            ShowCancellation in a single query when omitted
+
+    Returns:
+        List of Airing(show, scheduled_for) sorted by scheduled_for
+    """
+    tz = timezone.get_current_timezone()
+    start, end = _window_bounds(start, end, tz)
+    if end < start:
+        return []
+
+    first_day = timezone.localtime(start, tz).date()
+    last_day = timezone.localtime(end, tz).date()
+
+    # Bucket shows by the weekdays they air on
+    scheduled = [(show, weekday_mask(show)) for show in shows]
+    scheduled = [(show, mask) for show, mask in scheduled if mask]
+    if not scheduled:
+        return []
+    if cancelled is None:
+        cancelled = load_cancelled_dates([show.pk for show, _ in scheduled], first_day, last_day)
+
+    buckets = [[] for _ in range(7)]
+    no_cancellations = frozenset()
+    for show, mask in scheduled:
+        entry = (show, show.scheduled_time, cancelled.get(show.pk, no_cancellations))
+        for weekday in range(7):
+            if mask & (1 << weekday):
+                buckets[weekday].append(entry)
+
+    airings = []
+    day = first_day
+    one_day = timedelta(days=1)
+
+    while day <= last_day:
+        bucket = buckets[day.weekday()]
+        if bucket:
+            for show, scheduled_time, cancelled_days in bucket:
+                if day in cancelled_days:
+                    continue
+                scheduled_for = timezone.make_aware(datetime.combine(day, scheduled_time), tz)
+                if start <= scheduled_for <= end:
+                    airings.append(Airing(show, scheduled_for))
+        day += one_day
+
+    airings.sort(key=lambda airing: (airing.scheduled_for, airing.show.pk or 0))
+    return airings
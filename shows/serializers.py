@@ -1,5 +1,10 @@
 from rest_framework import serializers
-from .models import Show, ShowEpisode, Tag, ShowReminder, GuestRequest
+from api.serializers import BatchedListSerializer, PendingCountersMixin
+from api.sparse import SparseFieldsSerializerMixin
+from users.viewer_state import ViewerStateMixin
+from .models import Show, ShowEpisode, Tag, ShowReminder, ShowOccurrence, GuestRequest
+from .episodes import episodes_url, recent_episodes
+from .tags import tag_registry
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -32,15 +37,15 @@ class ShowEpisodeSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at']
 
 
-class ShowSerializer(serializers.ModelSerializer):
+class ShowSerializer(PendingCountersMixin, serializers.ModelSerializer):
     """Full show serializer with creator info and engagement counts"""
     creator = ShowCreatorSerializer(read_only=True)
     tags = TagSerializer(many=True, read_only=True)
     guests = ShowCreatorSerializer(many=True, read_only=True)
-    like_count = serializers.SerializerMethodField()
-    comment_count = serializers.SerializerMethodField()
     schedule_display = serializers.CharField(source='get_schedule_display', read_only=True)
-    episodes = ShowEpisodeSerializer(many=True, read_only=True)
+    # Only the most recent episodes; `episodes_next` pages through the rest
+    episodes = serializers.SerializerMethodField()
+    episodes_next = serializers.SerializerMethodField()
     
     class Meta:
         model = Show
@@ -49,21 +54,21 @@ class ShowSerializer(serializers.ModelSerializer):
             'external_link', 'link_platform',
             'is_recurring', 'recurrence_type', 'day_of_week', 'scheduled_time', 'schedule_display',
             'status', 'created_at', 'updated_at',
-            'like_count', 'comment_count', 'share_count', 'episodes'
+            'like_count', 'comment_count', 'share_count', 'episodes', 'episodes_next'
         ]
         read_only_fields = ['created_at', 'updated_at', 'creator', 'slug', 'share_count']
+        list_serializer_class = BatchedListSerializer
+        pending_counters = ['share_count']
     
-    def get_like_count(self, obj):
-        """Get like count from annotation"""
-        # CRITICAL: Check if annotation exists AND is not None
-        # hasattr() returns True even if value is None/0
-        return getattr(obj, '_like_count', obj.likes.count())
+    def get_episodes(self, obj):
+        episodes, _ = recent_episodes(obj)
+        return ShowEpisodeSerializer(episodes, many=True, context=self.context).data
     
-    def get_comment_count(self, obj):
-        """Get comment count from annotation"""
-        # CRITICAL: Check if annotation exists AND is not None
-        # hasattr() returns True even if value is None/0
-        return getattr(obj, '_comment_count', obj.comments.count())
+    def get_episodes_next(self, obj):
+        _, cursor = recent_episodes(obj)
+        if cursor is None:
+            return None
+        return episodes_url(self.context.get('request'), obj.pk, cursor)
     
     def validate(self, data):
         """Validate recurring show fields"""
@@ -91,14 +96,14 @@ class ShowSerializer(serializers.ModelSerializer):
         return data
 
 
-class ShowListSerializer(serializers.ModelSerializer):
-    """Lightweight show serializer for list views"""
+class ShowListSerializer(SparseFieldsSerializerMixin, PendingCountersMixin, ViewerStateMixin, serializers.ModelSerializer):
+    """Lightweight show serializer for list views (supports ?fields= / ?expand=)"""
     creator = ShowCreatorSerializer(read_only=True)
     tags = TagSerializer(many=True, read_only=True)
     guests = ShowCreatorSerializer(many=True, read_only=True)
-    like_count = serializers.SerializerMethodField()
-    comment_count = serializers.SerializerMethodField()
     schedule_display = serializers.CharField(source='get_schedule_display', read_only=True)
+    is_liked_by_me = serializers.SerializerMethodField()
+    is_following_creator = serializers.SerializerMethodField()
     
     class Meta:
         model = Show
@@ -106,17 +111,20 @@ class ShowListSerializer(serializers.ModelSerializer):
             'id', 'slug', 'title', 'description', 'thumbnail', 'creator', 'tags', 'guests',
             'external_link', 'link_platform',
             'is_recurring', 'recurrence_type', 'day_of_week', 'scheduled_time', 'schedule_display',
-            'status', 'created_at', 'like_count', 'comment_count', 'share_count'
+            'status', 'created_at', 'like_count', 'comment_count', 'share_count',
+            'is_liked_by_me', 'is_following_creator'
         ]
         read_only_fields = fields
-    
-    def get_like_count(self, obj):
-        """Get like count from annotation"""
-        return getattr(obj, '_like_count', obj.likes.count())
-    
-    def get_comment_count(self, obj):
-        """Get comment count from annotation"""
-        return getattr(obj, '_comment_count', obj.comments.count())
+        expandable_fields = ['creator', 'tags', 'guests']
+        field_dependencies = {
+            'schedule_display': ['is_recurring', 'recurrence_type', 'day_of_week', 'scheduled_time'],
+            'is_liked_by_me': [],
+            'is_following_creator': ['creator'],
+        }
+        list_serializer_class = BatchedListSerializer
+        pending_counters = ['share_count']
+        viewer_like = True
+        viewer_follow = ('is_following_creator', 'creator_id')
 
 
 class ShowCreateSerializer(serializers.ModelSerializer):
@@ -168,34 +176,30 @@ class ShowCreateSerializer(serializers.ModelSerializer):
         
         return data
     
+    def validate_tag_ids(self, value):
+        """Check tag IDs against the tag registry (the table for IDs it doesn't know)"""
+        unknown = set(value) - set(tag_registry.existing(value))
+        if unknown:
+            raise serializers.ValidationError(f"Unknown tag IDs: {sorted(unknown)}")
+        return value
+    
     def create(self, validated_data):
         """Create show with tags"""
-        # Extract tags
-        tag_ids = validated_data.pop('tag_ids', None)
-        tag_names = validated_data.pop('tag_names', None)
+        tag_ids = validated_data.pop('tag_ids', None) or []
+        tag_names = validated_data.pop('tag_names', None) or []
         
-        # Create show
         show = Show.objects.create(**validated_data)
         
-        # Handle tag IDs
-        if tag_ids is not None:
-            show.tags.set(tag_ids)
-        
-        # Handle tag names (create if needed)
-        if tag_names is not None:
-            from .models import Tag
-            for tag_name in tag_names:
-                tag, created = Tag.objects.get_or_create(
-                    name=tag_name,
-                    defaults={'slug': tag_name.lower().replace(' ', '-')}
-                )
-                show.tags.add(tag)
+        # Names are resolved (and missing tags created) in one batch; the
+        # links go in with a single bulk insert
+        tag_ids = list(dict.fromkeys(tag_ids + tag_registry.ids_for(tag_names)))
+        if tag_ids:
+            show.tags.add(*tag_ids)
         
         return show
     
     def update(self, instance, validated_data):
         """Update show with tags"""
-        # Extract tags
         tag_ids = validated_data.pop('tag_ids', None)
         tag_names = validated_data.pop('tag_names', None)
         
@@ -203,24 +207,79 @@ class ShowCreateSerializer(serializers.ModelSerializer):
             setattr(instance, attr, value)
         instance.save()
         
-        # Handle tag IDs
+        # tag_names replaces the tags entirely; set() only touches the links
+        # that actually change
+        if tag_names is not None:
+            tag_ids = tag_registry.ids_for(tag_names)
         if tag_ids is not None:
             instance.tags.set(tag_ids)
         
-        # Handle tag names
-        if tag_names is not None:
-            from .models import Tag
-            instance.tags.clear()  # Clear existing if tag_names provided
-            for tag_name in tag_names:
-                tag, created = Tag.objects.get_or_create(
-                    name=tag_name,
-                    defaults={'slug': tag_name.lower().replace(' ', '-')}
-                )
-                instance.tags.add(tag)
-        
         return instance
 
 
+class EpisodeCatalogSerializer(serializers.ModelSerializer):
+    """Episode entries in bulk import/export files"""
+    class Meta:
+        model = ShowEpisode
+        fields = ['episode_number', 'title', 'description', 'air_date', 'duration', 'video_url']
+
+
+class ShowCatalogSerializer(ShowCreateSerializer):
+    """
+    Show rows in bulk import/export files (manage.py import_shows/export_shows).
+    Creator and tags are referenced by username and name and resolved in bulk
+    by shows.catalog, so validating a row runs no queries.
+    """
+    tag_ids = None
+    tag_names = None
+    slug = serializers.CharField(max_length=300, required=False, allow_blank=True)
+    creator = serializers.CharField(source='creator.username')
+    tags = serializers.ListField(child=serializers.CharField(max_length=50), required=False, write_only=True)
+    episodes = EpisodeCatalogSerializer(many=True, required=False)
+    
+    class Meta:
+        model = Show
+        fields = [
+            'slug', 'title', 'description', 'creator', 'tags',
+            'external_link', 'link_platform',
+            'is_recurring', 'recurrence_type', 'day_of_week', 'scheduled_time',
+            'status', 'episodes'
+        ]
+
+    def validate_episodes(self, value):
+        """Reject repeated episode numbers before they hit the unique constraint"""
+        numbers = [episode['episode_number'] for episode in value]
+        if len(numbers) != len(set(numbers)):
+            raise serializers.ValidationError("Episode numbers must be unique within a show.")
+        return value
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data['tags'] = [tag.name for tag in instance.tags.all()]
+        return data
+
+
+class ShowGuideSerializer(serializers.ModelSerializer):
+    """Compact show info embedded in TV guide airings"""
+    creator = ShowCreatorSerializer(read_only=True)
+    tags = TagSerializer(many=True, read_only=True)
+    
+    class Meta:
+        model = Show
+        fields = ['id', 'slug', 'title', 'thumbnail', 'creator', 'tags', 'external_link', 'link_platform']
+        read_only_fields = fields
+
+
+class ShowAiringSerializer(serializers.ModelSerializer):
+    """A single airing in the TV guide"""
+    show = ShowGuideSerializer(read_only=True)
+    
+    class Meta:
+        model = ShowOccurrence
+        fields = ['scheduled_for', 'show']
+        read_only_fields = fields
+
+
 class ShowReminderSerializer(serializers.ModelSerializer):
     """Serializer for show reminders"""
     show_title = serializers.CharField(source='show.title', read_only=True)
@@ -0,0 +1,82 @@
+"""
+Django signals for keeping materialized show schedules and cached
+listings (TV guide, tag facets, tag registry) in sync.
+"""
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from .models import Show, ShowCancellation, Tag
+from .guide import GUIDE_FIELDS, invalidate_schedule
+from .tags import FACET_FIELDS, invalidate_tag_facets, invalidate_tags
+from .occurrences import regenerate_occurrences, remove_date, restore_date
+
+
+@receiver(post_save, sender=Show)
+def regenerate_show_occurrences(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """
+    Rebuild a show's ShowOccurrence rows when its schedule changes.
+    Saves that don't touch the schedule fields (title, status, counters...)
+    skip the rebuild entirely.
+    """
+    if raw:
+        return
+    
+    if not created and not instance.schedule_changed(update_fields):
+        # Listing changes (title, status...) still show up in the TV guide
+        if update_fields is None or GUIDE_FIELDS.intersection(update_fields):
+            invalidate_schedule()
+        return
+    
+    regenerate_occurrences([instance])
+    instance.snapshot_schedule()
+
+
+@receiver(post_save, sender=Show)
+def invalidate_show_facets(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Drop cached tag facet counts when a filterable show field changes"""
+    if not raw and (update_fields is None or FACET_FIELDS.intersection(update_fields)):
+        invalidate_tag_facets()
+
+
+@receiver(post_delete, sender=Show)
+def invalidate_deleted_show(sender, instance, **kwargs):
+    """Drop cached guide entries and facet counts for a deleted show"""
+    invalidate_schedule()
+    invalidate_tag_facets()
+
+
+@receiver(m2m_changed, sender=Show.tags.through)
+def invalidate_show_tags(sender, action, **kwargs):
+    """Tags are embedded in the TV guide and counted in tag facets"""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_schedule()
+        invalidate_tag_facets()
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_tag_registry(sender, raw=False, **kwargs):
+    """Reload the in-process tag registries; facets embed tag names too"""
+    if not raw:
+        invalidate_tags()
+        invalidate_tag_facets()
+
+
+@receiver(post_save, sender=ShowCancellation)
+def drop_cancelled_occurrence(sender, instance, created, raw=False, **kwargs):
+    """Remove the materialized airing for a newly cancelled date"""
+    if created and not raw:
+        remove_date(instance.show_id, instance.date)
+
+
+@receiver(post_delete, sender=ShowCancellation)
+def restore_cancelled_occurrence(sender, instance, origin=None, **kwargs):
+    """
+    Put the airing back when a cancellation is lifted.
+    Cascades from deleting the show itself are ignored.
+    """
+    if getattr(origin, 'model', type(origin)) is not ShowCancellation:
+        return
+    
+    show = Show.objects.filter(pk=instance.show_id).first()
+    if show is not None:
+        restore_date(show, instance.date)
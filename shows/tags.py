@@ -0,0 +1,201 @@
+"""
+Tag filtering and facet counts for shows.
+
+AND-filtering on tags is done with a single grouped subquery over the
+show/tag through table (HAVING COUNT(tag) = n) instead of one join per tag,
+so the outer show query never fans out and needs no DISTINCT.
+
+The tag table itself is small and mostly static (the preset list), so each
+process keeps a copy in `tag_registry`. Tag saves and deletes bump a
+namespace version shared by all processes (see api/cache.py); a process
+reloads its copy (one query) the next time it sees a new version.
+"""
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from django.utils.text import slugify
+
+from api.allocator import allocate_unique_many
+from api.cache import bump_namespace_version, get_namespace_version, namespaced_key
+from .models import Show, Tag
+
+
+TAGS_NAMESPACE = 'shows:tags'
+FACETS_NAMESPACE = 'shows:tag_facets'
+FACETS_CACHE_TIMEOUT = getattr(settings, 'SHOW_TAG_FACETS_CACHE_TIMEOUT', 300)
+
+# Show fields the list filters look at; saves limited to other fields
+# (counters, occurrences_until...) keep cached facet counts
+FACET_FIELDS = frozenset({
+    'status', 'title', 'description', 'creator', 'creator_id', 'is_recurring', 'day_of_week',
+})
+
+
+def parse_tag_ids(value):
+    """Parse a comma-separated ?tags= value into a sorted list of unique IDs"""
+    if not value:
+        return []
+    return sorted({int(tid) for tid in value.split(',') if tid.strip().isdigit()})
+
+
+def shows_with_all_tags(tag_ids):
+    """
+    Subquery of show IDs carrying every one of the given tags.
+
+    Usage: Show.objects.filter(pk__in=shows_with_all_tags([1, 2]))
+    """
+    tag_ids = set(tag_ids)
+    return Show.tags.through.objects.filter(
+        tag_id__in=tag_ids
+    ).values('show_id').annotate(
+        matched=Count('tag_id', distinct=True)
+    ).filter(matched=len(tag_ids)).values('show_id')
+
+
+def invalidate_tag_facets():
+    """Drop every cached facet count"""
+    bump_namespace_version(FACETS_NAMESPACE)
+
+
+def tag_facets(shows, exclude_tag_ids=(), cache_key_parts=None):
+    """
+    Count how many of the given shows carry each tag, in one aggregate query.
+
+    Args:
+        shows: Show queryset defining the current filter
+        exclude_tag_ids: Tags to leave out (usually the ones already selected)
+        cache_key_parts: Anything identifying the filter; results are cached
+            under it when given
+
+    Returns:
+        list: [{'id', 'name', 'slug', 'count'}] ordered by count, then name
+    """
+    key = None
+    if cache_key_parts is not None:
+        digest = hashlib.md5(repr(cache_key_parts).encode('utf-8')).hexdigest()
+        key = namespaced_key(FACETS_NAMESPACE, digest)
+        facets = cache.get(key)
+        if facets is not None:
+            return facets
+
+    rows = Show.tags.through.objects.filter(
+        show_id__in=shows.order_by().values('pk')
+    ).exclude(
+        tag_id__in=list(exclude_tag_ids)
+    ).values('tag_id', 'tag__name', 'tag__slug').annotate(
+        count=Count('show_id')
+    ).order_by('-count', 'tag__name')
+
+    facets = [
+        {'id': row['tag_id'], 'name': row['tag__name'], 'slug': row['tag__slug'], 'count': row['count']}
+        for row in rows
+    ]
+    if key is not None:
+        cache.set(key, facets, timeout=FACETS_CACHE_TIMEOUT)
+    return facets
+
+
+def invalidate_tags():
+    """
+    Make every process reload its tag registry.
+
+    Bumped right away for this process and again on commit, so a process
+    that reloads while the transaction is still open picks up the final state.
+    """
+    bump_namespace_version(TAGS_NAMESPACE)
+    transaction.on_commit(lambda: bump_namespace_version(TAGS_NAMESPACE))
+
+
+class TagRegistry:
+    """
+    Process-local copy of the tag table.
+
+    Lookups cost one query for the shared version; the table is only
+    re-read after a tag changed somewhere.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._tags = ()
+        self._by_name = {}
+
+    def _load(self):
+        version = get_namespace_version(TAGS_NAMESPACE)
+        if version != self._version:
+            tags = tuple(Tag.objects.order_by('name').values('id', 'name', 'slug'))
+            with self._lock:
+                self._tags = tags
+                self._by_name = {tag['name']: tag['id'] for tag in tags}
+                self._version = version
+        return self._tags, self._by_name
+
+    def all(self):
+        """Return every tag as {'id', 'name', 'slug'}, ordered by name"""
+        return self._load()[0]
+
+    def existing(self, tag_ids):
+        """Filter tag IDs down to the ones that exist, keeping order and dropping duplicates"""
+        known = {tag['id'] for tag in self.all()}
+        missing = set(tag_ids) - known
+        if missing:
+            # Possibly created without a version bump (bulk or raw writes):
+            # ask the table before rejecting, and reload the copy if so
+            found = set(Tag.objects.filter(pk__in=missing).values_list('pk', flat=True))
+            if found:
+                known |= found
+                with self._lock:
+                    self._version = None
+        return list(dict.fromkeys(tid for tid in tag_ids if tid in known))
+
+    def resolve(self, names, create=True):
+        """
+        Map tag names to IDs, creating missing tags in bulk.
+
+        Args:
+            names: Iterable of tag names (exact match, like Tag.name)
+            create: Create tags that don't exist yet
+
+        Returns:
+            tuple: ({name: id}, number of tags created)
+        """
+        names = set(names)
+        by_name = self._load()[1]
+        ids = {name: by_name[name] for name in names if name in by_name}
+        missing = names - ids.keys()
+        if not missing:
+            return ids, 0
+
+        # Created by another process since the last reload
+        ids.update(Tag.objects.filter(name__in=missing).values_list('name', 'id'))
+        missing = sorted(missing - ids.keys())
+        if not missing or not create:
+            return ids, 0
+
+        slugs = allocate_unique_many(Tag, 'slug', [slugify(name) or 'tag' for name in missing])
+        Tag.objects.bulk_create(
+            [Tag(name=name, slug=slug) for name, slug in zip(missing, slugs)],
+            ignore_conflicts=True
+        )
+        ids.update(Tag.objects.filter(name__in=missing).values_list('name', 'id'))
+
+        # A concurrent writer may have taken one of the allocated slugs
+        for name in missing:
+            if name not in ids:
+                ids[name] = Tag.objects.get_or_create(name=name)[0].pk
+
+        # bulk_create skips the post_save signal
+        invalidate_tags()
+        return ids, len(missing)
+
+    def ids_for(self, names, create=True):
+        """Return tag IDs for names in the given order, creating missing tags"""
+        ids, _ = self.resolve(names, create)
+        return list(dict.fromkeys(ids[name] for name in names if name in ids))
+
+
+tag_registry = TagRegistry()
@@ -1,3 +1,729 @@
-from django.test import TestCase
+"""
+Test suite for the shows app.
 
-# Create your tests here.
+Run with: python manage.py test shows
+"""
+
+import io
+import json
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from users.models import Comment, Like, Notification
+from .catalog import export_catalog, import_catalog, read_records, write_records
+from .guide import get_schedule
+from .models import Show, ShowCancellation, ShowEpisode, ShowReminder, Tag
+from .occurrences import extend_horizon, HORIZON_DAYS
+from .tags import tag_registry
+from .trending import update_hot_scores
+from .reminders import create_due_reminders, cancel_unconfirmed_reminders
+from .schedule import expand_airings, weekday_mask, WEEKDAYS_MASK, WEEKENDS_MASK, ALL_DAYS_MASK
+
+
+def make_show(pk, recurrence_type, day_of_week=None, scheduled_time=time(17, 0)):
+    """Build an unsaved recurring show"""
+    return Show(
+        pk=pk,
+        title=f'Show {pk}',
+        is_recurring=True,
+        recurrence_type=recurrence_type,
+        day_of_week=day_of_week,
+        scheduled_time=scheduled_time,
+        status='published',
+    )
+
+
+class ScheduleEngineTests(SimpleTestCase):
+    """Test the batch recurrence expansion engine"""
+
+    # 2026-01-05 is a Monday
+    MONDAY = date(2026, 1, 5)
+
+    def test_weekday_masks(self):
+        """Each recurrence type maps to the expected weekday bits"""
+        self.assertEqual(weekday_mask(make_show(1, 'DAILY')), ALL_DAYS_MASK)
+        self.assertEqual(weekday_mask(make_show(2, 'WEEKDAYS')), WEEKDAYS_MASK)
+        self.assertEqual(weekday_mask(make_show(3, 'WEEKENDS')), WEEKENDS_MASK)
+        self.assertEqual(weekday_mask(make_show(4, 'SPECIFIC_DAY', day_of_week=2)), 0b0000100)
+
+    def test_incomplete_schedule_never_airs(self):
+        """Non-recurring shows and shows without a time produce no airings"""
+        one_off = make_show(1, 'DAILY')
+        one_off.is_recurring = False
+        no_time = make_show(2, 'DAILY', scheduled_time=None)
+        missing_day = make_show(3, 'SPECIFIC_DAY')
+
+        self.assertEqual(expand_airings([one_off, no_time, missing_day], self.MONDAY, self.MONDAY + timedelta(days=6), {}), [])
+
+    def test_expand_week(self):
+        """A week-long window yields one airing per matching day, sorted"""
+        shows = [
+            make_show(1, 'DAILY', scheduled_time=time(9, 0)),
+            make_show(2, 'WEEKDAYS'),
+            make_show(3, 'WEEKENDS'),
+            make_show(4, 'SPECIFIC_DAY', day_of_week=4),
+        ]
+        airings = expand_airings(shows, self.MONDAY, self.MONDAY + timedelta(days=6), {})
+
+        counts = {}
+        for airing in airings:
+            counts[airing.show.pk] = counts.get(airing.show.pk, 0) + 1
+        self.assertEqual(counts, {1: 7, 2: 5, 3: 2, 4: 1})
+
+        scheduled = [airing.scheduled_for for airing in airings]
+        self.assertEqual(scheduled, sorted(scheduled))
+
+    def test_cancelled_dates_are_skipped(self):
+        """Dates in the cancellation mapping are excluded from expansion"""
+        show = make_show(1, 'DAILY')
+
+        airings = expand_airings([show], self.MONDAY, self.MONDAY + timedelta(days=1), {1: {self.MONDAY}})
+        self.assertEqual([a.scheduled_for.date() for a in airings], [self.MONDAY + timedelta(days=1)])
+
+    def test_datetime_window_bounds_are_inclusive(self):
+        """Datetime windows clip airings to the exact range, inclusive on both ends"""
+        show = make_show(1, 'DAILY', scheduled_time=time(17, 0))
+        airs_at = timezone.make_aware(datetime.combine(self.MONDAY, time(17, 0)))
+
+        self.assertEqual(len(expand_airings([show], airs_at, airs_at, {})), 1)
+        self.assertEqual(len(expand_airings([show], airs_at + timedelta(minutes=1), airs_at + timedelta(hours=1), {})), 0)
+        self.assertEqual(len(expand_airings([show], airs_at - timedelta(minutes=35), airs_at - timedelta(minutes=25), {})), 0)
+
+
+class ShowOccurrenceTests(TestCase):
+    """Test the materialized occurrence table"""
+
+    def setUp(self):
+        self.creator = get_user_model().objects.create_user(
+            username='creator', password='pass12345', role='creator'
+        )
+        self.show = Show.objects.create(
+            title='Daily Show',
+            description='Every day',
+            creator=self.creator,
+            is_recurring=True,
+            recurrence_type='DAILY',
+            scheduled_time=time(17, 0),
+            status='published',
+        )
+
+    def test_occurrences_created_on_save(self):
+        """A new recurring show is materialized across the horizon"""
+        count = self.show.occurrences.count()
+        self.assertIn(count, (HORIZON_DAYS, HORIZON_DAYS + 1))
+        self.assertIsNotNone(self.show.occurrences_until)
+
+    def test_non_schedule_save_keeps_rows(self):
+        """Saving unrelated fields does not rebuild occurrences"""
+        ids = set(self.show.occurrences.values_list('id', flat=True))
+
+        show = Show.objects.get(pk=self.show.pk)
+        show.title = 'Renamed'
+        show.save()
+
+        self.assertEqual(set(show.occurrences.values_list('id', flat=True)), ids)
+
+    def test_schedule_change_regenerates(self):
+        """Switching to a weekly schedule replaces the daily rows"""
+        show = Show.objects.get(pk=self.show.pk)
+        show.recurrence_type = 'SPECIFIC_DAY'
+        show.day_of_week = 2
+        show.save()
+
+        weekdays = {
+            timezone.localtime(dt).weekday()
+            for dt in show.occurrences.values_list('scheduled_for', flat=True)
+        }
+        self.assertEqual(weekdays, {2})
+
+    def test_cancellation_store(self):
+        """Cancelling a date drops its occurrence; lifting it restores the airing"""
+        first = self.show.occurrences.first().scheduled_for
+        day = timezone.localtime(first).date()
+
+        cancellation = ShowCancellation.objects.create(show=self.show, date=day)
+        self.assertFalse(self.show.occurrences.filter(scheduled_for=first).exists())
+        self.assertFalse(self.show.should_air_on_date(day))
+        self.assertTrue(self.show.should_air_on_date(day + timedelta(days=1)))
+
+        cancellation.delete()
+        self.assertTrue(self.show.occurrences.filter(scheduled_for=first).exists())
+
+    def test_respond_to_reminder_cancel(self):
+        """Cancelling via respond_to_reminder records a ShowCancellation"""
+        first = self.show.occurrences.first().scheduled_for
+        ShowReminder.objects.create(show=self.show, scheduled_for=first)
+        client = APIClient()
+        client.force_authenticate(self.creator)
+
+        response = client.post(
+            f'/api/shows/{self.show.slug}/respond_to_reminder/',
+            {'scheduled_for': first.isoformat(), 'response': 'cancelled'},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(
+            ShowCancellation.objects.filter(show=self.show, date=timezone.localtime(first).date()).exists()
+        )
+        self.assertFalse(self.show.occurrences.filter(scheduled_for=first).exists())
+
+    def test_show_delete_cascades(self):
+        """Deleting a show with cancellations does not resurrect occurrences"""
+        day = timezone.localtime(self.show.occurrences.first().scheduled_for).date()
+        ShowCancellation.objects.create(show=self.show, date=day)
+
+        self.show.delete()
+
+        self.assertFalse(ShowCancellation.objects.exists())
+
+    def test_extend_horizon(self):
+        """The nightly pass extends shows from their own watermark"""
+        later = timezone.now() + timedelta(days=3)
+        result = extend_horizon(now=later)
+
+        self.assertEqual(result['shows'], 1)
+        self.assertEqual(result['created'], 3)
+        last = self.show.occurrences.order_by('-scheduled_for').first().scheduled_for
+        self.assertGreater(last, later + timedelta(days=HORIZON_DAYS - 1))
+
+    def test_upcoming_instances_reads_occurrences(self):
+        """upcoming_instances lists the next 30 days from the occurrence table"""
+        client = APIClient()
+        client.force_authenticate(self.creator)
+
+        response = client.get(f'/api/shows/{self.show.slug}/upcoming_instances/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(len(response.data), (29, 30))
+        self.assertTrue(all(item['reminder_status'] is None for item in response.data))
+
+    def test_upcoming_instances_joins_reminders(self):
+        """Reminder statuses come from one query regardless of the horizon"""
+        first = self.show.occurrences.first().scheduled_for
+        ShowReminder.objects.create(show=self.show, scheduled_for=first, creator_response='CONFIRMED')
+        client = APIClient()
+        client.force_authenticate(self.creator)
+        url = f'/api/shows/{self.show.slug}/upcoming_instances/'
+
+        with self.assertNumQueries(4):
+            short = client.get(url, {'days': 7})
+        with self.assertNumQueries(4):
+            response = client.get(url, {'days': HORIZON_DAYS})
+
+        self.assertIn(len(short.data), (6, 7))
+        self.assertGreater(len(response.data), 50)
+        self.assertEqual(response.data[0]['reminder_status'], 'CONFIRMED')
+        self.assertEqual(client.get(url, {'days': HORIZON_DAYS + 1}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_upcoming_instances_etag(self):
+        """Polling with If-None-Match gets 304 until the schedule changes"""
+        client = APIClient()
+        client.force_authenticate(self.creator)
+        url = f'/api/shows/{self.show.slug}/upcoming_instances/'
+
+        etag = client.get(url)['ETag']
+        self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        day = timezone.localtime(self.show.occurrences.first().scheduled_for).date()
+        ShowCancellation.objects.create(show=self.show, date=day)
+        self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+
+class ScheduleGuideTests(TestCase):
+    """Test the cached TV guide endpoint"""
+
+    def setUp(self):
+        cache.clear()
+        self.creator = get_user_model().objects.create_user(
+            username='creator', password='pass12345', role='creator'
+        )
+        self.tag = Tag.objects.create(name='Crypto', slug='crypto')
+        self.morning = Show.objects.create(
+            title='Morning Show', creator=self.creator, is_recurring=True,
+            recurrence_type='DAILY', scheduled_time=time(9, 0), status='published',
+        )
+        self.evening = Show.objects.create(
+            title='Evening Show', creator=self.creator, is_recurring=True,
+            recurrence_type='DAILY', scheduled_time=time(20, 0), status='published',
+        )
+        self.evening.tags.add(self.tag)
+        Show.objects.create(
+            title='Draft Show', creator=self.creator, is_recurring=True,
+            recurrence_type='DAILY', scheduled_time=time(12, 0), status='draft',
+        )
+        tomorrow = timezone.localtime().date() + timedelta(days=1)
+        self.start = timezone.make_aware(datetime.combine(tomorrow, time.min))
+        self.end = self.start + timedelta(days=1)
+
+    def get_guide(self, **params):
+        params.setdefault('from', self.start.isoformat())
+        params.setdefault('to', self.end.isoformat())
+        return APIClient().get('/api/shows/schedule/', params)
+
+    def test_merges_published_airings(self):
+        """Airings of every published show are merged in time order"""
+        response = self.get_guide()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        titles = [item['show']['title'] for item in response.data['results']]
+        self.assertEqual(titles, ['Morning Show', 'Evening Show'])
+        evening = response.data['results'][1]['show']
+        self.assertEqual(evening['creator']['username'], 'creator')
+        self.assertEqual([tag['slug'] for tag in evening['tags']], ['crypto'])
+
+    def test_tag_filter(self):
+        """?tags= keeps only shows carrying every tag"""
+        response = self.get_guide(tags=str(self.tag.id))
+
+        self.assertEqual([item['show']['title'] for item in response.data['results']], ['Evening Show'])
+
+    def test_hour_buckets_are_cached(self):
+        """A repeated window is served from cache; only the shared version is read"""
+        get_schedule(self.start, self.end)
+
+        with self.assertNumQueries(1):
+            _, _, airings = get_schedule(self.start + timedelta(hours=2), self.end)
+        self.assertEqual(len(airings), 2)
+
+    def test_half_hour_offset_window(self):
+        """Windows sent in a non-whole-hour offset still find their airings"""
+        india = dt_timezone(timedelta(hours=5, minutes=30))
+        response = self.get_guide(**{
+            'from': self.start.astimezone(india).isoformat(),
+            'to': self.end.astimezone(india).isoformat(),
+        })
+        self.assertEqual(response.data['count'], 2)
+        # Cached buckets are shared with UTC-aligned requests
+        _, _, airings = get_schedule(self.start, self.end)
+        self.assertEqual(len(airings), 2)
+
+    def test_show_changes_invalidate(self):
+        """Renaming or rescheduling a show is visible immediately"""
+        get_schedule(self.start, self.end)
+
+        self.morning.title = 'Breakfast Show'
+        self.morning.save()
+        self.evening.scheduled_time = time(21, 0)
+        self.evening.save()
+
+        _, _, airings = get_schedule(self.start, self.end)
+        self.assertEqual(airings[0]['show']['title'], 'Breakfast Show')
+        self.assertEqual(timezone.localtime(datetime.fromisoformat(airings[1]['scheduled_for'])).hour, 21)
+
+    def test_counter_saves_keep_cache(self):
+        """Share counter updates do not invalidate the guide"""
+        get_schedule(self.start, self.end)
+
+        self.morning.share_count += 1
+        self.morning.save(update_fields=['share_count'])
+
+        with self.assertNumQueries(1):
+            get_schedule(self.start, self.end)
+
+    def test_invalid_window(self):
+        """Bad or oversized windows are rejected"""
+        self.assertEqual(self.get_guide(**{'from': 'soon'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            self.get_guide(to=(self.start - timedelta(hours=1)).isoformat()).status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(
+            self.get_guide(to=(self.start + timedelta(days=30)).isoformat()).status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+
+
+class TagFilterTests(TestCase):
+    """Test AND tag filtering and tag facet counts"""
+
+    def setUp(self):
+        cache.clear()
+        self.creator = get_user_model().objects.create_user(
+            username='creator', password='pass12345', role='creator'
+        )
+        self.crypto, self.defi, self.nft = [
+            Tag.objects.create(name=name, slug=name.lower()) for name in ('Crypto', 'DeFi', 'NFT')
+        ]
+        self.both = Show.objects.create(title='Both', creator=self.creator, status='published')
+        self.both.tags.add(self.crypto, self.defi, self.nft)
+        self.crypto_only = Show.objects.create(title='Crypto Only', creator=self.creator, status='published')
+        self.crypto_only.tags.add(self.crypto, self.nft)
+        draft = Show.objects.create(title='Draft', creator=self.creator, status='draft')
+        draft.tags.add(self.crypto, self.defi)
+        self.client = APIClient()
+
+    def test_and_filter(self):
+        """?tags= returns shows carrying every tag, once each"""
+        response = self.client.get('/api/shows/', {'tags': f'{self.crypto.id},{self.defi.id},{self.nft.id}'})
+        self.assertEqual([show['title'] for show in response.data['results']], ['Both'])
+
+        response = self.client.get('/api/shows/', {'tags': f'{self.crypto.id},{self.nft.id}'})
+        self.assertEqual({show['title'] for show in response.data['results']}, {'Both', 'Crypto Only'})
+        self.assertEqual(response.data['count'], 2)
+
+    def test_facets_for_current_filter(self):
+        """Facets count published shows per remaining tag"""
+        response = self.client.get('/api/shows/tag_facets/', {'tags': str(self.crypto.id)})
+
+        self.assertEqual(
+            [(facet['slug'], facet['count']) for facet in response.data],
+            [('nft', 2), ('defi', 1)]
+        )
+
+    def test_facets_are_cached_and_invalidated(self):
+        """Repeated facet requests hit the cache until tags change"""
+        self.client.get('/api/shows/tag_facets/')
+        with self.assertNumQueries(1):
+            self.client.get('/api/shows/tag_facets/')
+
+        self.crypto_only.tags.add(self.defi)
+        response = self.client.get('/api/shows/tag_facets/')
+        counts = {facet['slug']: facet['count'] for facet in response.data}
+        self.assertEqual(counts, {'crypto': 2, 'defi': 2, 'nft': 2})
+
+
+class TrendingTests(TestCase):
+    """Test incremental hot scores and the trending endpoint"""
+
+    def setUp(self):
+        self.creator = get_user_model().objects.create_user(
+            username='trend', password='pass12345', role='creator'
+        )
+        self.fans = [
+            get_user_model().objects.create_user(username=f'fan{n}', password='pass12345') for n in range(3)
+        ]
+        self.liked, self.discussed, self.quiet = [
+            Show.objects.create(title=title, description='x', creator=self.creator, status='published')
+            for title in ('Liked', 'Discussed', 'Quiet')
+        ]
+        self.now = timezone.now() + timedelta(minutes=5)
+
+    def trending_titles(self, **params):
+        response = APIClient().get('/api/shows/trending/', params)
+        return [show['title'] for show in response.data['results']]
+
+    def test_scores_rank_weighted_activity(self):
+        """Comments and shares weigh more than likes"""
+        for fan in self.fans:
+            Like.objects.create(user=fan, content_object=self.liked)
+        Comment.objects.create(user=self.fans[0], content_object=self.discussed, text='!')
+        Show.objects.filter(pk=self.discussed.pk).update(share_count=2)
+
+        update_hot_scores(now=self.now)
+
+        self.assertEqual(self.trending_titles(), ['Discussed', 'Liked', 'Quiet'])
+        response = APIClient().get('/api/shows/', {'ordering': '-hot'})
+        self.assertEqual([show['title'] for show in response.data['results']], ['Discussed', 'Liked', 'Quiet'])
+
+    def test_hot_ties_are_newest_first(self):
+        """Equal scores fall back to -id, so pages are stable"""
+        Show.objects.update(hot_score=1.0)
+        response = APIClient().get('/api/shows/', {'ordering': '-hot'})
+        self.assertEqual([show['title'] for show in response.data['results']], ['Quiet', 'Discussed', 'Liked'])
+
+    def test_updates_are_incremental_and_decay(self):
+        """Later runs only add new activity, and recent activity outweighs old"""
+        for fan in self.fans:
+            Like.objects.create(user=fan, content_object=self.liked)
+        update_hot_scores(now=self.now)
+        scores = dict(Show.objects.values_list('pk', 'hot_score'))
+
+        # Nothing new: scores stay put (already-counted likes aren't re-added)
+        update_hot_scores(now=self.now + timedelta(minutes=10))
+        self.assertEqual(dict(Show.objects.values_list('pk', 'hot_score')), scores)
+
+        # Two likes two half-lives later beat three old ones
+        later = self.now + timedelta(days=2)
+        for fan in self.fans[:2]:
+            Like.objects.create(user=fan, content_object=self.quiet)
+        Like.objects.filter(object_id=self.quiet.pk).update(created_at=later - timedelta(minutes=1))
+        update_hot_scores(now=later + timedelta(minutes=5))
+
+        self.assertEqual(self.trending_titles()[0], 'Quiet')
+
+
+class EpisodeEmbeddingTests(TestCase):
+    """Test bounded episode embedding and keyset-paginated episode lists"""
+
+    def setUp(self):
+        self.creator = get_user_model().objects.create_user(
+            username='daily', password='pass12345', role='creator'
+        )
+        self.show = Show.objects.create(
+            title='Daily Show', description='x', creator=self.creator, status='published'
+        )
+        start = date(2025, 1, 1)
+        ShowEpisode.objects.bulk_create([
+            ShowEpisode(show=self.show, episode_number=n, title=f'Ep {n}', air_date=start + timedelta(days=n // 2))
+            for n in range(1, 13)
+        ])
+        self.client = APIClient()
+
+    def test_detail_embeds_recent_episodes(self):
+        """Detail shows the newest episodes and a link to the next page"""
+        response = self.client.get(f'/api/shows/{self.show.slug}/')
+
+        self.assertEqual([ep['episode_number'] for ep in response.data['episodes']], [12, 11, 10, 9, 8])
+        self.assertIn(f'show={self.show.pk}', response.data['episodes_next'])
+
+        # Follow the cursor across pages with tied air dates
+        numbers = []
+        url = response.data['episodes_next'] + '&page_size=3'
+        while url:
+            page = self.client.get(url).data
+            numbers.extend(ep['episode_number'] for ep in page['results'])
+            url = page['next']
+        self.assertEqual(numbers, [7, 6, 5, 4, 3, 2, 1])
+
+        self.assertEqual(self.client.get('/api/episodes/', {'show': self.show.pk, 'cursor': '!!'}).status_code, 404)
+
+    def test_liked_shows_prefetch_episodes(self):
+        """Liked shows embed bounded episodes without a query per show"""
+        other = Show.objects.create(title='Other', description='x', creator=self.creator, status='published')
+        for show in (self.show, other):
+            Like.objects.create(user=self.creator, content_object=show)
+
+        # user, shows + creators, tags, guests, episodes, pending shares
+        with self.assertNumQueries(6):
+            response = self.client.get(f'/api/users/{self.creator.pk}/liked_shows/')
+
+        by_title = {show['title']: show for show in response.data}
+        self.assertEqual(len(by_title['Daily Show']['episodes']), 5)
+        self.assertEqual((by_title['Other']['episodes'], by_title['Other']['episodes_next']), ([], None))
+
+
+class TagRegistryTests(TestCase):
+    """Test the in-process tag registry and batched tag assignment"""
+
+    def setUp(self):
+        cache.clear()
+        self.creator = get_user_model().objects.create_user(
+            username='tagger', password='pass12345', role='creator'
+        )
+        self.bitcoin = Tag.objects.create(name='Bitcoin')
+        self.defi = Tag.objects.create(name='DeFi')
+        self.client = APIClient()
+        self.client.force_authenticate(self.creator)
+
+    def test_list_served_from_memory(self):
+        """Only the first request after a tag change reads the table"""
+        self.client.get('/api/tags/')
+        with self.assertNumQueries(1):  # the shared tag version
+            response = self.client.get('/api/tags/', {'search': 'de'})
+        self.assertEqual([tag['name'] for tag in response.data['results']], ['DeFi'])
+
+        response = self.client.get('/api/tags/', {'ordering': '-name'})
+        self.assertEqual([tag['name'] for tag in response.data['results']], ['DeFi', 'Bitcoin'])
+
+        self.defi.delete()
+        Tag.objects.create(name='NFTs')
+        response = self.client.get('/api/tags/')
+        self.assertEqual([tag['name'] for tag in response.data['results']], ['Bitcoin', 'NFTs'])
+
+    def test_unseen_tag_is_validated_against_table(self):
+        """A tag the registry hasn't seen yet is found in the table, not rejected"""
+        tag_registry.all()
+        Tag.objects.bulk_create([Tag(name='Ordinals', slug='ordinals')])  # no signal, no version bump
+        ordinals = Tag.objects.get(name='Ordinals')
+
+        response = self.client.post('/api/shows/', {'title': 'Inscriptions', 'description': 'Sats', 'tag_ids': [ordinals.pk]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post('/api/shows/', {'title': 'Ghosts', 'description': 'Boo', 'tag_ids': [ordinals.pk + 100]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('Ordinals', [tag['name'] for tag in tag_registry.all()])
+
+    def test_names_resolve_in_one_batch(self):
+        """Known names cost no query; missing ones are created together"""
+        self.assertEqual(tag_registry.ids_for(['DeFi', 'Bitcoin', 'DeFi']), [self.defi.pk, self.bitcoin.pk])
+
+        ids, created = tag_registry.resolve(['Bitcoin', 'Web3', 'Art & Design'])
+        self.assertEqual(created, 2)
+        self.assertEqual(Tag.objects.get(name='Art & Design').slug, 'art-design')
+        self.assertEqual(ids['Web3'], Tag.objects.get(name='Web3').pk)
+        self.assertIn('Web3', [tag['name'] for tag in tag_registry.all()])
+
+    def test_show_tags_set_in_bulk(self):
+        """Create/update link tags with bulk inserts and only touch changed links"""
+        response = self.client.post('/api/shows/', {
+            'title': 'Tagged', 'description': 'x',
+            'tag_ids': [self.bitcoin.pk], 'tag_names': ['DeFi', 'Stacks'],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        show = Show.objects.get(title='Tagged')
+        self.assertEqual(sorted(show.tags.values_list('name', flat=True)), ['Bitcoin', 'DeFi', 'Stacks'])
+
+        response = self.client.patch(f'/api/shows/{show.slug}/', {'tag_names': ['DeFi', 'Art']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(show.tags.values_list('name', flat=True)), ['Art', 'DeFi'])
+
+        response = self.client.patch(f'/api/shows/{show.slug}/', {'tag_ids': [999]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CatalogImportExportTests(TestCase):
+    """Test bulk import/export of shows, tags and episodes"""
+
+    def setUp(self):
+        self.creator = get_user_model().objects.create_user(username='host', password='pass12345', role='creator')
+        Tag.objects.create(name='Bitcoin')
+        Show.objects.create(title='Morning Call', description='Existing', creator=self.creator)
+
+    def lines(self, *records):
+        return io.StringIO('\n'.join(json.dumps(record) for record in records) + '\n')
+
+    def test_import_in_bulk(self):
+        """Tags, slugs and creators resolve per chunk; rows insert with bulk_create"""
+        records = self.lines(
+            {'title': 'Morning Call', 'description': 'a', 'creator': 'host', 'tags': ['Bitcoin', 'DeFi'],
+             'status': 'published', 'episodes': [
+                 {'episode_number': 1, 'title': 'Pilot', 'air_date': '2025-01-06'},
+                 {'episode_number': 2, 'title': 'Two', 'air_date': '2025-01-13'},
+             ]},
+            {'title': 'Morning Call', 'description': 'b', 'creator': 'host', 'tags': ['DeFi'],
+             'is_recurring': True, 'recurrence_type': 'DAILY', 'scheduled_time': '09:00'},
+        )
+
+        stats = import_catalog(read_records(records, 'jsonl'))
+
+        self.assertEqual((stats['shows'], stats['episodes'], stats['tags_created']), (2, 2, 1))
+        self.assertEqual(stats['errors'], [])
+        self.assertEqual(
+            sorted(Show.objects.values_list('slug', flat=True)),
+            ['morning-call', 'morning-call-1', 'morning-call-2']
+        )
+        imported = Show.objects.get(slug='morning-call-1')
+        self.assertEqual(sorted(imported.tags.values_list('name', flat=True)), ['Bitcoin', 'DeFi'])
+        self.assertEqual(imported.episodes.count(), 2)
+        self.assertTrue(Show.objects.get(slug='morning-call-2').occurrences.exists())
+
+    def test_invalid_rows_are_reported(self):
+        """Bad rows are skipped with their line numbers; valid rows still import"""
+        records = io.StringIO(
+            '{"title": "Ok", "description": "x", "creator": "host"}\n'
+            'not json\n'
+            '{"title": "No creator", "description": "x", "creator": "nobody"}\n'
+            '{"title": "Dup", "description": "x", "creator": "host", "episodes": ['
+            '{"episode_number": 1, "title": "a", "air_date": "2025-01-01"},'
+            '{"episode_number": 1, "title": "b", "air_date": "2025-01-02"}]}\n'
+        )
+
+        stats = import_catalog(read_records(records, 'jsonl'), chunk_size=2)
+
+        self.assertEqual(stats['shows'], 1)
+        self.assertEqual(sorted(line for line, _ in stats['errors']), [2, 3, 4])
+        self.assertFalse(Show.objects.filter(title='No creator').exists())
+
+    def test_errors_are_counted_not_accumulated(self):
+        """Only the first max_errors are kept; on_error still sees every one"""
+        records = io.StringIO('not json\n' * 5)
+        seen = []
+
+        stats = import_catalog(
+            read_records(records, 'jsonl'), max_errors=2, on_error=lambda line, error: seen.append(line)
+        )
+
+        self.assertEqual((stats['error_count'], len(stats['errors'])), (5, 2))
+        self.assertEqual(seen, [1, 2, 3, 4, 5])
+
+    def test_round_trip(self):
+        """Exported files import back unchanged, in JSONL and CSV"""
+        show = Show.objects.get()
+        show.tags.add(Tag.objects.get())
+        ShowEpisode.objects.create(show=show, episode_number=1, title='Pilot', air_date=date(2025, 1, 6))
+
+        for fmt in ('jsonl', 'csv'):
+            output = io.StringIO()
+            with self.assertNumQueries(4):  # shows, tags, episodes, end of keyset
+                write_records(output, export_catalog(Show.objects.all(), chunk_size=10), fmt)
+            output.seek(0)
+
+            stats = import_catalog(read_records(output, fmt))
+
+            self.assertEqual((stats['shows'], stats['errors']), (1, []))
+            copy = Show.objects.order_by('-pk').first()
+            self.assertEqual(copy.title, 'Morning Call')
+            self.assertEqual(list(copy.tags.values_list('name', flat=True)), ['Bitcoin'])
+            self.assertEqual(list(copy.episodes.values_list('title', flat=True)), ['Pilot'])
+            copy.delete()
+
+
+class ReminderTests(TestCase):
+    """Test set-based reminder processing"""
+
+    def setUp(self):
+        self.creator = get_user_model().objects.create_user(
+            username='creator', password='pass12345', role='creator'
+        )
+        self.shows = [
+            Show.objects.create(
+                title=f'Show {i}',
+                description='Recurring',
+                creator=self.creator,
+                is_recurring=True,
+                recurrence_type='DAILY',
+                scheduled_time=time(17, 0),
+                status='published' if i < 3 else 'draft',
+            )
+            for i in range(4)
+        ]
+        airs_at = self.shows[0].occurrences.first().scheduled_for
+        self.now = airs_at - timedelta(minutes=30)
+
+    def test_creates_reminders_for_due_published_shows(self):
+        """Every published show airing in the window gets one reminder and notification"""
+        created = create_due_reminders(now=self.now)
+
+        self.assertEqual(len(created), 3)
+        self.assertEqual(ShowReminder.objects.count(), 3)
+        self.assertEqual(
+            Notification.objects.filter(recipient=self.creator, notification_type='show_reminder').count(),
+            3
+        )
+
+    def test_rerun_is_idempotent(self):
+        """A second run in the same window creates nothing new"""
+        create_due_reminders(now=self.now)
+        created = create_due_reminders(now=self.now + timedelta(minutes=5))
+
+        self.assertEqual(created, [])
+        self.assertEqual(ShowReminder.objects.count(), 3)
+        self.assertEqual(Notification.objects.count(), 3)
+
+    def test_nothing_due_outside_window(self):
+        """Shows more than 35 minutes away are not reminded"""
+        self.assertEqual(create_due_reminders(now=self.now - timedelta(minutes=30)), [])
+
+    def test_auto_cancel_drains_backlog_in_chunks(self):
+        """Pending reminders past their time are cancelled in bulk, chunk by chunk"""
+        create_due_reminders(now=self.now)
+        Notification.objects.all().delete()
+        ShowReminder.objects.filter(show=self.shows[0]).update(creator_response='CONFIRMED')
+
+        result = cancel_unconfirmed_reminders(now=self.now + timedelta(hours=1), chunk_size=1)
+
+        self.assertEqual(result['cancelled'], 2)
+        self.assertEqual(result['chunks'], 2)
+        self.assertEqual(ShowReminder.objects.filter(creator_response='CANCELLED').count(), 2)
+        self.assertEqual(Notification.objects.filter(notification_type='show_cancelled').count(), 2)
+
+        airs_on = timezone.localtime(self.now + timedelta(minutes=30)).date()
+        self.assertEqual(
+            set(ShowCancellation.objects.values_list('show_id', 'date')),
+            {(self.shows[1].pk, airs_on), (self.shows[2].pk, airs_on)}
+        )
+
+    def test_auto_cancel_ignores_future_reminders(self):
+        """Reminders for shows that haven't started yet stay pending"""
+        create_due_reminders(now=self.now)
+
+        result = cancel_unconfirmed_reminders(now=self.now)
+
+        self.assertEqual(result['cancelled'], 0)
+        self.assertEqual(ShowReminder.objects.filter(creator_response='PENDING').count(), 3)
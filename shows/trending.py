@@ -0,0 +1,137 @@
+"""
+Time-decayed "hot" scores for shows.
+
+Every engagement event (like, comment, share, follow of the creator, and
+the show's creation itself) contributes `weight * 2 ** (age / half_life)`
+relative to a fixed epoch. Stored as a log, the sum never needs to be
+decayed in place: newer events simply carry larger exponents, and because
+every show decays at the same rate the ordering by `hot_score` is the same
+as ordering by the decayed score at any moment.
+
+That makes the score incremental. update_hot_scores() only reads activity
+since its last run (a range scan on the created_at indexes) and folds it
+into the stored value with log-sum-exp; old Like rows are never rescanned.
+Shares have no timestamps, so the delta of share_count since the last run
+(`scored_share_count`) counts as shares at run time. Unlikes and deleted
+comments are not subtracted - they fall away with the decay.
+"""
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from api.models import JobCheckpoint
+from users.models import Comment, Follow, Like
+from .models import Show
+
+
+CHECKPOINT = 'shows:hot_score'
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+HALF_LIFE = timedelta(hours=getattr(settings, 'SHOW_HOT_HALF_LIFE_HOURS', 24))
+WEIGHTS = getattr(settings, 'SHOW_HOT_WEIGHTS', {
+    'created': 1.0,
+    'like': 1.0,
+    'comment': 2.0,
+    'share': 3.0,
+    'follow': 1.0,
+})
+# Activity older than this is negligible; the first run starts here
+BACKFILL = timedelta(days=getattr(settings, 'SHOW_HOT_BACKFILL_DAYS', 30))
+# Rows committed late can carry a created_at slightly in the past
+LAG = timedelta(seconds=60)
+
+_RATE = math.log(2) / HALF_LIFE.total_seconds()
+
+
+def event_score(weight, at):
+    """Log-space contribution of one event of `weight` at time `at`"""
+    return math.log(weight) + (at - EPOCH).total_seconds() * _RATE
+
+
+def log_add(a, b):
+    """log(exp(a) + exp(b)) without overflow"""
+    if a is None:
+        return b
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+
+def _collect(since, until):
+    """Log-space score of the activity in (since, until], per show ID"""
+    scores = defaultdict(lambda: None)
+
+    def add(show_id, weight, at):
+        scores[show_id] = log_add(scores[show_id], event_score(weight, at))
+
+    show_type = ContentType.objects.get_for_model(Show)
+    for model, kind in ((Like, 'like'), (Comment, 'comment')):
+        rows = model.objects.filter(
+            content_type=show_type, created_at__gt=since, created_at__lte=until
+        ).values_list('object_id', 'created_at')
+        for show_id, at in rows.iterator(chunk_size=2000):
+            add(show_id, WEIGHTS[kind], at)
+
+    for show_id, at in Show.objects.filter(created_at__gt=since, created_at__lte=until).values_list('pk', 'created_at'):
+        add(show_id, WEIGHTS['created'], at)
+
+    # A follow counts for every show of the followed creator
+    follows = defaultdict(list)
+    rows = Follow.objects.filter(created_at__gt=since, created_at__lte=until).values_list('following_id', 'created_at')
+    for creator_id, at in rows.iterator(chunk_size=2000):
+        follows[creator_id].append(at)
+    if follows:
+        for show_id, creator_id in Show.objects.filter(creator_id__in=follows).values_list('pk', 'creator_id'):
+            for at in follows[creator_id]:
+                add(show_id, WEIGHTS['follow'], at)
+
+    return scores
+
+
+def update_hot_scores(now=None, chunk_size=500):
+    """
+    Fold the activity since the last run into Show.hot_score.
+
+    Returns:
+        dict: shows updated and the scored window
+    """
+    until = (now or timezone.now()) - LAG
+    since = JobCheckpoint.get(CHECKPOINT, default=until - BACKFILL)
+    if until <= since:
+        return {'shows': 0, 'since': since, 'until': until}
+
+    scores = _collect(since, until)
+    shares = {
+        show_id: (count, count - scored)
+        for show_id, count, scored in Show.objects.filter(
+            share_count__gt=F('scored_share_count')
+        ).values_list('pk', 'share_count', 'scored_share_count')
+    }
+
+    show_ids = sorted(set(scores) | set(shares))
+    with transaction.atomic():
+        for start in range(0, len(show_ids), chunk_size):
+            chunk = show_ids[start:start + chunk_size]
+            current = dict(Show.objects.select_for_update().filter(pk__in=chunk).values_list('pk', 'hot_score'))
+            scored = []
+            shared = []
+            for show_id in chunk:
+                if show_id not in current:
+                    continue  # deleted since
+                show = Show(pk=show_id, hot_score=log_add(scores[show_id], current[show_id]))
+                if show_id in shares:
+                    count, delta = shares[show_id]
+                    show.hot_score = log_add(show.hot_score, event_score(WEIGHTS['share'] * delta, until))
+                    show.scored_share_count = count
+                    shared.append(show)
+                else:
+                    scored.append(show)
+            Show.objects.bulk_update(scored, ['hot_score'])
+            Show.objects.bulk_update(shared, ['hot_score', 'scored_share_count'])
+        JobCheckpoint.advance(CHECKPOINT, until)
+
+    return {'shows': len(show_ids), 'since': since, 'until': until}
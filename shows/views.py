@@ -2,17 +2,63 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Count, Q
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from django.utils import timezone
-from datetime import timedelta, datetime
-from .models import Show, ShowEpisode, Tag, ShowReminder, GuestRequest
+from django.utils.dateparse import parse_date, parse_datetime
+from django.db.models import F
+from datetime import timedelta, datetime, time
+import hashlib
+import json
+from .models import Show, ShowEpisode, Tag, ShowReminder, ShowCancellation, GuestRequest
 from users.models import Notification
 from .serializers import (
     ShowSerializer, ShowListSerializer, ShowCreateSerializer,
     ShowEpisodeSerializer, TagSerializer, ShowReminderSerializer,
     GuestRequestSerializer, GuestRequestCreateSerializer, GuestRequestListSerializer
 )
+from api.counters import increment, with_pending
 from api.permissions import IsCreatorOrReadOnly
+from api.search.filters import FullTextSearchFilter
+from api.sparse import SparseFieldsViewMixin
+from .episodes import EpisodeKeysetPagination, recent_episodes_prefetch
+from .guide import MAX_WINDOW, get_schedule
+from .tags import parse_tag_ids, shows_with_all_tags, tag_facets, tag_registry
+from .occurrences import HORIZON_DAYS
+
+
+UPCOMING_INSTANCES_DEFAULT_DAYS = 30
+
+
+class ShowOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter that ends every ordering with `-id`, so rows tied on the
+    requested key (equal hot scores, same title...) come back newest first
+    in a stable order and pages neither repeat nor skip them.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering and not {'id', '-id', 'pk', '-pk'} & set(ordering):
+            ordering = [*ordering, '-id']
+        return ordering
+
+
+def parse_window_param(value, end_of_day=False):
+    """
+    Parse a ?from= / ?to= value: an ISO datetime or a plain date.
+    Dates mean the start of that day (or its end for `to`).
+    Raises ValueError for anything else.
+    """
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        parsed = datetime.combine(day, time.max if end_of_day else time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
 
 
 class TagViewSet(viewsets.ReadOnlyModelViewSet):
@@ -27,10 +73,33 @@ class TagViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = TagSerializer
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['name']
+    ordering_fields = ['id', 'name', 'slug']
     ordering = ['name']
+    
+    def list(self, request, *args, **kwargs):
+        """
+        Serve the list from the in-process tag registry (no query unless a
+        tag changed); ?search= and ?ordering= behave like the DB filters.
+        """
+        tags = list(tag_registry.all())
+        
+        terms = request.query_params.get(filters.SearchFilter.search_param, '').replace(',', ' ').split()
+        if terms:
+            terms = [term.lower() for term in terms]
+            tags = [tag for tag in tags if all(term in tag['name'].lower() for term in terms)]
+        
+        ordering = request.query_params.get(filters.OrderingFilter.ordering_param, '')
+        for field in reversed([field.strip() for field in ordering.split(',') if field.strip()]):
+            if field.lstrip('-') in self.ordering_fields:
+                tags.sort(key=lambda tag: tag[field.lstrip('-')], reverse=field.startswith('-'))
+        
+        page = self.paginate_queryset(tags)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(tags)
 
 
-class ShowViewSet(viewsets.ModelViewSet):
+class ShowViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for Show model with creator-only creation.
     
@@ -43,33 +112,39 @@ class ShowViewSet(viewsets.ModelViewSet):
     Custom actions:
     - upcoming_shows: GET /api/shows/upcoming_shows/
     - my_shows: GET /api/shows/my_shows/
+    - schedule: GET /api/shows/schedule/?from=&to=&tags=
+    - tag_facets: GET /api/shows/tag_facets/?tags=1,2 (plus any list filter)
+    - trending: GET /api/shows/trending/ (published shows by hot score)
     
     Filters:
     - ?search=query - Search title and description
     - ?tags=1,2,3 - Filter by tag IDs
     - ?creator=15 - Filter by creator ID
     - ?status=published - Filter by status
+    - ?fields=id,slug,title&expand=creator - Sparse fieldsets (list only)
+    - ?ordering=-hot - Trending first (see shows/trending.py)
     """
-    queryset = Show.objects.select_related('creator').prefetch_related('tags').annotate(
-        _like_count=Count('likes', distinct=True),
-        _comment_count=Count('comments', distinct=True)
-    ).prefetch_related('likes', 'comments')
+    queryset = Show.objects.select_related('creator').prefetch_related('tags')
     permission_classes = [IsCreatorOrReadOnly]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [ShowOrderingFilter, FullTextSearchFilter]
     search_fields = ['title', 'description']
-    ordering_fields = ['created_at', 'title', 'like_count']
+    ordering_fields = ['created_at', 'title', 'like_count', 'hot']
     ordering = ['-created_at']
     lookup_field = 'slug'  # Use slug instead of pk for URLs
+    DETAIL_ACTIONS = ('retrieve', 'upcoming_shows', 'my_shows')
+    sparse_actions = ('list', 'trending')
     
     def get_serializer_class(self):
-        if self.action == 'list':
+        if self.action in self.sparse_actions:
             return ShowListSerializer
         elif self.action in ['create', 'update', 'partial_update']:
             return ShowCreateSerializer
         return ShowSerializer
     
     def get_queryset(self):
-        queryset = super().get_queryset()
+        # `hot` orders by the precomputed score column (ties newest first,
+        # see ShowOrderingFilter)
+        queryset = super().get_queryset().alias(hot=F('hot_score'))
         
         # Filter by status
         status_param = self.request.query_params.get('status')
@@ -86,13 +161,10 @@ class ShowViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(creator_id=creator_id)
         
         # Filter by tags (comma-separated tag IDs)
-        tags_param = self.request.query_params.get('tags')
-        if tags_param:
-            tag_ids = [int(tid) for tid in tags_param.split(',') if tid.strip().isdigit()]
-            if tag_ids:
-                # Show must have ALL specified tags
-                for tag_id in tag_ids:
-                    queryset = queryset.filter(tags__id=tag_id)
+        tag_ids = parse_tag_ids(self.request.query_params.get('tags'))
+        if tag_ids:
+            # Show must have ALL specified tags (one grouped subquery, no joins)
+            queryset = queryset.filter(pk__in=shows_with_all_tags(tag_ids))
         
         # Filter by recurring
         is_recurring = self.request.query_params.get('is_recurring')
@@ -104,13 +176,26 @@ class ShowViewSet(viewsets.ModelViewSet):
         if day_of_week is not None:
             queryset = queryset.filter(day_of_week=int(day_of_week))
         
-        return queryset.distinct()  # Avoid duplicates from tag filtering
+        # Full ShowSerializer responses embed guests and the latest episodes;
+        # list rows embed guests (pruned again by ?fields=)
+        if self.action in self.DETAIL_ACTIONS:
+            queryset = queryset.prefetch_related('guests', recent_episodes_prefetch())
+        elif self.action in self.sparse_actions:
+            queryset = queryset.prefetch_related('guests')
+        
+        return queryset
     
     def get_serializer(self, *args, **kwargs):
         """Inject request context for proper image URL generation"""
         kwargs.setdefault('context', self.get_serializer_context())
         return super().get_serializer(*args, **kwargs)
     
+    def retrieve(self, request, *args, **kwargs):
+        """Show detail, including shares not yet flushed to share_count"""
+        show = self.get_object()
+        with_pending([show], 'share_count')
+        return Response(self.get_serializer(show).data)
+    
     def perform_create(self, serializer):
         """Set the creator to the current user"""
         serializer.save(creator=self.request.user)
@@ -118,7 +203,6 @@ class ShowViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def upcoming_shows(self, request):
         """Get all published recurring shows with counts"""
-        # get_queryset() already has annotations from base queryset
         shows = self.get_queryset().filter(
             is_recurring=True,
             status='published'
@@ -126,10 +210,90 @@ class ShowViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(shows, many=True)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'])
+    def trending(self, request):
+        """
+        Published shows by time-decayed engagement, hottest first.
+        Reads the (status, -hot_score, -id) index; scores are refreshed by
+        the update_hot_scores task.
+        """
+        shows = self.filter_queryset(
+            self.get_queryset().filter(status='published')
+        ).order_by('-hot_score', '-id')
+        page = self.paginate_queryset(shows)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+    
+    @action(detail=False, methods=['get'])
+    def schedule(self, request):
+        """
+        TV guide: every airing of every published show in a window, sorted.
+        
+        Query params:
+        - from: ISO datetime or date (default: now)
+        - to: ISO datetime or date (default: from + 24h)
+        - tags: comma-separated tag IDs; shows must have ALL of them
+        
+        The window is widened to whole hours; each hour is cached separately.
+        """
+        from_param = request.query_params.get('from')
+        to_param = request.query_params.get('to')
+        try:
+            start = parse_window_param(from_param) if from_param else timezone.now()
+            end = parse_window_param(to_param, end_of_day=True) if to_param else start + timedelta(days=1)
+        except ValueError as e:
+            return Response(
+                {'error': f'Invalid datetime format: {str(e)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if end <= start:
+            return Response(
+                {'error': '`to` must be after `from`'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if end - start > MAX_WINDOW:
+            return Response(
+                {'error': f'Window cannot exceed {MAX_WINDOW.days} days'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        tag_ids = parse_tag_ids(request.query_params.get('tags'))
+        
+        window_start, window_end, airings = get_schedule(
+            start, end, tag_ids, serializer_context=self.get_serializer_context()
+        )
+        return Response({
+            'from': window_start.isoformat(),
+            'to': window_end.isoformat(),
+            'count': len(airings),
+            'results': airings
+        })
+    
+    @action(detail=False, methods=['get'])
+    def tag_facets(self, request):
+        """
+        Facet counts for tag filtering.
+        
+        For the current list filter (search, tags, creator...), returns how many
+        published shows carry each tag that isn't already selected.
+        """
+        params = request.query_params
+        tag_ids = parse_tag_ids(params.get('tags'))
+        shows = self.filter_queryset(self.get_queryset()).filter(status='published')
+        
+        cache_key_parts = (
+            tuple(tag_ids),
+            params.get('search', ''),
+            params.get('creator', ''),
+            params.get('is_recurring', ''),
+            params.get('day_of_week', ''),
+        )
+        return Response(tag_facets(shows, exclude_tag_ids=tag_ids, cache_key_parts=cache_key_parts))
+    
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def my_shows(self, request):
         """Get current user's shows with counts"""
-        # get_queryset() already has annotations from base queryset
         shows = self.get_queryset().filter(creator=request.user)
         serializer = self.get_serializer(shows, many=True)
         return Response(serializer.data)
@@ -170,12 +334,12 @@ class ShowViewSet(viewsets.ModelViewSet):
             reminder.responded_at = timezone.now()
             reminder.save()
             
-            # If cancelled, add to cancelled_instances
+            # If cancelled, record the cancelled instance
             if response_type == 'cancelled':
-                date_str = scheduled_for.date().isoformat()
-                if date_str not in show.cancelled_instances:
-                    show.cancelled_instances.append(date_str)
-                    show.save(update_fields=['cancelled_instances'])
+                ShowCancellation.objects.get_or_create(
+                    show=show,
+                    date=timezone.localtime(scheduled_for).date()
+                )
                 
                 # Create confirmation notification
                 Notification.objects.create(
@@ -201,10 +365,10 @@ class ShowViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['post'], permission_classes=[])
     def track_share(self, request, slug=None):
-        """Track when a show is shared - increments share_count"""
+        """Track when a show is shared - buffers a share_count increment"""
         show = self.get_object()
-        show.share_count += 1
-        show.save(update_fields=['share_count'])
+        increment(show, 'share_count')
+        with_pending([show], 'share_count')
         
         return Response({
             'success': True,
@@ -213,7 +377,14 @@ class ShowViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
     def upcoming_instances(self, request, slug=None):
-        """Get upcoming instances of a recurring show"""
+        """
+        Get upcoming instances of a recurring show.
+        
+        Query params:
+        - days: horizon in days (default 30, max SHOW_OCCURRENCE_HORIZON_DAYS)
+        
+        Responses carry an ETag; polling clients sending If-None-Match get 304.
+        """
         show = self.get_object()
         
         if not show.is_recurring:
@@ -222,43 +393,54 @@ class ShowViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Calculate next 30 days of instances
-        instances = []
-        today = timezone.now().date()
+        try:
+            days = int(request.query_params.get('days', UPCOMING_INSTANCES_DEFAULT_DAYS))
+        except ValueError:
+            days = 0
+        if not 1 <= days <= HORIZON_DAYS:
+            return Response(
+                {'error': f'`days` must be between 1 and {HORIZON_DAYS}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        for i in range(30):
-            date = today + timedelta(days=i)
-            
-            # Check if this date matches the recurrence pattern
-            if show.should_air_on_date(date):
-                # Check if there's a reminder for this instance
-                scheduled_datetime = timezone.make_aware(
-                    datetime.combine(date, show.scheduled_time)
-                )
-                
-                try:
-                    reminder = ShowReminder.objects.get(
-                        show=show,
-                        scheduled_for=scheduled_datetime
-                    )
-                    reminder_status = reminder.creator_response
-                except ShowReminder.DoesNotExist:
-                    reminder_status = None
-                
-                instances.append({
-                    'date': date.isoformat(),
-                    'time': show.scheduled_time.isoformat(),
-                    'datetime': scheduled_datetime.isoformat(),
-                    'status': 'scheduled',
-                    'reminder_status': reminder_status
-                })
-        
-        return Response(instances)
+        # Instances come from the materialized occurrence table; reminders for
+        # the whole window are fetched in one query and joined in memory
+        today_start = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        window = (today_start, today_start + timedelta(days=days))
+        occurrences = show.occurrences.filter(
+            scheduled_for__gte=window[0],
+            scheduled_for__lt=window[1]
+        ).values_list('scheduled_for', flat=True)
+        reminder_statuses = dict(show.reminders.filter(
+            scheduled_for__gte=window[0],
+            scheduled_for__lt=window[1]
+        ).values_list('scheduled_for', 'creator_response'))
+        
+        instances = []
+        for scheduled_datetime in occurrences:
+            instances.append({
+                'date': timezone.localtime(scheduled_datetime).date().isoformat(),
+                'time': show.scheduled_time.isoformat(),
+                'datetime': scheduled_datetime.isoformat(),
+                'status': 'scheduled',
+                'reminder_status': reminder_statuses.get(scheduled_datetime)
+            })
+        
+        etag = quote_etag(hashlib.md5(json.dumps(instances).encode('utf-8')).hexdigest())
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        
+        response = Response(instances)
+        response['ETag'] = etag
+        return response
 
 
 class ShowEpisodeViewSet(viewsets.ModelViewSet):
     """
     ViewSet for ShowEpisode model.
+    
+    List: GET /api/episodes/?show=15 (newest first, follow `next` for older)
     """
     queryset = ShowEpisode.objects.select_related('show', 'show__creator')
     serializer_class = ShowEpisodeSerializer
@@ -267,6 +449,19 @@ class ShowEpisodeViewSet(viewsets.ModelViewSet):
     ordering_fields = ['air_date', 'episode_number']
     ordering = ['episode_number']
     
+    @property
+    def paginator(self):
+        """
+        ?show= lists are keyset-paginated newest first (the `episodes_next`
+        link of a show); other lists keep page numbers and ?ordering=
+        """
+        if not hasattr(self, '_paginator'):
+            if self.request.query_params.get('show'):
+                self._paginator = EpisodeKeysetPagination()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
+    
     def get_queryset(self):
         queryset = super().get_queryset()
         
@@ -0,0 +1,198 @@
+"""
+Denormalized engagement counters.
+
+Show, News and Event carry `like_count` and `comment_count` columns so list
+endpoints are plain selects instead of COUNT joins over the generic
+relations; User carries `follower_count`, `following_count` and
+`unread_notification_count`. The signal handlers in users.signals and the
+notification read paths keep them current with atomic F() updates; the
+reconcile_* functions recompute them in chunks to fix any drift (bulk
+deletes, raw SQL, failed transactions).
+"""
+from collections import Counter, defaultdict
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .push import push_unread_changed
+
+
+# (app_label, model) of every model with like_count/comment_count columns
+COUNTED_MODELS = [
+    ('shows', 'Show'),
+    ('news', 'News'),
+    ('events', 'Event'),
+]
+
+# Counter column maintained for each engagement model
+COUNTER_FIELDS = {
+    'Like': 'like_count',
+    'Comment': 'comment_count',
+}
+
+
+def counted_models():
+    return [apps.get_model(app_label, model_name) for app_label, model_name in COUNTED_MODELS]
+
+
+def bump_counter(instance, delta):
+    """
+    Atomically adjust the counter for a Like/Comment's target object.
+
+    Uses a single UPDATE with an F() expression, so concurrent likes never
+    lose increments. Decrements never go below zero.
+    """
+    field = COUNTER_FIELDS[type(instance).__name__]
+    model = instance.content_type.model_class()
+    if model is None or model not in counted_models():
+        return
+
+    queryset = model.objects.filter(pk=instance.object_id)
+    if delta < 0:
+        queryset = queryset.filter(**{f'{field}__gte': -delta})
+    queryset.update(**{field: F(field) + delta})
+
+
+def bump_follow_counts(follow, delta):
+    """
+    Atomically adjust following_count of the follower and follower_count of
+    the followed user. Rows are updated in primary key order so concurrent
+    mutual follows can't deadlock. Decrements never go below zero.
+    """
+    User = get_user_model()
+    to_pk = User._meta.pk.to_python
+    updates = sorted([
+        (to_pk(follow.follower_id), 'following_count'),
+        (to_pk(follow.following_id), 'follower_count'),
+    ])
+    for user_id, field in updates:
+        queryset = User.objects.filter(pk=user_id)
+        if delta < 0:
+            queryset = queryset.filter(**{f'{field}__gte': -delta})
+        queryset.update(**{field: F(field) + delta})
+
+
+def bump_unread_counts(recipient_ids, sign=1):
+    """
+    Adjust unread_notification_count by one per occurrence of each user ID
+    (e.g. the recipients of a bulk insert), with one UPDATE per distinct delta.
+    """
+    User = get_user_model()
+    counts = Counter(recipient_ids)
+    by_delta = defaultdict(list)
+    for user_id, count in counts.items():
+        by_delta[sign * count].append(user_id)
+    for delta, user_ids in by_delta.items():
+        queryset = User.objects.filter(pk__in=user_ids)
+        if delta < 0:
+            queryset = queryset.filter(unread_notification_count__gte=-delta)
+        queryset.update(unread_notification_count=F('unread_notification_count') + delta)
+    push_unread_changed(counts)
+
+
+def _count_subquery(model, content_type):
+    return Coalesce(Subquery(
+        model.objects.filter(content_type=content_type, object_id=OuterRef('pk'))
+        .order_by()
+        .values('object_id')
+        .annotate(total=Count('pk'))
+        .values('total')
+    ), 0)
+
+
+def _follow_count_subquery(column):
+    from .models import Follow
+
+    return Coalesce(Subquery(
+        Follow.objects.filter(**{column: OuterRef('pk')})
+        .order_by()
+        .values(column)
+        .annotate(total=Count('pk'))
+        .values('total')
+    ), 0)
+
+
+def _reconcile(model, actual, chunk_size):
+    """
+    Walk `model` in primary key chunks; each chunk finds rows whose counter
+    columns differ from the `actual` expressions and fixes them with one
+    UPDATE ... SET = (subquery), so concurrent signal updates are never
+    overwritten with a stale value.
+    """
+    annotations = {f'_actual_{field}': expression for field, expression in actual.items()}
+    matching = {field: F(f'_actual_{field}') for field in actual}
+
+    checked = 0
+    fixed = 0
+    last_pk = 0
+    while True:
+        ids = list(
+            model.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:chunk_size]
+        )
+        if not ids:
+            break
+        last_pk = ids[-1]
+        checked += len(ids)
+
+        drifted = list(
+            model.objects.filter(pk__in=ids)
+            .annotate(**annotations)
+            .exclude(**matching)
+            .values_list('pk', flat=True)
+        )
+        if drifted:
+            fixed += model.objects.filter(pk__in=drifted).update(**actual)
+
+    return {'checked': checked, 'fixed': fixed}
+
+
+def reconcile_counts(model, chunk_size=1000):
+    """
+    Recompute like/comment counters for every row of a model.
+
+    Returns:
+        dict: Number of rows checked and fixed
+    """
+    from .models import Like, Comment
+
+    content_type = ContentType.objects.get_for_model(model)
+    return _reconcile(model, {
+        'like_count': _count_subquery(Like, content_type),
+        'comment_count': _count_subquery(Comment, content_type),
+    }, chunk_size)
+
+
+def reconcile_follow_counts(chunk_size=1000):
+    """
+    Recompute follower/following counters for every user.
+
+    Returns:
+        dict: Number of users checked and fixed
+    """
+    return _reconcile(get_user_model(), {
+        'follower_count': _follow_count_subquery('following'),
+        'following_count': _follow_count_subquery('follower'),
+    }, chunk_size)
+
+
+def reconcile_unread_counts(chunk_size=1000):
+    """
+    Recompute unread_notification_count for every user from the
+    (recipient, is_read) index.
+
+    Returns:
+        dict: Number of users checked and fixed
+    """
+    from .models import Notification
+
+    unread = Coalesce(Subquery(
+        Notification.objects.filter(recipient=OuterRef('pk'), is_read=False)
+        .order_by()
+        .values('recipient')
+        .annotate(total=Count('pk'))
+        .values('total')
+    ), 0)
+    return _reconcile(get_user_model(), {'unread_notification_count': unread}, chunk_size)
@@ -0,0 +1,109 @@
+"""
+Cursor-paginated follower / following lists.
+
+Pages walk the (following, -created_at) and (follower, -created_at) indexes
+on Follow, so a creator with hundreds of thousands of followers costs the
+same per page as one with ten. Each row is a compact user projection, and
+`count` comes from the denormalized counters on User instead of COUNT(*).
+
+Response: {'count': n, 'next': url, 'previous': url, 'results': [...]}
+"""
+from collections import OrderedDict
+
+from django.contrib.auth import get_user_model
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+from .models import Follow
+
+User = get_user_model()
+
+
+class FollowCursorPagination(CursorPagination):
+    """Newest follows first; `count` is set by follow_page()"""
+    ordering = ('-created_at', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    count = None
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count'] = {'type': 'integer'}
+        return response_schema
+
+
+class FollowUserSerializer(serializers.ModelSerializer):
+    """Compact user projection for follow lists"""
+
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'display_name', 'profile_picture', 'is_verified']
+        read_only_fields = fields
+
+
+class FollowerSerializer(serializers.ModelSerializer):
+    """A follower of the listed user, and when they followed"""
+    user = FollowUserSerializer(source='follower', read_only=True)
+    followed_at = serializers.DateTimeField(source='created_at', read_only=True)
+
+    class Meta:
+        model = Follow
+        fields = ['user', 'followed_at']
+
+
+class FollowingSerializer(serializers.ModelSerializer):
+    """A user the listed user follows, and since when"""
+    user = FollowUserSerializer(source='following', read_only=True)
+    followed_at = serializers.DateTimeField(source='created_at', read_only=True)
+
+    class Meta:
+        model = Follow
+        fields = ['user', 'followed_at']
+
+
+# direction -> (column filtered on, user shown, counter on User, serializer)
+DIRECTIONS = {
+    'followers': ('following', 'follower', 'follower_count', FollowerSerializer),
+    'following': ('follower', 'following', 'following_count', FollowingSerializer),
+}
+
+
+def follow_page(request, user_id, direction):
+    """
+    Return a paginated Response with one page of a user's followers
+    (direction='followers') or of the users they follow ('following').
+    Two queries: the counter and the page.
+    """
+    filtered, shown, counter, serializer_class = DIRECTIONS[direction]
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        raise ValidationError({'user_id': 'A valid integer is required.'})
+
+    count = User.objects.filter(pk=user_id).values_list(counter, flat=True).first()
+    if count is None:
+        raise NotFound('User not found')
+
+    columns = [f'{shown}__{field}' for field in FollowUserSerializer.Meta.fields]
+    queryset = (
+        Follow.objects.filter(**{f'{filtered}_id': user_id})
+        .select_related(shown)
+        .only('id', 'created_at', shown, *columns)
+    )
+
+    paginator = FollowCursorPagination()
+    paginator.count = count
+    page = paginator.paginate_queryset(queryset, request)
+    serializer = serializer_class(page, many=True, context={'request': request})
+    return paginator.get_paginated_response(serializer.data)
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from users.counters import reconcile_unread_counts
+
+
+class Command(BaseCommand):
+    help = 'Reconcile unread_notification_count on users'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Users checked per query')
+
+    def handle(self, *args, **options):
+        result = reconcile_unread_counts(chunk_size=options['chunk_size'])
+        self.stdout.write(f"✅ users: {result['checked']} checked, {result['fixed']} fixed")
+        self.stdout.write(self.style.SUCCESS('✅ Unread counts reconciled!'))
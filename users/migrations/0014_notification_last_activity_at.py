@@ -0,0 +1,36 @@
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_last_activity(apps, schema_editor):
+    Notification = apps.get_model('users', 'Notification')
+    Notification.objects.update(last_activity_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0013_user_unread_notification_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(backfill_last_activity, migrations.RunPython.noop),
+        migrations.AlterModelOptions(
+            name='notification',
+            options={'ordering': ['-last_activity_at']},
+        ),
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='users_notif_recipie_458498_idx',
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', '-last_activity_at'], name='users_notif_recipie_2800a9_idx'),
+        ),
+    ]
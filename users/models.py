@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
 
 
 class User(AbstractUser):
@@ -52,6 +53,13 @@ class User(AbstractUser):
     # Verification
     is_verified = models.BooleanField(default=False)
     
+    # Denormalized follow counters (kept current by users.signals,
+    # see users.counters.reconcile_follow_counts)
+    follower_count = models.PositiveIntegerField(default=0, editable=False)
+    following_count = models.PositiveIntegerField(default=0, editable=False)
+    # Unread notifications, for the badge (users.counters.bump_unread_counts)
+    unread_notification_count = models.PositiveIntegerField(default=0, editable=False)
+    
     # Timestamps
     date_joined = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -70,16 +78,6 @@ class User(AbstractUser):
         """Check if user has creator role"""
         return self.role == 'creator'
     
-    @property
-    def follower_count(self):
-        """Number of users following this user"""
-        return self.followers.count()
-    
-    @property
-    def following_count(self):
-        """Number of users this user is following"""
-        return self.following.count()
-    
     def get_liked_shows(self):
         """
         Return all shows this user has liked.
@@ -119,6 +117,7 @@ class Like(models.Model):
         indexes = [
             models.Index(fields=['content_type', 'object_id']),
             models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['content_type', 'created_at']),
         ]
     
     def __str__(self):
@@ -160,6 +159,7 @@ class Comment(models.Model):
             models.Index(fields=['content_type', 'object_id', '-created_at']),
             models.Index(fields=['user', '-created_at']),
             models.Index(fields=['parent']),
+            models.Index(fields=['content_type', 'created_at']),
         ]
     
     def __str__(self):
@@ -193,6 +193,7 @@ class Follow(models.Model):
         indexes = [
             models.Index(fields=['follower', '-created_at']),
             models.Index(fields=['following', '-created_at']),
+            models.Index(fields=['created_at']),
         ]
     
     def __str__(self):
@@ -247,13 +248,22 @@ class Notification(models.Model):
     object_id = models.PositiveIntegerField(null=True, blank=True)
     content_object = GenericForeignKey('content_type', 'object_id')
     
+    # Coalesced notifications ("alice and 4 others liked your show"):
+    # `actor` is the latest actor, `actor_count` how many acted and
+    # `actor_sample` the IDs of the most recent few (see users.notifications)
+    actor_count = models.PositiveIntegerField(default=1)
+    actor_sample = models.JSONField(default=list, blank=True)
+    
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Moves forward whenever another actor is coalesced in, so busy
+    # notifications rise to the top of the list
+    last_activity_at = models.DateTimeField(default=timezone.now)
     
     class Meta:
-        ordering = ['-created_at']
+        ordering = ['-last_activity_at']
         indexes = [
-            models.Index(fields=['recipient', '-created_at']),
+            models.Index(fields=['recipient', '-last_activity_at']),
             models.Index(fields=['recipient', 'is_read']),
         ]
     
@@ -0,0 +1,287 @@
+"""
+Asynchronous, coalescing notifications for likes, comments and follows.
+
+Request handlers only call notify(), which queues a small event once the
+transaction commits. Delivery happens in the background:
+
+- with Celery (CELERY_BROKER_URL set), via the users.tasks.deliver_notifications task
+- otherwise on an in-process daemon thread that drains the queue in batches
+  (and is given LOCAL_FLUSH_SECONDS to finish when the process exits)
+- NOTIFICATION_BACKEND='sync' delivers at commit time (tests, scripts)
+
+deliver() resolves recipients for a whole batch at once (one query per
+target model instead of loading `content_object` per event) and folds
+events with the same recipient, type and target into one unread row
+created within NOTIFICATION_COALESCE_MINUTES: "alice and 4,999 others
+liked your show" is one row with `actor_count` 5000 and the latest few
+actors in `actor_sample`, and its `last_activity_at` moves up to the
+latest event so it rises to the top of the list. A repeat actor still in the sample isn't counted
+twice; older repeats may be, so `actor_count` is an upper bound.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from rest_framework.pagination import CursorPagination
+
+from .counters import bump_unread_counts
+from .models import Notification
+from .push import push_notifications
+
+logger = logging.getLogger(__name__)
+
+
+COALESCED_TYPES = ('like', 'comment', 'follow')
+COALESCE_WINDOW = timedelta(minutes=getattr(settings, 'NOTIFICATION_COALESCE_MINUTES', 60))
+ACTOR_SAMPLE_SIZE = 3
+LOCAL_BATCH_SIZE = 500
+LOCAL_FLUSH_SECONDS = getattr(settings, 'NOTIFICATION_FLUSH_SECONDS', 10)
+
+VERBS = {
+    'like': 'liked your {target}',
+    'comment': 'commented on your {target}',
+    'follow': 'started following you',
+}
+
+
+def notify(notification_type, actor_id, content_type_id=None, object_id=None, recipient_id=None):
+    """
+    Queue a notification event. Without `recipient_id` the recipient is the
+    creator of the target object; events with no recipient, or where the
+    actor is the recipient, are dropped on delivery.
+    """
+    event = {
+        'type': notification_type,
+        'actor': actor_id,
+        'recipient': recipient_id,
+        'content_type': content_type_id,
+        'object_id': object_id,
+    }
+    transaction.on_commit(lambda: enqueue([event]))
+
+
+def backend():
+    """Name of the delivery backend in use: 'celery', 'thread' or 'sync'"""
+    name = getattr(settings, 'NOTIFICATION_BACKEND', 'auto')
+    if name != 'auto':
+        return name
+    if getattr(settings, 'CELERY_BROKER_URL', None):
+        try:
+            import celery  # noqa: F401
+        except ImportError:
+            return 'thread'
+        return 'celery'
+    return 'thread'
+
+
+def enqueue(events):
+    """Hand events to the configured delivery backend"""
+    name = backend()
+    if name == 'sync':
+        deliver(events)
+    elif name == 'celery':
+        from .tasks import deliver_notifications
+        deliver_notifications.delay(events)
+    else:
+        local_queue.put(events)
+
+
+def _owner_field(model):
+    """FK of `model` holding the user to notify ('creator'), or None"""
+    try:
+        model._meta.get_field('creator')
+    except FieldDoesNotExist:
+        return None
+    return 'creator_id'
+
+
+def _resolve_recipients(events):
+    """Fill in missing recipients from the target objects, one query per model"""
+    targets = {}
+    for event in events:
+        if event['recipient'] is None and event['content_type'] is not None:
+            targets.setdefault(event['content_type'], set()).add(event['object_id'])
+
+    owners = {}
+    for content_type_id, object_ids in targets.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        field = _owner_field(model) if model is not None else None
+        if field is None:
+            continue
+        rows = model.objects.filter(pk__in=object_ids).values_list('pk', field)
+        owners.update(((content_type_id, pk), owner_id) for pk, owner_id in rows)
+
+    resolved = []
+    for event in events:
+        recipient = event['recipient']
+        if recipient is None:
+            recipient = owners.get((event['content_type'], event['object_id']))
+        if recipient is None or recipient == event['actor']:
+            continue
+        resolved.append(dict(event, recipient=recipient))
+    return resolved
+
+
+def _add_actor(notification, actor_id):
+    """Fold one actor into a coalesced notification"""
+    notification.actor_id = actor_id
+    if actor_id in notification.actor_sample:
+        notification.actor_sample.remove(actor_id)
+    else:
+        notification.actor_count += 1
+    notification.actor_sample = [actor_id] + notification.actor_sample[:ACTOR_SAMPLE_SIZE - 1]
+
+
+def deliver(events, now=None):
+    """
+    Create or coalesce notifications for a batch of events.
+
+    Returns:
+        dict: events delivered, rows created and rows coalesced into
+    """
+    now = now or timezone.now()
+    events = _resolve_recipients(events)
+    if not events:
+        return {'events': 0, 'created': 0, 'coalesced': 0}
+
+    groups = {}
+    for event in events:
+        key = (event['recipient'], event['type'], event['content_type'], event['object_id'])
+        groups.setdefault(key, []).append(event['actor'])
+
+    with transaction.atomic():
+        existing = {}
+        candidates = Notification.objects.select_for_update().filter(
+            recipient_id__in={key[0] for key in groups},
+            notification_type__in={key[1] for key in groups},
+            is_read=False,
+            created_at__gte=now - COALESCE_WINDOW,
+        ).order_by('created_at')
+        for notification in candidates:
+            key = (
+                notification.recipient_id, notification.notification_type,
+                notification.content_type_id, notification.object_id,
+            )
+            existing[key] = notification  # newest wins
+
+        created = []
+        coalesced = []
+        for key, actors in groups.items():
+            notification = existing.get(key)
+            if notification is None:
+                recipient_id, notification_type, content_type_id, object_id = key
+                notification = Notification(
+                    recipient_id=recipient_id,
+                    actor_id=actors[0],
+                    notification_type=notification_type,
+                    content_type_id=content_type_id,
+                    object_id=object_id,
+                    actor_sample=[actors[0]],
+                    last_activity_at=now,
+                )
+                created.append(notification)
+                actors = actors[1:]
+            else:
+                notification.last_activity_at = now
+                coalesced.append(notification)
+            for actor_id in actors:
+                _add_actor(notification, actor_id)
+
+        Notification.objects.bulk_create(created)
+        Notification.objects.bulk_update(coalesced, ['actor', 'actor_count', 'actor_sample', 'last_activity_at'])
+        bump_unread_counts(notification.recipient_id for notification in created)
+        push_notifications(created + coalesced)
+
+    return {'events': len(events), 'created': len(created), 'coalesced': len(coalesced)}
+
+
+class NotificationCursorPagination(CursorPagination):
+    """
+    Keyset pages over the (recipient, -last_activity_at) index: no COUNT(*)
+    and no OFFSET scan however far back the client pages.
+    """
+    ordering = ('-last_activity_at', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+def summary(notification):
+    """One-line text such as 'alice and 4,999 others liked your show'"""
+    who = notification.actor.username
+    others = notification.actor_count - 1
+    if others == 1:
+        who = f'{who} and 1 other'
+    elif others > 1:
+        who = f'{who} and {others:,} others'
+    verb = VERBS.get(notification.notification_type)
+    if verb is None:
+        return f'{who}: {notification.get_notification_type_display()}'
+    target = ''
+    if notification.content_type_id:
+        target = ContentType.objects.get_for_id(notification.content_type_id).model
+    return f'{who} {verb.format(target=target)}'
+
+
+class LocalQueue:
+    """
+    In-process stand-in for Celery: a daemon thread that delivers queued
+    events in batches. flush() runs at exit so queued events are delivered
+    before the thread is killed; only events still queued after
+    LOCAL_FLUSH_SECONDS are lost (and logged).
+    """
+
+    def __init__(self, batch_size=LOCAL_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def put(self, events):
+        for event in events:
+            self.queue.put(event)
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name='notifications', daemon=True)
+                self.thread.start()
+
+    def flush(self, timeout=None):
+        """Wait until every queued event has been delivered; False on timeout"""
+        deadline = time.monotonic() + (LOCAL_FLUSH_SECONDS if timeout is None else timeout)
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning('Dropping %d undelivered notification events', self.queue.unfinished_tasks)
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                deliver(batch)
+            except Exception:
+                logger.exception('Failed to deliver %d notification events', len(batch))
+            finally:
+                close_old_connections()
+                for _ in batch:
+                    self.queue.task_done()
+
+
+local_queue = LocalQueue()
+atexit.register(local_queue.flush)
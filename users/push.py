@@ -0,0 +1,43 @@
+"""
+Real-time push of notification events to connected clients.
+
+Messages go to the recipient's channel ('user:<id>') through the pub/sub
+broker once the transaction commits (see api/pubsub.py); the SSE stream in
+users/stream.py relays them. Unread-count changes carry no value: the
+stream reads the counter when it relays them, so publishers don't pay for
+a query and bursts collapse into one read.
+"""
+from api.pubsub import publish_on_commit
+
+
+def user_channel(user_id):
+    return f'user:{user_id}'
+
+
+def notification_payload(notification):
+    """Compact JSON form of a notification for the stream"""
+    return {
+        'id': notification.pk,
+        'notification_type': notification.notification_type,
+        'actor': notification.actor_id,
+        'actor_count': notification.actor_count,
+        'content_type': notification.content_type_id,
+        'object_id': notification.object_id,
+        'created_at': notification.created_at.isoformat() if notification.created_at else None,
+        'last_activity_at': notification.last_activity_at.isoformat(),
+    }
+
+
+def push_notifications(notifications):
+    """Announce new or coalesced notifications to their recipients"""
+    for notification in notifications:
+        publish_on_commit(
+            user_channel(notification.recipient_id),
+            {'type': 'notification', 'notification': notification_payload(notification)}
+        )
+
+
+def push_unread_changed(user_ids):
+    """Tell connected users their unread count changed"""
+    for user_id in set(user_ids):
+        publish_on_commit(user_channel(user_id), {'type': 'unread'})
@@ -1,7 +1,12 @@
 from rest_framework import serializers
+from api.serializers import BatchLoadMixin, BatchedListSerializer
+from api.sparse import SparseFieldsSerializerMixin, expand_requested
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from .models import Like, Comment, Follow, Notification
+from .viewer_state import ViewerStateMixin
+from .notifications import summary
+from .targets import target_summary
 from django.contrib.contenttypes.models import ContentType
 
 User = get_user_model()
@@ -28,18 +33,23 @@ class UserSerializer(serializers.ModelSerializer):
         }
 
 
-class UserListSerializer(serializers.ModelSerializer):
-    """Lightweight user serializer for lists"""
+class UserListSerializer(SparseFieldsSerializerMixin, ViewerStateMixin, serializers.ModelSerializer):
+    """Lightweight user serializer for lists (supports ?fields=)"""
     is_creator = serializers.BooleanField(read_only=True)
     follower_count = serializers.IntegerField(read_only=True)
+    is_followed_by_me = serializers.SerializerMethodField()
     
     class Meta:
         model = User
         fields = [
             'id', 'username', 'profile_picture', 
-            'role', 'is_verified', 'is_creator', 'follower_count', 'bio'
+            'role', 'is_verified', 'is_creator', 'follower_count', 'bio',
+            'is_followed_by_me'
         ]
         read_only_fields = fields
+        field_dependencies = {'is_creator': ['role'], 'is_followed_by_me': []}
+        list_serializer_class = BatchedListSerializer
+        viewer_follow = ('is_followed_by_me', 'pk')
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -151,11 +161,20 @@ class FollowSerializer(serializers.ModelSerializer):
     """Serializer for follow relationships"""
     follower = UserListSerializer(read_only=True)
     following = UserListSerializer(read_only=True)
+    following_id = serializers.PrimaryKeyRelatedField(
+        queryset=User.objects.all(), source='following', write_only=True
+    )
     
     class Meta:
         model = Follow
-        fields = ['id', 'follower', 'following', 'created_at']
+        fields = ['id', 'follower', 'following', 'following_id', 'created_at']
         read_only_fields = ['created_at']
+    
+    def validate_following_id(self, value):
+        request = self.context.get('request')
+        if request and value == request.user:
+            raise serializers.ValidationError('Cannot follow yourself')
+        return value
 
 
 class CreatorProfileSerializer(serializers.ModelSerializer):
@@ -360,14 +379,57 @@ class CompleteSetupSerializer(serializers.Serializer):
         return value
 
 
-class NotificationSerializer(serializers.ModelSerializer):
-    """Serializer for user notifications"""
+class NotificationActorSerializer(serializers.ModelSerializer):
+    """Compact actor info for coalesced notifications"""
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'display_name', 'profile_picture']
+
+
+class NotificationSerializer(BatchLoadMixin, serializers.ModelSerializer):
+    """
+    Serializer for user notifications. Coalesced rows carry `actor_count`
+    and the most recent `actors`; a page loads all sampled actors at once.
+    """
     actor = UserListSerializer(read_only=True)
+    actors = serializers.SerializerMethodField()
+    summary = serializers.SerializerMethodField()
+    target = serializers.SerializerMethodField()
     
     class Meta:
         model = Notification
         fields = [
-            'id', 'recipient', 'actor', 'notification_type',
-            'content_type', 'object_id', 'is_read', 'created_at'
+            'id', 'recipient', 'actor', 'actor_count', 'actors', 'summary',
+            'notification_type', 'content_type', 'object_id', 'target', 'is_read', 'created_at',
+            'last_activity_at'
         ]
-        read_only_fields = ['id', 'recipient', 'actor', 'created_at']
+        read_only_fields = ['id', 'recipient', 'actor', 'actor_count', 'created_at', 'last_activity_at']
+        list_serializer_class = BatchedListSerializer
+    
+    def load_batch(self, instances):
+        super().load_batch(instances)
+        ids = {actor_id for instance in instances for actor_id in instance.actor_sample}
+        self._actors = {user.pk: user for user in User.objects.filter(pk__in=ids)} if ids else {}
+    
+    def get_actors(self, obj):
+        if not obj.actor_sample:
+            return NotificationActorSerializer([obj.actor], many=True, context=self.context).data
+        actors = getattr(self, '_actors', None)
+        if actors is None or not set(obj.actor_sample) <= set(actors):
+            self.load_batch([obj])
+            actors = self._actors
+        sample = [actors[actor_id] for actor_id in obj.actor_sample if actor_id in actors]
+        return NotificationActorSerializer(sample, many=True, context=self.context).data
+    
+    def get_fields(self):
+        fields = super().get_fields()
+        # `target` is opt-in (?expand=target); the view prefetches it
+        if not expand_requested(self.context.get('request'), 'target'):
+            fields.pop('target')
+        return fields
+    
+    def get_summary(self, obj):
+        return summary(obj)
+    
+    def get_target(self, obj):
+        return target_summary(obj.content_object, self.context.get('request'))
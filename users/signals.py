@@ -1,75 +1,77 @@
 """
-Django signals for creating notifications on user interactions.
+Django signals for creating notifications on user interactions
+and keeping engagement counters current.
 """
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from django.contrib.contenttypes.models import ContentType
-from .models import Like, Comment, Notification
+from .models import Like, Comment, Follow, Notification
+from .counters import bump_counter, bump_follow_counts, bump_unread_counts
+from .notifications import notify
+from .push import push_notifications
 
 
 @receiver(post_save, sender=Like)
-def create_like_notification(sender, instance, created, **kwargs):
+@receiver(post_save, sender=Comment)
+def increment_engagement_counter(sender, instance, created, raw=False, **kwargs):
+    """Increment like_count/comment_count on the liked or commented object"""
+    if created and not raw:
+        bump_counter(instance, 1)
+
+
+@receiver(post_delete, sender=Like)
+@receiver(post_delete, sender=Comment)
+def decrement_engagement_counter(sender, instance, **kwargs):
+    """Decrement like_count/comment_count when a like or comment is removed"""
+    bump_counter(instance, -1)
+
+
+@receiver(post_save, sender=Follow)
+def increment_follow_counts(sender, instance, created, raw=False, **kwargs):
+    """Increment follower_count/following_count for a new follow"""
+    if created and not raw:
+        bump_follow_counts(instance, 1)
+
+
+@receiver(post_delete, sender=Follow)
+def decrement_follow_counts(sender, instance, **kwargs):
+    """Decrement follower_count/following_count when a follow is removed"""
+    bump_follow_counts(instance, -1)
+
+
+@receiver(post_save, sender=Notification)
+def increment_unread_count(sender, instance, created, raw=False, **kwargs):
+    """Count a new unread notification (bulk inserts bump the counter themselves)"""
+    if created and not raw and not instance.is_read:
+        bump_unread_counts([instance.recipient_id])
+        push_notifications([instance])
+
+
+@receiver(post_delete, sender=Notification)
+def decrement_unread_count(sender, instance, **kwargs):
+    """Uncount an unread notification when it is deleted"""
+    if not instance.is_read:
+        bump_unread_counts([instance.recipient_id], sign=-1)
+
+
+@receiver(post_save, sender=Like)
+def create_like_notification(sender, instance, created, raw=False, **kwargs):
     """
-    Create notification when someone likes content.
-    Only creates notification if:
-    1. This is a new like (created=True)
-    2. The content object has a 'creator' attribute
-    3. The liker is not the creator (don't notify self-likes)
+    Queue a notification for the creator of liked content.
+    Recipient lookup, self-like filtering and coalescing happen on delivery
+    (see users/notifications.py). Fixture loads (raw saves) don't notify.
     """
-    if not created:
-        return
-    
-    # Check if content object has a creator
-    content_object = instance.content_object
-    if not hasattr(content_object, 'creator'):
+    if not created or raw:
         return
-    
-    # Don't notify if user likes their own content
-    if instance.user == content_object.creator:
-        return
-    
-    Notification.objects.create(
-        recipient=content_object.creator,
-        actor=instance.user,
-        notification_type='like',
-        content_type=instance.content_type,
-        object_id=instance.object_id
-    )
+    notify('like', instance.user_id, instance.content_type_id, instance.object_id)
 
 
 @receiver(post_save, sender=Comment)
-def create_comment_notification(sender, instance, created, **kwargs):
+def create_comment_notification(sender, instance, created, raw=False, **kwargs):
     """
-    Create notification when someone comments on content.
-    Only creates notification if:
-    1. This is a new comment (created=True)
-    2. The content object has a 'creator' attribute
-    3. The commenter is not the creator (don't notify self-comments)
-    4. This is a top-level comment (not a reply)
-    
-    Note: Reply notifications would need separate logic to notify parent comment author
+    Queue a notification for the creator of commented content.
+    Only top-level comments notify; replies would need to notify the parent
+    comment author instead. Fixture loads (raw saves) don't notify.
     """
-    if not created:
-        return
-    
-    # Check if content object has a creator
-    content_object = instance.content_object
-    if not hasattr(content_object, 'creator'):
-        return
-    
-    # Don't notify if user comments on their own content
-    if instance.user == content_object.creator:
-        return
-    
-    # Only notify on top-level comments (not replies)
-    # For replies, you might want to notify the parent comment author instead
-    if instance.parent is not None:
+    if not created or raw or instance.parent_id is not None:
         return
-    
-    Notification.objects.create(
-        recipient=content_object.creator,
-        actor=instance.user,
-        notification_type='comment',
-        content_type=instance.content_type,
-        object_id=instance.object_id
-    )
+    notify('comment', instance.user_id, instance.content_type_id, instance.object_id)
@@ -0,0 +1,101 @@
+"""
+Server-Sent Events stream of a user's notifications.
+
+    GET /api/notifications/stream/?token=<JWT access token>
+    (or an Authorization: Bearer header / session cookie)
+
+    event: unread_count
+    data: {"unread_count": 3}
+
+    event: notification
+    data: {"id": 42, "notification_type": "like", ...}
+
+An async view: under ASGI (uvicorn) an idle connection is a parked
+coroutine waiting on its subscription queue, not a worker thread, so one
+process holds thousands of them. The stream starts with the current unread
+count, then relays messages from the user's pub/sub channel (users/push.py)
+and sends a comment line every SSE_KEEPALIVE_SECONDS so proxies keep the
+connection open.
+"""
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from api.pubsub import get_broker
+from .push import user_channel
+
+User = get_user_model()
+
+
+KEEPALIVE_SECONDS = getattr(settings, 'SSE_KEEPALIVE_SECONDS', 20)
+RETRY_MILLISECONDS = 5000
+
+
+def _token_user(request):
+    """User for a JWT in ?token= or the Authorization header, or None"""
+    authentication = JWTAuthentication()
+    raw_token = request.GET.get('token')
+    if raw_token is None:
+        header = authentication.get_header(request)
+        raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+    try:
+        return authentication.get_user(authentication.get_validated_token(raw_token))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+def _unread_count(user_id):
+    return User.objects.filter(pk=user_id).values_list('unread_notification_count', flat=True).first() or 0
+
+
+def sse_event(event, data):
+    """Format one SSE message"""
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+
+async def _events(subscription, user_id):
+    try:
+        yield f'retry: {RETRY_MILLISECONDS}\n\n'
+        yield sse_event('unread_count', {'unread_count': await sync_to_async(_unread_count)(user_id)})
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.get(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+
+            unread_changed = False
+            while message is not None:
+                if message['type'] == 'notification':
+                    yield sse_event('notification', message['notification'])
+                else:
+                    unread_changed = True
+                message = subscription.get_nowait()
+            # A burst of changes costs one read of the counter
+            if unread_changed:
+                yield sse_event('unread_count', {'unread_count': await sync_to_async(_unread_count)(user_id)})
+    finally:
+        subscription.close()
+
+
+async def notification_stream(request):
+    """SSE endpoint; 401 without valid credentials"""
+    user = await sync_to_async(_token_user)(request)
+    if user is None:
+        user = await request.auser()
+        if not user.is_authenticated:
+            return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+
+    subscription = get_broker().subscribe(user_channel(user.pk))
+    response = StreamingHttpResponse(_events(subscription, user.pk), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # don't let nginx buffer the stream
+    return response
@@ -0,0 +1,50 @@
+"""
+Compact summaries of notification targets.
+
+Notifications point at their target through content_type/object_id. With
+`?expand=target` the list prefetches every target with GenericPrefetch -
+one query per content type on the page, limited to the summary columns -
+and embeds {type, id, title, slug, image} instead of leaving the client to
+fetch each target.
+"""
+from django.apps import apps
+from django.contrib.contenttypes.prefetch import GenericPrefetch
+
+
+# (app_label, model) -> (title field, image field, has slug)
+TARGET_FIELDS = {
+    ('shows', 'show'): ('title', 'thumbnail', True),
+    ('news', 'news'): ('title', 'featured_image', True),
+    ('events', 'event'): ('title', 'banner_image', False),
+}
+
+
+def target_prefetch():
+    """GenericPrefetch of `content_object` loading only the summary columns"""
+    querysets = []
+    for (app_label, model_name), (title, image, has_slug) in TARGET_FIELDS.items():
+        columns = ['id', title, image] + (['slug'] if has_slug else [])
+        querysets.append(apps.get_model(app_label, model_name).objects.only(*columns))
+    return GenericPrefetch('content_object', querysets)
+
+
+def target_summary(target, request=None):
+    """Compact dict for a prefetched target, or None"""
+    if target is None:
+        return None
+    opts = target._meta
+    fields = TARGET_FIELDS.get((opts.app_label, opts.model_name))
+    if fields is None:
+        return None
+    title, image, has_slug = fields
+    image_file = getattr(target, image)
+    image_url = image_file.url if image_file else None
+    if image_url and request is not None:
+        image_url = request.build_absolute_uri(image_url)
+    return {
+        'type': opts.model_name,
+        'id': target.pk,
+        'title': getattr(target, title),
+        'slug': target.slug if has_slug else None,
+        'image': image_url,
+    }
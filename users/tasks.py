@@ -0,0 +1,26 @@
+from celery import shared_task
+from .counters import reconcile_unread_counts
+from .notifications import deliver
+
+
+@shared_task
+def deliver_notifications(events):
+    """
+    Creates or coalesces notifications for queued like/comment/follow events.
+    Enqueued by users.notifications.notify() when Celery is configured.
+    """
+    result = deliver(events)
+    print(f"Delivered {result['events']} notification events "
+          f"({result['created']} created, {result['coalesced']} coalesced)")
+    return result
+
+
+@shared_task
+def reconcile_unread_notification_counts():
+    """
+    Fixes drifted unread notification counters from the (recipient, is_read) index.
+    Runs every hour via Celery Beat.
+    """
+    result = reconcile_unread_counts()
+    print(f"Checked {result['checked']} unread counters, fixed {result['fixed']}")
+    return result
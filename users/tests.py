@@ -1,3 +1,498 @@
-from django.test import TestCase
+"""
+Test suite for the users app.
 
-# Create your tests here.
+Run with: python manage.py test users
+"""
+
+import asyncio
+import json
+import threading
+from datetime import time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core import serializers
+from asgiref.sync import sync_to_async
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.models import PubSubMessage
+from api.pubsub import DatabaseBroker, LocalBroker, MessageCursor, default_backend, get_broker
+from news.models import News
+from shows.models import Show
+from .counters import reconcile_counts, reconcile_follow_counts, reconcile_unread_counts
+from .models import Like, Comment, Follow, Notification
+from .notifications import LocalQueue, deliver
+from .stream import notification_stream
+
+User = get_user_model()
+
+
+class EngagementCounterTests(TestCase):
+    """Test the denormalized like/comment counters"""
+
+    def setUp(self):
+        self.creator = User.objects.create_user(username='creator', password='pass12345', role='creator')
+        self.fan = User.objects.create_user(username='fan', password='pass12345')
+        self.show = Show.objects.create(
+            title='Counted Show', creator=self.creator, is_recurring=True,
+            recurrence_type='DAILY', scheduled_time=time(9, 0), status='published',
+        )
+        self.news = News.objects.create(title='Counted News', content='Body', author=self.creator, is_published=True)
+        self.show_ct = ContentType.objects.get_for_model(Show)
+        self.news_ct = ContentType.objects.get_for_model(News)
+
+    def like(self, user, content_type, obj):
+        return Like.objects.create(user=user, content_type=content_type, object_id=obj.pk)
+
+    def test_like_and_unlike(self):
+        """Likes increment and decrement the target's counter only"""
+        like = self.like(self.fan, self.show_ct, self.show)
+        self.like(self.creator, self.show_ct, self.show)
+        self.like(self.fan, self.news_ct, self.news)
+
+        self.show.refresh_from_db()
+        self.news.refresh_from_db()
+        self.assertEqual((self.show.like_count, self.news.like_count), (2, 1))
+
+        like.delete()
+        self.show.refresh_from_db()
+        self.assertEqual(self.show.like_count, 1)
+
+    def test_comment_replies_cascade(self):
+        """Replies count, and deleting a thread removes all of its comments"""
+        parent = Comment.objects.create(user=self.fan, content_type=self.show_ct, object_id=self.show.pk, text='Hi')
+        Comment.objects.create(
+            user=self.creator, content_type=self.show_ct, object_id=self.show.pk, text='Hello', parent=parent
+        )
+        self.show.refresh_from_db()
+        self.assertEqual(self.show.comment_count, 2)
+
+        parent.delete()
+        self.show.refresh_from_db()
+        self.assertEqual(self.show.comment_count, 0)
+
+    def test_reconcile_fixes_drift(self):
+        """update_counts recomputes counters that drifted"""
+        self.like(self.fan, self.show_ct, self.show)
+        Show.objects.filter(pk=self.show.pk).update(like_count=7, comment_count=3)
+        Show.objects.create(title='Untouched', creator=self.creator)
+
+        result = reconcile_counts(Show, chunk_size=1)
+
+        self.show.refresh_from_db()
+        self.assertEqual((self.show.like_count, self.show.comment_count), (1, 0))
+        self.assertEqual(result, {'checked': 2, 'fixed': 1})
+
+    def test_list_reads_counter_columns(self):
+        """Show list serves counters without counting likes"""
+        self.like(self.fan, self.show_ct, self.show)
+
+        with self.assertNumQueries(5):  # including the page's pending shares
+            response = APIClient().get('/api/shows/')
+
+        self.assertEqual(response.data['results'][0]['like_count'], 1)
+
+
+class FollowCounterTests(TestCase):
+    """Test the denormalized follower/following counters"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.creator = User.objects.create_user(username='creator', password='pass12345', role='creator')
+        self.fan = User.objects.create_user(username='fan', password='pass12345')
+        self.client.force_authenticate(self.fan)
+
+    def counts(self):
+        self.creator.refresh_from_db()
+        self.fan.refresh_from_db()
+        return (self.creator.follower_count, self.fan.following_count)
+
+    def test_toggle_and_delete(self):
+        """Follow paths keep both users' counters in step"""
+        self.client.post('/api/follows/toggle/', {'following_id': self.creator.pk})
+        self.assertEqual(self.counts(), (1, 1))
+        self.client.post('/api/follows/toggle/', {'following_id': self.creator.pk})
+        self.assertEqual(self.counts(), (0, 0))
+
+        response = self.client.post('/api/follows/', {'following_id': self.creator.pk})
+        self.assertEqual(self.counts(), (1, 1))
+        self.client.delete(f"/api/follows/{response.data['id']}/")
+        self.assertEqual(self.counts(), (0, 0))
+
+    @override_settings(NOTIFICATION_BACKEND='sync')
+    def test_create_rejects_self_and_duplicate_follows(self):
+        """POST /api/follows/ validates like toggle and notifies once"""
+        response = self.client.post('/api/follows/', {'following_id': self.fan.pk})
+        self.assertEqual(response.status_code, 400)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/follows/', {'following_id': self.creator.pk})
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post('/api/follows/', {'following_id': self.creator.pk})
+        self.assertEqual(response.status_code, 400)
+
+        self.assertEqual(self.counts(), (1, 1))
+        notification = Notification.objects.get()
+        self.assertEqual((notification.recipient_id, notification.notification_type), (self.creator.pk, 'follow'))
+
+    def test_reconcile_fixes_drift(self):
+        """update_follow_counts recomputes drifted counters"""
+        Follow.objects.create(follower=self.fan, following=self.creator)
+        User.objects.filter(pk=self.creator.pk).update(follower_count=5)
+
+        result = reconcile_follow_counts(chunk_size=1)
+
+        self.assertEqual(self.counts(), (1, 1))
+        self.assertEqual(result, {'checked': 2, 'fixed': 1})
+
+    def test_nested_users_read_columns(self):
+        """Follow lists don't count followers per nested user"""
+        for i in range(3):
+            other = User.objects.create_user(username=f'other{i}', password='pass12345')
+            Follow.objects.create(follower=other, following=self.creator)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/follows/?following={self.creator.pk}')
+        self.assertEqual(response.data['results'][0]['following']['follower_count'], 3)
+
+
+class FollowGraphTests(TestCase):
+    """Test cursor-paginated follower/following lists"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.creator = User.objects.create_user(username='creator', password='pass12345', role='creator')
+        self.fans = [User.objects.create_user(username=f'fan{i}', password='pass12345') for i in range(5)]
+        for fan in self.fans:
+            Follow.objects.create(follower=fan, following=self.creator)
+        self.client.force_authenticate(self.fans[0])
+
+    def test_pages_followers_with_counter(self):
+        """Pages are newest first, compact, and counted from the column"""
+        url = f'/api/follows/followers/?user_id={self.creator.pk}&page_size=2'
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.data['count'], 5)
+        self.assertEqual(set(response.data['results'][0]['user']), {'id', 'username', 'display_name', 'profile_picture', 'is_verified'})
+
+        seen = []
+        while url:
+            response = self.client.get(url)
+            seen.extend(row['user']['username'] for row in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, [fan.username for fan in reversed(self.fans)])
+
+    def test_following_endpoints(self):
+        """Both following endpoints page the follower side; unknown users 404"""
+        response = self.client.get(f'/api/users/{self.fans[1].pk}/following/')
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['user']['username'], 'creator')
+        response = self.client.get(f'/api/follows/following/?user_id={self.fans[1].pk}')
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(self.client.get('/api/follows/followers/?user_id=999').status_code, 404)
+
+
+class ViewerStateTests(TestCase):
+    """Test is_liked_by_me / is_following_creator on list responses"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.creator = User.objects.create_user(username='creator', password='pass12345', role='creator')
+        self.other = User.objects.create_user(username='other', password='pass12345', role='creator')
+        self.fan = User.objects.create_user(username='fan', password='pass12345')
+        self.shows = [
+            Show.objects.create(title=f'Show {i}', creator=creator, status='published')
+            for i, creator in enumerate([self.creator, self.other, self.creator])
+        ]
+        self.show_ct = ContentType.objects.get_for_model(Show)
+        Like.objects.create(user=self.fan, content_type=self.show_ct, object_id=self.shows[0].pk)
+        Follow.objects.create(follower=self.fan, following=self.creator)
+
+    def test_list_state_in_one_query_per_flag(self):
+        """A page costs one Like query and one Follow query for the viewer"""
+        anonymous = self.client.get('/api/shows/').data['results']
+        self.assertFalse(any(show['is_liked_by_me'] or show['is_following_creator'] for show in anonymous))
+
+        self.client.force_authenticate(self.fan)
+        with self.assertNumQueries(7):  # including the page's pending shares
+            results = self.client.get('/api/shows/').data['results']
+        state = {show['id']: (show['is_liked_by_me'], show['is_following_creator']) for show in results}
+        self.assertEqual(state, {
+            self.shows[0].pk: (True, True),
+            self.shows[1].pk: (False, False),
+            self.shows[2].pk: (False, True),
+        })
+
+        users = {user['username']: user['is_followed_by_me'] for user in self.client.get('/api/users/').data['results']}
+        self.assertEqual(users, {'creator': True, 'other': False, 'fan': False})
+
+    def test_batch_endpoint(self):
+        """POST /api/likes/state/ resolves mixed pairs in input order"""
+        news = News.objects.create(title='News', content='x', author=self.other, is_published=True)
+        self.client.force_authenticate(self.fan)
+        items = [
+            {'content_type': self.show_ct.pk, 'object_id': self.shows[2].pk},
+            {'content_type': ContentType.objects.get_for_model(News).pk, 'object_id': news.pk},
+            {'content_type': self.show_ct.pk, 'object_id': self.shows[0].pk},
+        ]
+        response = self.client.post('/api/likes/state/', {'items': items}, format='json')
+        self.assertEqual(
+            [(row['is_liked_by_me'], row['is_following_creator']) for row in response.data['results']],
+            [(False, True), (False, False), (True, True)]
+        )
+
+        too_many = [{'content_type': self.show_ct.pk, 'object_id': i} for i in range(1, 202)]
+        response = self.client.post('/api/likes/state/', {'items': too_many}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(NOTIFICATION_BACKEND='sync')
+class NotificationPipelineTests(TestCase):
+    """Test queued, coalescing notifications"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.creator = User.objects.create_user(username='creator', password='pass12345', role='creator')
+        self.fans = [User.objects.create_user(username=f'fan{i}', password='pass12345') for i in range(5)]
+        self.show = Show.objects.create(title='Popular', creator=self.creator, status='published')
+        self.show_ct = ContentType.objects.get_for_model(Show)
+
+    def test_likes_coalesce_into_one_row(self):
+        """Likes on one show collapse into a single counted notification"""
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            Like.objects.create(user=self.fans[0], content_type=self.show_ct, object_id=self.show.pk)
+            Like.objects.create(user=self.creator, content_type=self.show_ct, object_id=self.show.pk)
+        # Two queued events, then the delivery's notification and unread pushes
+        self.assertEqual(len(callbacks), 4)
+        with self.captureOnCommitCallbacks(execute=True):
+            for fan in self.fans[1:]:
+                Like.objects.create(user=fan, content_type=self.show_ct, object_id=self.show.pk)
+
+        notification = Notification.objects.get()
+        self.assertEqual(notification.actor_count, 5)
+        self.assertEqual(notification.actor_id, self.fans[4].pk)
+        self.assertEqual(notification.actor_sample, [self.fans[4].pk, self.fans[3].pk, self.fans[2].pk])
+
+        self.client.force_authenticate(self.creator)
+        row = self.client.get('/api/notifications/').data['results'][0]
+        self.assertEqual(row['summary'], 'fan4 and 4 others liked your show')
+        self.assertEqual([actor['username'] for actor in row['actors']], ['fan4', 'fan3', 'fan2'])
+
+    def test_window_and_read_state_start_new_rows(self):
+        """Read or old notifications are not reused; repeat actors count once"""
+        event = {'type': 'like', 'actor': self.fans[0].pk, 'recipient': None,
+                 'content_type': self.show_ct.pk, 'object_id': self.show.pk}
+        deliver([event, event])
+        self.assertEqual(Notification.objects.get().actor_count, 1)
+
+        Notification.objects.update(is_read=True)
+        self.assertEqual(deliver([event])['created'], 1)
+        later = timezone.now() + timedelta(hours=2)
+        self.assertEqual(deliver([event], now=later)['created'], 1)
+        self.assertEqual(Notification.objects.count(), 3)
+
+    def test_coalesced_row_moves_to_head(self):
+        """A new actor bumps a coalesced row above newer notifications"""
+        like = {'type': 'like', 'actor': self.fans[0].pk, 'recipient': None,
+                'content_type': self.show_ct.pk, 'object_id': self.show.pk}
+        start = timezone.now()
+        deliver([like], now=start)
+        deliver([{'type': 'follow', 'actor': self.fans[1].pk, 'recipient': self.creator.pk,
+                  'content_type': None, 'object_id': None}], now=start + timedelta(minutes=1))
+        deliver([dict(like, actor=self.fans[2].pk)], now=start + timedelta(minutes=2))
+
+        self.client.force_authenticate(self.creator)
+        results = self.client.get('/api/notifications/').data['results']
+        self.assertEqual([row['notification_type'] for row in results], ['like', 'follow'])
+        self.assertEqual(results[0]['actor_count'], 2)
+
+    def test_fixture_loads_do_not_notify(self):
+        """Raw saves (loaddata) create no notifications"""
+        now = timezone.now()
+        fixture = serializers.serialize('json', [
+            Like(user=self.fans[0], content_type=self.show_ct, object_id=self.show.pk, created_at=now),
+            Comment(user=self.fans[1], content_type=self.show_ct, object_id=self.show.pk, text='hi',
+                    created_at=now, updated_at=now),
+        ])
+        with self.captureOnCommitCallbacks(execute=True):
+            for obj in serializers.deserialize('json', fixture):
+                obj.save()
+        self.assertEqual(Like.objects.count(), 1)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_local_queue_flushes_before_exit(self):
+        """flush() waits for the worker thread to deliver what is queued"""
+        local = LocalQueue(batch_size=2)
+        # No recipient and no target: delivered without touching the database
+        local.put([{'type': 'follow', 'actor': 1, 'recipient': None, 'content_type': None, 'object_id': None}] * 5)
+        self.assertTrue(local.flush(timeout=5))
+        self.assertEqual(local.queue.unfinished_tasks, 0)
+
+    def test_follow_toggle_notifies(self):
+        """Follows coalesce per recipient without a target"""
+        for fan in self.fans[:2]:
+            self.client.force_authenticate(fan)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post('/api/follows/toggle/', {'following_id': self.creator.pk})
+        notification = Notification.objects.get(notification_type='follow')
+        self.assertEqual((notification.recipient_id, notification.actor_count), (self.creator.pk, 2))
+
+
+class UnreadCountTests(TestCase):
+    """Test the unread notification counter"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='user', password='pass12345')
+        self.actor = User.objects.create_user(username='actor', password='pass12345')
+        self.notifications = [
+            Notification.objects.create(recipient=self.user, actor=self.actor, notification_type='follow')
+            for _ in range(3)
+        ]
+        self.client.force_authenticate(self.user)
+
+    def unread(self):
+        self.user.refresh_from_db()
+        return self.client.get('/api/notifications/unread_count/').data['unread_count']
+
+    def test_read_paths_adjust_counter(self):
+        """Inserts, mark_read (once), deletes and mark_all_read keep the count"""
+        self.assertEqual(self.unread(), 3)
+        url = f'/api/notifications/{self.notifications[0].pk}/mark_read/'
+        self.client.post(url)
+        self.client.post(url)
+        self.assertEqual(self.unread(), 2)
+
+        self.notifications[1].delete()
+        self.assertEqual(self.unread(), 1)
+        self.client.post('/api/notifications/mark_all_read/')
+        self.assertEqual(self.unread(), 0)
+
+    def test_endpoint_reads_counter_and_reconciles(self):
+        """The badge is served from the user row; reconcile fixes drift"""
+        self.client.force_authenticate(None)
+        self.client.login(username='user', password='pass12345')
+        User.objects.filter(pk=self.user.pk).update(unread_notification_count=9)
+        self.assertEqual(self.client.get('/api/notifications/unread_count/').data['unread_count'], 9)
+
+        self.assertEqual(reconcile_unread_counts()['fixed'], 1)
+        self.assertEqual(self.unread(), 3)
+
+
+class NotificationListTests(TestCase):
+    """Test cursor pages and embedded targets for notifications"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='user', password='pass12345', role='creator')
+        self.actor = User.objects.create_user(username='actor', password='pass12345')
+        show = Show.objects.create(title='Target Show', creator=self.user, status='published')
+        news = News.objects.create(title='Target News', content='x', author=self.user, is_published=True)
+        for target in (show, news, show, None):
+            Notification.objects.create(
+                recipient=self.user, actor=self.actor, notification_type='like' if target else 'follow',
+                content_type=ContentType.objects.get_for_model(target) if target else None,
+                object_id=target.pk if target else None,
+            )
+        self.client.force_authenticate(self.user)
+
+    def test_cursor_pages_without_count(self):
+        """Pages follow the cursor newest first and never COUNT(*)"""
+        response = self.client.get('/api/notifications/?page_size=3')
+        self.assertNotIn('count', response.data)
+        self.assertEqual(len(response.data['results']), 3)
+        rest = self.client.get(response.data['next']).data
+        self.assertEqual(len(rest['results']), 1)
+        self.assertIsNone(rest['next'])
+        self.assertNotIn('target', rest['results'][0])
+
+    def test_expand_target_batches_by_type(self):
+        """?expand=target embeds targets with one query per content type"""
+        with self.assertNumQueries(4):
+            results = self.client.get('/api/notifications/?expand=target').data['results']
+        targets = [row['target'] and (row['target']['type'], row['target']['title']) for row in results]
+        self.assertEqual(targets, [None, ('show', 'Target Show'), ('news', 'Target News'), ('show', 'Target Show')])
+
+
+class NotificationStreamTests(TestCase):
+    """Test the SSE notification stream and its pub/sub"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', password='pass12345')
+        self.actor = User.objects.create_user(username='actor', password='pass12345')
+
+    async def test_broker_fans_out_across_threads(self):
+        """Messages published from another thread reach the subscriber's loop"""
+        broker = LocalBroker()
+        async with broker.subscribe('user:1') as subscription:
+            thread = threading.Thread(target=broker.publish, args=('user:1', {'type': 'unread'}))
+            thread.start()
+            thread.join()
+            broker.publish('user:2', {'type': 'unread'})
+            self.assertEqual(await asyncio.wait_for(subscription.get(), 1), {'type': 'unread'})
+            self.assertIsNone(subscription.get_nowait())
+        self.assertEqual(broker.subscriber_count(), 0)
+
+    def test_cursor_picks_up_rows_committed_out_of_order(self):
+        """Rows that become visible below the highest seen ID are still read once"""
+        PubSubMessage.objects.create(id=10, channel='user:1', payload={'n': 'old'})
+        cursor = MessageCursor(lookback=5)
+        PubSubMessage.objects.create(id=30, channel='user:1', payload={'n': 'first'})
+        self.assertEqual(cursor.read(), [('user:1', {'n': 'first'})])
+
+        # Inserted (ID 20) before ID 30 but committed after it
+        PubSubMessage.objects.create(id=20, channel='user:1', payload={'n': 'late'})
+        self.assertEqual(cursor.read(), [('user:1', {'n': 'late'})])
+        self.assertEqual(cursor.read(), [])
+
+    def test_celery_defaults_to_database_broker(self):
+        """Messages published by Celery workers must reach other processes"""
+        self.assertIs(default_backend(), LocalBroker)
+        with self.settings(CELERY_BROKER_URL='redis://localhost'):
+            self.assertIs(default_backend(), DatabaseBroker)
+
+    async def test_stream_relays_notifications_and_unread_count(self):
+        """The stream opens with the unread count, then pushes new notifications"""
+        token = str(AccessToken.for_user(self.user))
+        request = AsyncRequestFactory().get(f'/api/notifications/stream/?token={token}')
+        response = await notification_stream(request)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        events = response.streaming_content
+
+        async def next_event():
+            return (await asyncio.wait_for(anext(events), 1)).decode()
+
+        self.assertTrue((await next_event()).startswith('retry:'))
+        self.assertIn('"unread_count": 0', await next_event())
+
+        def notify():
+            with self.captureOnCommitCallbacks(execute=True):
+                return Notification.objects.create(recipient=self.user, actor=self.actor, notification_type='follow')
+        notification = await sync_to_async(notify)()
+
+        pushed = await next_event()
+        self.assertTrue(pushed.startswith('event: notification'))
+        self.assertEqual(json.loads(pushed.split('data: ', 1)[1])['id'], notification.pk)
+        self.assertIn('"unread_count": 1', await next_event())
+
+        # A client disconnect cancels the task consuming the stream
+        consumer = asyncio.ensure_future(anext(events))
+        await asyncio.sleep(0)
+        consumer.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await consumer
+        self.assertEqual(get_broker().subscriber_count(), 0)
+
+    async def test_requires_credentials(self):
+        request = AsyncRequestFactory().get('/api/notifications/stream/?token=bogus')
+        request.auser = self.anonymous
+        response = await notification_stream(request)
+        self.assertEqual(response.status_code, 401)
+
+    @staticmethod
+    async def anonymous():
+        from django.contrib.auth.models import AnonymousUser
+        return AnonymousUser()
@@ -0,0 +1,161 @@
+"""
+Per-viewer state on cards: has the requesting user liked the item, and do
+they follow its creator.
+
+ViewerStateMixin adds the fields to list serializers and fills them for a
+whole page with one Like query and one Follow query (BatchedListSerializer
+calls load_batch()). viewer_state() answers the same questions for an
+arbitrary batch of (content_type, object_id) pairs. Anonymous viewers get
+False everywhere without touching the database.
+"""
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from rest_framework import serializers
+
+from api.serializers import BatchLoadMixin
+from .models import Follow, Like
+
+
+# (app_label, model) of likeable content -> FK to the user who owns it
+OWNER_FIELDS = {
+    ('shows', 'show'): 'creator',
+    ('news', 'news'): 'author',
+    ('events', 'event'): 'organizer',
+}
+
+MAX_BATCH_ITEMS = 200
+
+
+def request_viewer(context):
+    """The authenticated user of the serializer context's request, or None"""
+    user = getattr(context.get('request'), 'user', None)
+    return user if user is not None and user.is_authenticated else None
+
+
+def liked_ids(user, content_type, object_ids):
+    """IDs among `object_ids` of `content_type` that `user` has liked"""
+    return set(
+        Like.objects.filter(user=user, content_type=content_type, object_id__in=list(object_ids))
+        .values_list('object_id', flat=True)
+    )
+
+
+def followed_ids(user, user_ids):
+    """IDs among `user_ids` that `user` follows"""
+    return set(
+        Follow.objects.filter(follower=user, following_id__in=list(user_ids))
+        .values_list('following_id', flat=True)
+    )
+
+
+def viewer_state(user, items):
+    """
+    Resolve is_liked_by_me / is_following_creator for (content_type_id,
+    object_id) pairs: per content type one Like query and one owner lookup,
+    then a single Follow query. Unknown content types and objects are False.
+
+    Returns:
+        list: one dict per item, in input order
+    """
+    by_type = defaultdict(set)
+    for content_type_id, object_id in items:
+        by_type[content_type_id].add(object_id)
+
+    liked = {}
+    owners = {}
+    for content_type_id, object_ids in by_type.items():
+        try:
+            content_type = ContentType.objects.get_for_id(content_type_id)
+        except ContentType.DoesNotExist:
+            continue
+        owner_field = OWNER_FIELDS.get((content_type.app_label, content_type.model))
+        if owner_field is None:
+            continue
+        liked[content_type_id] = liked_ids(user, content_type, object_ids)
+        rows = content_type.model_class().objects.filter(pk__in=object_ids).values_list('pk', f'{owner_field}_id')
+        owners.update(((content_type_id, pk), owner_id) for pk, owner_id in rows)
+
+    followed = followed_ids(user, set(owners.values())) if owners else set()
+    return [
+        {
+            'content_type': content_type_id,
+            'object_id': object_id,
+            'is_liked_by_me': object_id in liked.get(content_type_id, ()),
+            'is_following_creator': owners.get((content_type_id, object_id)) in followed,
+        }
+        for content_type_id, object_id in items
+    ]
+
+
+class ViewerStateItemSerializer(serializers.Serializer):
+    content_type = serializers.IntegerField(min_value=1)
+    object_id = serializers.IntegerField(min_value=1)
+
+
+class ViewerStateRequestSerializer(serializers.Serializer):
+    """Body of POST /api/likes/state/"""
+    items = serializers.ListField(
+        child=ViewerStateItemSerializer(),
+        allow_empty=False,
+        max_length=MAX_BATCH_ITEMS
+    )
+
+
+class ViewerStateMixin(BatchLoadMixin):
+    """
+    List serializer mixin for `is_liked_by_me` and a follow flag.
+
+    The serializer declares the fields it wants as SerializerMethodFields and
+    sets, in Meta:
+    - viewer_like: True if the model is likeable
+    - viewer_follow: (field name, attribute holding the user ID to check),
+      e.g. ('is_following_creator', 'creator_id')
+
+    The fields are only served at the top level of a response; nested users
+    in comments or likes don't carry them.
+    """
+    VIEWER_FIELDS = ('is_liked_by_me', 'is_following_creator', 'is_followed_by_me')
+
+    def get_fields(self):
+        fields = super().get_fields()
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            for name in self.VIEWER_FIELDS:
+                fields.pop(name, None)
+        return fields
+
+    def load_batch(self, instances):
+        super().load_batch(instances)
+        self._viewer_state = self._load_viewer_state(instances)
+
+    def _load_viewer_state(self, instances):
+        user = request_viewer(self.context)
+        pks = {instance.pk for instance in instances}
+        liked = followed = set()
+        if user is not None and instances:
+            meta = self.Meta
+            if getattr(meta, 'viewer_like', False) and 'is_liked_by_me' in self.fields:
+                content_type = ContentType.objects.get_for_model(meta.model)
+                liked = liked_ids(user, content_type, pks)
+            follow = getattr(meta, 'viewer_follow', None)
+            if follow and follow[0] in self.fields:
+                followed = followed_ids(user, {getattr(instance, follow[1]) for instance in instances})
+        return pks, liked, followed
+
+    def _state_for(self, obj):
+        state = getattr(self, '_viewer_state', None)
+        if state is None or obj.pk not in state[0]:
+            state = self._viewer_state = self._load_viewer_state([obj])
+        return state
+
+    def get_is_liked_by_me(self, obj):
+        return obj.pk in self._state_for(obj)[1]
+
+    def _is_following(self, obj):
+        return getattr(obj, self.Meta.viewer_follow[1]) in self._state_for(obj)[2]
+
+    get_is_following_creator = _is_following
+    get_is_followed_by_me = _is_following
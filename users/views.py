@@ -1,5 +1,6 @@
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAuthenticatedOrReadOnly
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -9,7 +10,13 @@ from django.db.models import Count
 from django.core.cache import cache
 import uuid
 import time
+from itertools import repeat
 from .models import Like, Comment, Follow, Notification
+from .follows import follow_page
+from .notifications import NotificationCursorPagination, notify
+from .targets import target_prefetch
+from .counters import bump_unread_counts
+from .viewer_state import ViewerStateRequestSerializer, viewer_state
 from .serializers import (
     UserSerializer, UserListSerializer, UserRegistrationSerializer,
     UserUpdateSerializer,
@@ -18,11 +25,14 @@ from .serializers import (
     WalletLoginOrCheckSerializer, CompleteSetupSerializer,
     NotificationSerializer
 )
+from api.allocator import save_unique
+from api.search.filters import FullTextSearchFilter
+from api.sparse import SparseFieldsViewMixin, expand_requested
 
 User = get_user_model()
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for User model and authentication.
     
@@ -37,12 +47,11 @@ class UserViewSet(viewsets.ModelViewSet):
     - me: GET /api/users/me/
     """
     queryset = User.objects.all()
-    # Note: follower_count and following_count are provided by @property methods in the User model
-    # No need to annotate here as it would conflict with the properties
+    # follower_count and following_count are counter columns (see users.counters)
     permission_classes = []  # Override global defaults, use get_permissions() instead
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [filters.OrderingFilter, FullTextSearchFilter]
     search_fields = ['username', 'first_name', 'last_name']
-    ordering_fields = ['date_joined']  # Removed 'follower_count' since it's not an annotated field
+    ordering_fields = ['date_joined', 'follower_count']
     ordering = ['-date_joined']
     
     def get_serializer_class(self):
@@ -175,8 +184,11 @@ class UserViewSet(viewsets.ModelViewSet):
             content_type=show_content_type
         ).values_list('object_id', flat=True)
         
-        # Get the actual shows
-        shows = Show.objects.filter(id__in=liked_show_ids)
+        # Get the actual shows; only the latest episodes of each are embedded
+        from shows.episodes import recent_episodes_prefetch
+        shows = Show.objects.filter(id__in=liked_show_ids).select_related('creator').prefetch_related(
+            'tags', 'guests', recent_episodes_prefetch()
+        )
         
         # Import ShowSerializer
         from shows.serializers import ShowSerializer
@@ -185,15 +197,8 @@ class UserViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['get'])
     def following(self, request, pk=None):
-        """Get users that this user is following"""
-        user = self.get_object()
-        # Get all Follow objects where this user is the follower
-        following_users = User.objects.filter(
-            followers__follower=user
-        ).distinct()
-        
-        serializer = UserSerializer(following_users, many=True, context={'request': request})
-        return Response(serializer.data)
+        """Get users that this user is following (cursor-paginated, see users.follows)"""
+        return follow_page(request, pk, 'following')
     
     # ============================================
     # WALLET AUTHENTICATION ENDPOINTS (DEFERRED USER CREATION)
@@ -307,32 +312,16 @@ class UserViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Generate username if not provided
+        # Username is generated from the wallet address if not provided
         username = serializer.validated_data.get('username')
-        if not username:
-            # Auto-generate from wallet address
-            base_username = f'user_{wallet_address[:8]}'
-            username = base_username
-            counter = 1
-            # CRITICAL FIX #3: Race condition protection with max retries
-            max_retries = 10
-            while counter < max_retries:
-                if not User.objects.filter(username=username).exists():
-                    break
-                username = f'{base_username}_{counter}'
-                counter += 1
-            else:
-                # Fallback to UUID if all retries failed
-                import uuid
-                username = f'user_{uuid.uuid4().hex[:8]}'
         
         # CRITICAL FIX #7: Create user with unusable password
         # Wrap in transaction for atomicity
         try:
             with transaction.atomic():
-                user = User.objects.create(
+                user = User(
                     stacks_address=wallet_address,
-                    username=username,
+                    username=username or '',
                     display_name=serializer.validated_data.get('display_name', ''),
                     role=serializer.validated_data.get('role', 'user'),
                     first_name=serializer.validated_data.get('first_name', ''),
@@ -345,7 +334,11 @@ class UserViewSet(viewsets.ModelViewSet):
                 )
                 # Set unusable password for wallet-only users
                 user.set_unusable_password()
-                user.save()
+                if username:
+                    user.save()
+                else:
+                    # CRITICAL FIX #3: one-query allocation, retried if another signup races us
+                    save_unique(user, 'username', f'user_{wallet_address[:8]}', user.save, separator='_')
                 
                 logger.info(f"New user created: {user.username} with wallet {wallet_address}")
                 
@@ -410,6 +403,7 @@ class LikeViewSet(viewsets.ModelViewSet):
     
     Custom actions:
     - toggle: POST /api/likes/toggle/
+    - state: POST /api/likes/state/
     """
     queryset = Like.objects.select_related('user')
     serializer_class = LikeSerializer
@@ -467,6 +461,20 @@ class LikeViewSet(viewsets.ModelViewSet):
             {'status': 'liked', 'like': LikeSerializer(like).data},
             status=status.HTTP_201_CREATED
         )
+    
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
+    def state(self, request):
+        """
+        Like/follow state of the current user for up to 200 items at once.
+        
+        Body: {"items": [{"content_type": 12, "object_id": 3}, ...]}
+        Returns: {"results": [{"content_type", "object_id",
+                               "is_liked_by_me", "is_following_creator"}, ...]}
+        """
+        serializer = ViewerStateRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = [(item['content_type'], item['object_id']) for item in serializer.validated_data['items']]
+        return Response({'results': viewer_state(request.user, items)})
 
 
 class CommentViewSet(viewsets.ModelViewSet):
@@ -548,7 +556,22 @@ class FollowViewSet(viewsets.ModelViewSet):
         return queryset
     
     def perform_create(self, serializer):
-        serializer.save(follower=self.request.user)
+        # As in toggle: get_or_create turns a repeated follow into a 400
+        # instead of an IntegrityError on the unique constraint
+        follow, created = Follow.objects.get_or_create(
+            follower=self.request.user,
+            following=serializer.validated_data['following']
+        )
+        if not created:
+            raise ValidationError({'following_id': ['Already following this user']})
+        serializer.instance = follow
+        
+        # Notify the user being followed (delivered in the background)
+        notify('follow', self.request.user.id, recipient_id=follow.following_id)
+    
+    def perform_destroy(self, instance):
+        # See toggle: a repeated delete must not decrement the counters twice
+        Follow.objects.filter(pk=instance.pk).delete()
     
     @action(detail=False, methods=['post'])
     def toggle(self, request):
@@ -561,7 +584,8 @@ class FollowViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        if int(following_id) == request.user.id:
+        following_id = int(following_id)
+        if following_id == request.user.id:
             return Response(
                 {'error': 'Cannot follow yourself'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -573,15 +597,14 @@ class FollowViewSet(viewsets.ModelViewSet):
         )
         
         if not created:
-            follow.delete()
+            # Delete through the queryset: a concurrent toggle that already
+            # removed the row deletes nothing and sends no post_delete, so
+            # the follow counters are decremented once
+            Follow.objects.filter(pk=follow.pk).delete()
             return Response({'status': 'unfollowed'}, status=status.HTTP_200_OK)
         
-        # Create notification for the user being followed
-        Notification.objects.create(
-            recipient=follow.following,
-            actor=request.user,
-            notification_type='follow'
-        )
+        # Notify the user being followed (delivered in the background)
+        notify('follow', request.user.id, recipient_id=follow.following_id)
         
         return Response(
             {'status': 'followed', 'follow': FollowSerializer(follow).data},
@@ -590,7 +613,7 @@ class FollowViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def followers(self, request):
-        """Get followers of a user"""
+        """Get followers of a user (cursor-paginated, see users.follows)"""
         user_id = request.query_params.get('user_id')
         if not user_id:
             return Response(
@@ -598,13 +621,11 @@ class FollowViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        follows = self.get_queryset().filter(following_id=user_id)
-        serializer = self.get_serializer(follows, many=True)
-        return Response(serializer.data)
+        return follow_page(request, user_id, 'followers')
     
     @action(detail=False, methods=['get'])
     def following(self, request):
-        """Get users that a user is following"""
+        """Get users that a user is following (cursor-paginated, see users.follows)"""
         user_id = request.query_params.get('user_id')
         if not user_id:
             return Response(
@@ -612,9 +633,7 @@ class FollowViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        follows = self.get_queryset().filter(follower_id=user_id)
-        serializer = self.get_serializer(follows, many=True)
-        return Response(serializer.data)
+        return follow_page(request, user_id, 'following')
 
 
 class NotificationViewSet(viewsets.ModelViewSet):
@@ -624,30 +643,54 @@ class NotificationViewSet(viewsets.ModelViewSet):
     List: GET /api/notifications/
     Mark Read: POST /api/notifications/{id}/mark_read/
     Mark All Read: POST /api/notifications/mark_all_read/
+    Unread Count: GET /api/notifications/unread_count/
+    
+    Lists are cursor-paginated; ?expand=target embeds a summary of each
+    notification's target (see users.targets).
     """
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = NotificationCursorPagination
     
     def get_queryset(self):
         """Return notifications for the current user, ordered by newest first"""
-        return Notification.objects.filter(
+        queryset = Notification.objects.filter(
             recipient=self.request.user
         ).select_related('actor', 'recipient')
+        if expand_requested(self.request, 'target'):
+            queryset = queryset.prefetch_related(target_prefetch())
+        return queryset
+    
+    def perform_update(self, serializer):
+        was_read = serializer.instance.is_read
+        notification = serializer.save()
+        if notification.is_read != was_read:
+            bump_unread_counts([notification.recipient_id], sign=1 if was_read else -1)
     
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
         """Mark a single notification as read"""
         notification = self.get_object()
-        notification.is_read = True
-        notification.save()
+        # Conditional UPDATE: only the request that flips is_read decrements
+        if self.get_queryset().filter(pk=notification.pk, is_read=False).update(is_read=True):
+            bump_unread_counts([request.user.pk], sign=-1)
         return Response({'status': 'marked as read'})
     
     @action(detail=False, methods=['post'])
     def mark_all_read(self, request):
         """Mark all notifications as read for the current user"""
         count = self.get_queryset().filter(is_read=False).update(is_read=True)
+        bump_unread_counts(repeat(request.user.pk, count), sign=-1)
         return Response({
             'status': 'all marked as read',
             'count': count
         })
+    
+    @action(detail=False, methods=['get'])
+    def unread_count(self, request):
+        """
+        Unread notification count for the badge. Reads the counter column on
+        the user row authentication already loaded, so it costs no query.
+        """
+        return Response({'unread_count': request.user.unread_notification_count})
 
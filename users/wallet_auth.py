@@ -12,6 +12,7 @@ import uuid
 import time
 from django.core.cache import cache
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -24,6 +25,7 @@ from .serializers import (
     WalletUserSerializer
 )
 from .crypto_utils import verify_stacks_signature
+from api.allocator import save_unique
 
 User = get_user_model()
 
@@ -178,14 +180,20 @@ class WalletAuthViewSet(viewsets.ViewSet):
         cache.delete(cache_key)
         
         # Get or create user
-        user, created = User.objects.get_or_create(
-            stacks_address=wallet_address,
-            defaults={
-                'username': self._generate_username(wallet_address),
-                'email': '',  # Email is optional for wallet users
-                'role': 'user'
-            }
-        )
+        user = User.objects.filter(stacks_address=wallet_address).first()
+        created = user is None
+        if created:
+            user = User(
+                stacks_address=wallet_address,
+                email='',  # Email is optional for wallet users
+                role='user'
+            )
+            try:
+                self._save_with_generated_username(user, wallet_address)
+            except IntegrityError:
+                # Another request registered this wallet first
+                user = User.objects.get(stacks_address=wallet_address)
+                created = False
         
         # Add is_new flag to user object (for serializer)
         user.is_new = created
@@ -204,24 +212,13 @@ class WalletAuthViewSet(viewsets.ViewSet):
             }
         }, status=status.HTTP_200_OK)
     
-    def _generate_username(self, wallet_address: str) -> str:
+    def _save_with_generated_username(self, user, wallet_address: str):
         """
-        Generate a unique username from wallet address.
+        Save a new user with a unique username derived from the wallet address
+        (user_<first 8 chars>, then user_<first 8 chars>_<n>).
         
         Args:
+            user: Unsaved User instance
             wallet_address: The Stacks wallet address
-        
-        Returns:
-            str: A unique username
         """
-        # Base username from first 8 chars of address
-        base_username = f'user_{wallet_address[:8]}'
-        username = base_username
-        
-        # Ensure uniqueness
-        counter = 1
-        while User.objects.filter(username=username).exists():
-            username = f'{base_username}_{counter}'
-            counter += 1
-        
-        return username
+        save_unique(user, 'username', f'user_{wallet_address[:8]}', user.save, separator='_')